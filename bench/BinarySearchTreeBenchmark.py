@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Time BinarySearchTree insert, get and remove on random keys.
+
+    $ python -m bench.BinarySearchTreeBenchmark [-n SIZE] [--repeat R]
+"""
+
+import argparse
+import random
+import time
+
+from src.BinarySearchTree import BinarySearchTree
+
+
+def insert(tree, keys):
+    for k in keys:
+        tree.insert(k, k)
+
+
+def get(tree, keys):
+    for k in keys:
+        tree.get(k)
+
+
+def remove(tree, keys):
+    for k in keys:
+        tree.remove(k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=1000000,
+                        help='number of keys')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per measurement, the best is shown')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    keys = random.Random(args.seed).sample(range(10 * args.n), args.n)
+    best = {}
+    for _ in range(args.repeat):
+        tree = BinarySearchTree()
+        # each operation runs on the tree the previous one left behind
+        for label, operation in (('insert', insert), ('get', get),
+                                 ('remove', remove)):
+            start = time.perf_counter()
+            operation(tree, keys)
+            elapsed = time.perf_counter() - start
+            best[label] = min(best.get(label, elapsed), elapsed)
+    for label in ('insert', 'get', 'remove'):
+        print("{:<8}{:>10.3f}s".format(label, best[label]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Compare PriorityQueue backends and CompactPriorityQueue on workloads.
+
+    $ python -m bench.PriorityQueueBenchmark [-n SIZE] [--repeat R]
+"""
+
+import argparse
+import functools
+import random
+import time
+
+from src.CompactPriorityQueue import CompactPriorityQueue
+from src.PriorityQueue import (
+    PriorityQueue, BINARY_HEAP, PAIRING_HEAP, FIBONACCI_HEAP
+)
+
+BACKENDS = (
+    ('binary', functools.partial(PriorityQueue, BINARY_HEAP)),
+    ('pairing', functools.partial(PriorityQueue, PAIRING_HEAP)),
+    ('fibonacci', functools.partial(PriorityQueue, FIBONACCI_HEAP)),
+    ('compact', CompactPriorityQueue),
+)
+
+
+def insert_then_pop(make_queue, n, rnd):
+    """Queue n random priorities, then pop them all."""
+    pq = make_queue()
+    for i in range(n):
+        pq.insert(i, rnd.random())
+    while not pq.is_empty():
+        pq.pop_highest_priority()
+
+
+def interleaved(make_queue, n, rnd):
+    """Keep about n/10 elements queued while pushing and popping n."""
+    pq = make_queue()
+    for i in range(n):
+        pq.insert(i, rnd.random())
+        if i % 10 < 9 and not pq.is_empty():
+            pq.pop_highest_priority()
+
+
+def dijkstra(make_queue, n, rnd):
+    """Shortest paths on a random graph with n nodes and 8n edges.
+
+    Most of the work is raising the priority of queued nodes whenever a
+    shorter path is found, i.e. decrease-key. A queue that can't change
+    priorities gets the node again instead, and the stale copies are
+    skipped when popped.
+    """
+    edges = [[] for _ in range(n)]
+    for _ in range(8 * n):
+        edges[rnd.randrange(n)].append((rnd.randrange(n), rnd.random()))
+    dist = {0: 0.0}
+    done = set()
+    pq = make_queue()
+    decrease_key = hasattr(pq, 'update_priority')
+    # the shortest distance has the highest priority
+    pq.insert(0, -0.0)
+    while not pq.is_empty():
+        u = pq.pop_highest_priority()
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in edges[u]:
+            if v in done:
+                continue
+            d = dist[u] + w
+            if v not in dist:
+                dist[v] = d
+                pq.insert(v, -d)
+            elif d < dist[v]:
+                dist[v] = d
+                if decrease_key:
+                    pq.update_priority(v, -d)
+                else:
+                    pq.insert(v, -d)
+
+
+WORKLOADS = (
+    ('insert then pop', insert_then_pop),
+    ('interleaved', interleaved),
+    ('dijkstra', dijkstra),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=50000,
+                        help='elements per workload')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per measurement, the best is shown')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:<16}".format('seconds') +
+          "".join("{:>12}".format(name) for name, _ in BACKENDS))
+    for label, workload in WORKLOADS:
+        row = "{:<16}".format(label)
+        for _, make_queue in BACKENDS:
+            best = None
+            for _ in range(args.repeat):
+                rnd = random.Random(args.seed)
+                start = time.perf_counter()
+                workload(make_queue, args.n, rnd)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            row += "{:>12.3f}".format(best)
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,14 @@ from .BinarySearchTree import Node, BinarySearchTree
 
 class AVLNode(Node):
 
+    __slots__ = ('_height', '_size')
+
     def __init__(self, key, value, parent, left=None, right=None):
         super(AVLNode, self).__init__(key, value, parent, left, right)
-        self._height = 0
+        # a new node is a leaf; None counts as height 0
+        self._height = 1
+        # number of nodes in the subtree
+        self._size = 1
 
     def get_height(self):
         return self._height
@@ -15,162 +20,325 @@ class AVLNode(Node):
     def set_height(self, h):
         self._height = h
 
+    def get_size(self):
+        return self._size
+
+    def _refresh(self):
+        """Recompute the height and size from those of the children."""
+        left = self.left
+        right = self.right
+        if left is None:
+            if right is None:
+                self._height = 1
+                self._size = 1
+            else:
+                self._height = right._height + 1
+                self._size = right._size + 1
+        elif right is None:
+            self._height = left._height + 1
+            self._size = left._size + 1
+        else:
+            hl = left._height
+            hr = right._height
+            self._height = (hl if hl > hr else hr) + 1
+            self._size = left._size + right._size + 1
+
     @staticmethod
     def cast_from_node(node):
         """'Casts' a Node and all its children to AVLNodes.
 
-        Assigns the proper height for the node at each depth.
+        Copies the subtree without recursion and assigns the proper
+        height and size to every copy, bottom-up.
         """
-        avlnode = AVLNode._naive_cast_from_node(node)
-        depth = avlnode.get_max_depth()
-        AVLNode._adjust_heights_recur(avlnode, depth + 1)
-        return avlnode
+        if node is None:
+            return None
+        if type(node) is not Node:
+            raise TypeError("Must cast of type {}".format(type(node)))
+        root = AVLNode(node.key, node.value, parent=None)
+        order = []
+        stack = [(node, root)]
+        while stack:
+            src, dst = stack.pop()
+            order.append(dst)
+            if src.left is not None:
+                dst.left = AVLNode(src.left.key, src.left.value, dst)
+                stack.append((src.left, dst.left))
+            if src.right is not None:
+                dst.right = AVLNode(src.right.key, src.right.value, dst)
+                stack.append((src.right, dst.right))
+        # every child comes after its parent in order
+        for dst in reversed(order):
+            dst._refresh()
+        return root
 
-    @staticmethod
-    def _adjust_heights_recur(avlnode, height):
-        """Assigns/fixes the heights of AVLNodes.
 
-        Used in conjunction with AVLNode._naive_cast_from_node
-        to produce a proper AVLNode with the correct heights.
+class AVLTree(BinarySearchTree):
+    """Binary search tree kept balanced by rotations.
+
+    The heights of the two subtrees of any node differ by at most one, so
+    the tree stays O(log n) high whatever the order of the keys, and
+    ``get``, ``insert`` and ``remove`` take O(log n) in the worst case.
+    Insert and remove descend once, then restore the balance on the way
+    back up through the parent pointers.
+
+    Every node also knows the size of its subtree, which lets ``join``
+    and ``split`` move whole subtrees between trees in O(log n).
+    """
+
+    Node = AVLNode
+
+    def __init__(self, lst=None):
+        """Construct a tree, optionally from another tree or from an
+        iterable of (key, value) pairs.
+
+        Another tree is already in key order, so it is copied in O(n).
         """
-        if avlnode is None:
-            pass  # do nothing
-        else:
-            height -= 1
-            avlnode.set_height(height)
-            AVLNode._adjust_heights_recur(avlnode.get_left(), height)
-            AVLNode._adjust_heights_recur(avlnode.get_right(), height)
+        super(AVLTree, self).__init__()
+        if isinstance(lst, BinarySearchTree):
+            self._load_sorted([(node.key, node.value) for node in lst])
+        elif lst is not None:
+            for key, value in lst:
+                self.insert(key, value)
+
+    @classmethod
+    def from_sorted(cls, pairs):
+        """Build a tree in O(n) from (key, value) pairs in increasing key
+        order, such as the items of a sorted list.
+        """
+        tree = cls()
+        tree._load_sorted(list(pairs))
+        return tree
 
     @staticmethod
-    def _naive_cast_from_node(node):
-        """'Casts' a Node and all its children to AVLNodes.
+    def from_bst(bst):
+        """Build a balanced copy of a BinarySearchTree in O(n)."""
+        return AVLTree(bst)
+
+    def _load_sorted(self, pairs):
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                raise ValueError("Keys must be strictly increasing.")
+        self._root = self._build(pairs, 0, len(pairs), None)
+        self._size = len(pairs)
+
+    def _build(self, pairs, lo, hi, parent):
+        """Perfectly balanced subtree of pairs[lo:hi], recursing only
+        O(log n) deep.
+        """
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, value = pairs[mid]
+        node = self.Node(key, value, parent)
+        node.left = self._build(pairs, lo, mid, node)
+        node.right = self._build(pairs, mid + 1, hi, node)
+        node._refresh()
+        return node
+
+    def insert(self, key, value):
+        """If the key already exists, update with the new value."""
+        node = self._insert(key, value)
+        if node is not None and node.parent is not None:
+            self._root = AVLTree._fix_up(node.parent)
+
+    def remove(self, key):
+        parent = self._remove_node(self._find(key))
+        if parent is not None:
+            self._root = AVLTree._fix_up(parent)
 
-        Does not assign heights for the nodes.
+    def join(self, other):
+        """Move all keys of another AVLTree into this one in O(log n).
+
+        The keys of other must all be bigger than those of this tree.
+        other is left empty.
         """
-        if node is not None and type(node) != Node:
-            raise TypeError("Must cast of type {}".format(type(node)))
-        elif node is None:
-            return node
-        else:
-            p = AVLNode(
-                key=node.get_key(),
-                value=node.get_value(),
-                parent=None
-            )
-            if node.get_left() is None:
-                q = None
-            else:
-                q = AVLNode._naive_cast_from_node(node.get_left())
-                q.set_parent(p)
-            if node.get_right() is None:
-                r = None
+        if other is self:
+            raise ValueError("Cannot join a tree with itself.")
+        if other._root is None:
+            return
+        mid = other._find_min()
+        if self._root is not None and \
+                not self._find_max_node(self._root).key < mid.key:
+            raise ValueError("Keys of the joined tree must be bigger.")
+        other.remove(mid.key)
+        self._size += other._size + 1
+        self._root = AVLTree._join(self._root, mid, other._root)
+        other.clear()
+
+    def split(self, key):
+        """Move the keys not smaller than key into a new tree, returned.
+
+        Takes O(log n): the search path is cut out and the subtrees
+        hanging off it are joined back together into the two trees.
+        """
+        left = right = None
+        path = []
+        node = self._root
+        while node is not None:
+            path.append(node)
+            node = node.right if node.key < key else node.left
+        for node in reversed(path):
+            lc = node.left
+            rc = node.right
+            node.parent = node.left = node.right = None
+            if node.key < key:
+                # the right child, on the path, was split already
+                if lc is not None:
+                    lc.parent = None
+                left = AVLTree._join(lc, node, left)
             else:
-                r = AVLNode._naive_cast_from_node(node.get_right())
-                r.set_parent(p)
-            p.set_left(q)
-            p.set_right(r)
-            return p
+                if rc is not None:
+                    rc.parent = None
+                right = AVLTree._join(right, node, rc)
+        other = type(self)()
+        other._root = right
+        other._size = 0 if right is None else right._size
+        self._root = left
+        self._size = 0 if left is None else left._size
+        return other
 
+    @staticmethod
+    def _find_max_node(node):
+        while node.right is not None:
+            node = node.right
+        return node
 
-class AVLTree(BinarySearchTree):
+    @staticmethod
+    def _fix_up(node):
+        """Rebalance from node up to the root, which is returned.
 
-    def insert(self, key, value):
-        super(AVLTree, self).insert(key, value)
-        # find the newly inserted node
-        p = self._find(key)
-        while True:
-            p = AVLTree.balance_node(p)
-            if p.get_parent() is None:  # reaches the root
-                break
-            p = p.get_parent()
-        self._root = p
+        Heights and sizes are refreshed all the way up, so this always
+        takes O(log n).
+        """
+        root = None
+        while node is not None:
+            parent = node.parent
+            root = AVLTree.balance_node(node)
+            node = parent
+        return root
 
-    def remove(self, key):
-        try:
-            # tbr = to be removed
-            tbr = self._find(key)
-        except KeyError:
-            raise
-        else:
-            # TODO
-            pass
+    @staticmethod
+    def _join(left, mid, right):
+        """Root of a tree of the subtrees left and right with the lone
+        node mid between them, in O(|height(left) - height(right)|).
+        """
+        hl = AVLTree.get_node_height(left)
+        hr = AVLTree.get_node_height(right)
+        if hl > hr + 1:
+            # hang mid off the right spine of left, level with right
+            parent = None
+            node = left
+            while AVLTree.get_node_height(node) > hr + 1:
+                parent = node
+                node = node.right
+            mid.left = node
+            if node is not None:
+                node.parent = mid
+            mid.right = right
+            if right is not None:
+                right.parent = mid
+            parent.right = mid
+            mid.parent = parent
+            return AVLTree._fix_up(mid)
+        if hr > hl + 1:
+            parent = None
+            node = right
+            while AVLTree.get_node_height(node) > hl + 1:
+                parent = node
+                node = node.left
+            mid.right = node
+            if node is not None:
+                node.parent = mid
+            mid.left = left
+            if left is not None:
+                left.parent = mid
+            parent.left = mid
+            mid.parent = parent
+            return AVLTree._fix_up(mid)
+        mid.left = left
+        mid.right = right
+        if left is not None:
+            left.parent = mid
+        if right is not None:
+            right.parent = mid
+        mid.parent = None
+        mid._refresh()
+        return mid
 
     @staticmethod
     def get_node_height(node):
-        return 0 if node is None else node.get_height()
+        return 0 if node is None else node._height
 
     @staticmethod
     def get_node_bfactor(node):
         return (
-            AVLTree.get_node_height(node.get_right()) -
-            AVLTree.get_node_height(node.get_left())
+            AVLTree.get_node_height(node.right) -
+            AVLTree.get_node_height(node.left)
         )
 
     @staticmethod
     def fix_node_height(node):
-        hl = AVLTree.get_node_height(node.get_left())
-        hr = AVLTree.get_node_height(node.get_right())
-        node.set_height(hl + 1 if hl > hr else hr + 1)
+        node._refresh()
 
     @staticmethod
     def rotate_node_left(q):
-        p = q.get_right()
+        p = q.right
 
         # detach p's left and make it q's right
         # p_lst = p's left subtree
-        p_lst = p.get_left()
-        q.set_right(p_lst)
+        p_lst = p.left
+        q.right = p_lst
         if p_lst is not None:
-            p_lst.set_parent(q)
+            p_lst.parent = q
 
         # make q's parent's child p instead
         # q_p = q's parent
-        q_p = q.get_parent()
-        p.set_parent(q_p)
+        q_p = q.parent
+        p.parent = q_p
         if q_p is not None:
-            if q_p.get_left() is q:
-                q_p.set_left(p)
-            elif q_p.get_right() is q:
-                q_p.set_right(p)
+            if q_p.left is q:
+                q_p.left = p
+            else:
+                q_p.right = p
 
         # finally make q's parent p
-        p.set_left(q)
-        q.set_parent(p)
+        p.left = q
+        q.parent = p
 
-        # fix the heights
-        AVLTree.fix_node_height(p)
-        AVLTree.fix_node_height(q)
+        # fix the heights, q first as it is now below p
+        q._refresh()
+        p._refresh()
 
         return p
 
     @staticmethod
     def rotate_node_right(p):
-        q = p.get_left()
+        q = p.left
 
         # detach q's right and make it p's left
         # q_rst = q's right subtree
-        q_rst = q.get_right()
-        p.set_left(q_rst)
+        q_rst = q.right
+        p.left = q_rst
         if q_rst is not None:
-            q_rst.set_parent(p)
+            q_rst.parent = p
 
         # make's p's parent's child q instead
         # p_p = p's parent
-        p_p = p.get_parent()
-        q.set_parent(p_p)
+        p_p = p.parent
+        q.parent = p_p
         if p_p is not None:
-            if p_p.get_left() is p:
-                p_p.set_left(q)
-            elif p_p.get_right() is p:
-                p_p.set_right(q)
+            if p_p.left is p:
+                p_p.left = q
+            else:
+                p_p.right = q
 
         # finally you can make p's parent q
-        q.set_right(p)
-        p.set_parent(q)
+        q.right = p
+        p.parent = q
 
-        # fix the heights
-        AVLTree.fix_node_height(p)
-        AVLTree.fix_node_height(q)
+        # fix the heights, p first as it is now below q
+        p._refresh()
+        q._refresh()
 
         return q
 
@@ -179,42 +347,20 @@ class AVLTree(BinarySearchTree):
         """Balances node to satisfy AVL height specifications.
 
         Assumes that the height can only be off by one (2 or -2).
-        Hence, only useful to balance from bottom to top.
+        Hence, only useful to balance from bottom to top. Returns the
+        root of the subtree, which a rotation may have changed.
         """
-        AVLTree.fix_node_height(node)
-        if AVLTree.get_node_bfactor(node) == 2:
+        node._refresh()
+        bfactor = AVLTree.get_node_bfactor(node)
+        if bfactor == 2:
             # right subtree's left subtree is higher
-            if AVLTree.get_node_bfactor(node.get_right() < 0):
-                node.set_right(AVLTree.rotate_node_right(node.get_right()))
+            if AVLTree.get_node_bfactor(node.right) < 0:
+                AVLTree.rotate_node_right(node.right)
             return AVLTree.rotate_node_left(node)
-        elif AVLTree.get_node_bfactor(node) == -2:
+        elif bfactor == -2:
             # left subtree's right subtree is higher
-            if AVLTree.get_node_bfactor(node.get_left() > 0):
-                node.set_left(AVLTree.rotate_node_left(node.get_left()))
+            if AVLTree.get_node_bfactor(node.left) > 0:
+                AVLTree.rotate_node_left(node.left)
             return AVLTree.rotate_node_right(node)
         else:  # satisfies AVL height requirements
             return node
-
-    @staticmethod
-    def _pop_min_node(node):
-        """Recursive implementation for removing the minimum node.
-
-        Returns the removed node (previous minimum), and balances
-        each node on the way up.
-
-        TODO: needs a more reusable implementation that reuses code
-        inherited from BinarySearchTree.
-        """
-        if node.get_left() is None:
-            if node.get_right() is not None:
-                node.get_right().set_parent(node.get_parent())
-            return node.get_right()
-        p = node.set_left(
-            BinarySearchTree._pop_min_node(node.get_left())
-        )
-        return AVLTree.balance(p)
-
-    @staticmethod
-    def from_bst(bst):
-        # self._root = AVLNode.cast_from_node(bst._root)
-        pass
@@ -1,91 +1,213 @@
 # -*- coding: utf-8 -*-
 
-from cached_property import cached_property
+import operator
 
 
 class BinaryHeap(object):
+    """Array-backed d-ary heap, a binary heap by default.
 
-    def __init__(self):
-        # initialize with one element in the front
-        # for one-based inded array
-        # so integer division is easier when determining
-        # children and parent "nodes"
-        self._heap = [None]
+    Elements are ordered by ``key(el)``, or by the elements themselves if
+    no key is given; a comparator can be used through
+    ``functools.cmp_to_key``. The root is the element with the smallest
+    key, or the largest with ``reverse=True``, and the ``*_min`` methods
+    refer to it while the ``*_max`` methods refer to the other end of the
+    order.
+
+    Every node has up to d children, so a wider heap is shallower: with
+    d=4 a sift moves through half as many levels as with d=2, at the cost
+    of comparing more children per level.
+    """
+
+    def __init__(self, items=None, d=2, key=None, reverse=False):
+        """Construct a heap, optionally from an iterable of elements.
+
+        :param d: number of children per node, at least 2
+        :param key: function returning the key to order an element by
+        :param reverse: put the largest key at the root instead
+        """
+        if d < 2:
+            raise ValueError("d must be at least 2.")
+        self._d = d
+        self._key = key
+        self._lt = operator.gt if reverse else operator.lt
+        # zero-based: the children of i are d*i+1 .. d*i+d
+        self._heap = []
+        # keys parallel to the elements; without a key function the
+        # elements are their own keys and both names share one list
+        self._keys = self._heap if key is None else []
+        if items is not None:
+            self.heapify(items)
 
     @property
     def size(self):
-        return len(self._heap) - 1
+        return len(self._heap)
 
-    def insert(self, el):
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def clear(self):
+        """Remove all elements."""
+        del self._heap[:]
+        del self._keys[:]
+
+    def _append(self, el):
         self._heap.append(el)
-        self._percolate_up(self.size)
-        # invalidate the cache because internally updated
-        del self['_find_max_leaf']
+        if self._keys is not self._heap:
+            self._keys.append(self._key(el))
+
+    def _pop_last(self):
+        if self._keys is not self._heap:
+            self._keys.pop()
+        return self._heap.pop()
+
+    def insert(self, el):
+        """Add an element in O(log_d n)."""
+        self._append(el)
+        self._percolate_up(self.size - 1)
 
     def peek_min(self):
-        if self._size < 1:
+        """Return the root element, first in heap order."""
+        if self.size < 1:
             raise IndexError("No elements in heap.")
-        else:
-            return self._heap[1]
+        return self._heap[0]
 
     def delete_min(self):
-        self._heap[1] = self._heap.pop()
-        self._percolate_down(1)
-        # invalidate the cache because internally updated
-        del self['_find_max_leaf']
+        """Remove and return the root element in O(d log_d n)."""
+        if self.size < 1:
+            raise IndexError("No elements in heap.")
+        return self._remove_at(0)
+
+    def remove_min(self):
+        """Same as delete_min, named to pair with remove_max."""
+        return self.delete_min()
+
+    def pushpop(self, el):
+        """Add an element, then remove and return the root.
+
+        Faster than insert followed by delete_min: if el would become the
+        root it is returned straight away, and otherwise it takes the
+        root's place in a single sift.
+        """
+        if self.size and self._lt(self._keys[0], self._key_of(el)):
+            root = self._heap[0]
+            self._set(0, el)
+            self._percolate_down(0)
+            return root
+        return el
+
+    def replace(self, el):
+        """Remove and return the root, then add an element.
+
+        Unlike pushpop, the returned element may be larger than el.
+        """
+        if self.size < 1:
+            raise IndexError("No elements in heap.")
+        root = self._heap[0]
+        self._set(0, el)
+        self._percolate_down(0)
+        return root
+
+    def heapify(self, items):
+        """Add all elements of an iterable in O(n) by sifting bottom-up."""
+        for el in items:
+            self._append(el)
+        for i in reversed(range(self._parent(self.size - 1) + 1)):
+            self._percolate_down(i)
 
     def peek_max(self):
-        if self._size < 1:
+        """Return the element last in heap order, searching the leaves."""
+        if self.size < 1:
             raise IndexError("No elements in heap.")
-        else:
-            return self._heap[self._find_max_leaf()]
+        return self._heap[self._find_max()]
 
     def remove_max(self):
-        # TODO: this can be very tricky
-        # can we even do this without pointers...?
-        pass
+        """Remove and return the element last in heap order in O(n / d)."""
+        if self.size < 1:
+            raise IndexError("No elements in heap.")
+        return self._remove_at(self._find_max())
+
+    def _key_of(self, el):
+        return el if self._key is None else self._key(el)
+
+    def _set(self, i, el):
+        self._heap[i] = el
+        if self._keys is not self._heap:
+            self._keys[i] = self._key(el)
+
+    def _parent(self, i):
+        return (i - 1) // self._d
+
+    def _remove_at(self, i):
+        """Remove and return the element at index i."""
+        el = self._heap[i]
+        last = self._pop_last()
+        if i < self.size:
+            # fill the gap with the last element and restore the order
+            self._set(i, last)
+            self._percolate_up(self._percolate_down(i))
+        return el
 
     def _percolate_up(self, i):
-        while i // 2 > 0:  # cannot go further than root node
-            if self._heap[i] < self._heap[i // 2]:
-                # swap them
-                self._heap[i], self._heap[i // 2] = \
-                    self._heap[i // 2], self._heap[i]
-            i //= 2
+        heap = self._heap
+        keys = self._keys
+        lt = self._lt
+        d = self._d
+        el = heap[i]
+        k = keys[i]
+        # move parents down into the hole until el fits
+        while i > 0:
+            parent = (i - 1) // d
+            if not lt(k, keys[parent]):
+                break
+            heap[i] = heap[parent]
+            keys[i] = keys[parent]
+            i = parent
+        heap[i] = el
+        keys[i] = k
 
     def _percolate_down(self, i):
-        while i * 2 <= self.size:
-            mc = self._find_min_child(i)
-            if self._heap[i] > self._heap[mc]:
-                # swap elements
-                self._heap[i], self._heap[mc] = \
-                    self._heap[mc], self._heap[i]
+        """Sift the element at i down; returns its new index."""
+        heap = self._heap
+        keys = self._keys
+        lt = self._lt
+        d = self._d
+        size = len(heap)
+        el = heap[i]
+        k = keys[i]
+        # move the smallest child up into the hole until el fits
+        while True:
+            first = d * i + 1
+            if first >= size:
+                break
+            mc = self._find_min_child(first, min(first + d, size))
+            if not lt(keys[mc], k):
+                break
+            heap[i] = heap[mc]
+            keys[i] = keys[mc]
             i = mc
+        heap[i] = el
+        keys[i] = k
+        return i
+
+    def _find_min_child(self, first, stop):
+        """Index of the first in heap order among first .. stop - 1."""
+        keys = self._keys
+        lt = self._lt
+        mc = first
+        for c in range(first + 1, stop):
+            if lt(keys[c], keys[mc]):
+                mc = c
+        return mc
 
-    def _find_min_child(self, i):
-        # when there is only one leaf child
-        if i * 2 + 1 > self.size:
-            return i * 2
-        else:
-            return (
-                i * 2
-                if self._heap[i * 2] < self._heap[i * 2 + 1]
-                else i * 2 + 1
-            )
-
-    def _find_max_child(self, i):
-        if i * 2 + 1 > self.size:
-            return i * 2
-        else:
-            return (
-                i * 2
-                if self._heap[i * 2] > self._heap[i * 2 + 1]
-                else i * 2 + 1
-            )
-
-    @cached_property
-    def _find_max_leaf(self):
-        i = 1
-        while i * 2 <= self.size:
-            i = self._find_max_child(i)
+    def _find_max(self):
+        """Index of the last element in heap order, which is a leaf."""
+        keys = self._keys
+        lt = self._lt
+        i = self._parent(self.size - 1) + 1 if self.size > 1 else 0
+        for leaf in range(i + 1, self.size):
+            if lt(keys[i], keys[leaf]):
+                i = leaf
         return i
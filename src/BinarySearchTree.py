@@ -2,6 +2,14 @@
 
 
 class Node(object):
+    """A tree node; also what the tree iterates over.
+
+    Nodes compare and hash by identity, and a node keeps its key for as
+    long as it is in the tree, so handles can be kept in sets and used
+    as dictionary keys.
+    """
+
+    __slots__ = ('key', 'value', 'parent', 'left', 'right')
 
     def __init__(self, key, value, parent, left=None, right=None):
         self.key = key
@@ -43,53 +51,53 @@ class Node(object):
     def is_leaf(self):
         return (self.left is None and self.right is None)
 
-    def __eq__(self, other):
-        if self is other:
-            return True
-        elif other is None:
-            return False
-        else:
-            return (
-                self.key == other.key and
-                self.value == other.key and
-                self.parent == other.parent and
-                self.left == other.left and
-                self.right == other.right
-            )
-
     @staticmethod
     def get_node_max_depth(n):
-        if n is None:
-            return 0
-        else:
-            ld = Node.get_node_max_depth(n.left)
-            rd = Node.get_node_max_depth(n.right)
-            return max(ld, rd) + 1
+        """Number of levels in the subtree of n, found without recursion.
+        """
+        depth = 0
+        level = [] if n is None else [n]
+        while level:
+            depth += 1
+            level = [c for node in level for c in (node.left, node.right)
+                     if c is not None]
+        return depth
 
     def get_max_depth(self):
         return Node.get_node_max_depth(self)
 
 
 class BinarySearchTree(object):
+    """Binary search tree mapping keys to values, without balancing.
+
+    Searches, inserts and removals walk down from the root in a loop and
+    read the node attributes directly, so each takes O(h) for a tree of
+    height h without recursion, however unbalanced the tree gets. Keys
+    only need to support ``<``.
+    """
+
+    # the type of the nodes created by insert
+    Node = Node
 
     def __init__(self, lst=None):
-        if lst is None:
-            self._root = None
-            self._curr = None
-            self._size = 0
-        elif type(lst) is BinarySearchTree:
-            for item in lst:
-                self.insert(item.get_key(), item.get_value())
-        elif type(lst) is list:
-            for item in lst:
-                self.insert(item[0], item[1])
+        """Construct a tree, optionally from another tree or from an
+        iterable of (key, value) pairs.
+        """
+        self._root = None
+        self._size = 0
+        if isinstance(lst, BinarySearchTree):
+            for node in lst:
+                self.insert(node.key, node.value)
+        elif lst is not None:
+            for key, value in lst:
+                self.insert(key, value)
 
     def __str__(self):
         return BinarySearchTree._print_root(self._root)
 
     def clear(self):
-        self = BinarySearchTree()
-        assert self.is_empty()
+        self._root = None
+        self._size = 0
 
     @property
     def size(self):
@@ -101,132 +109,104 @@ class BinarySearchTree(object):
     def is_empty(self):
         return self.size == 0
 
-    def get(self, key):
+    def __contains__(self, key):
         try:
-            node = self._find(key)
+            self._find(key)
         except KeyError:
-            # TODO
-            raise
-        else:
-            return node.get_value()
+            return False
+        return True
+
+    def get(self, key):
+        return self._find(key).value
 
     def set(self, key, value):
-        try:
-            node = self._find(key)
-        except KeyError:
-            # TODO
-            raise
-        else:
-            node.set_value(value)
+        self._find(key).value = value
 
     def insert(self, key, value):
         """If the key already exists, update with the new value."""
-        # base case for when there is no elements
-        if self._root is None:
-            self._root = Node(key, value, parent=None)
-        else:
-            node = self._root
-            while True:
-                # the idea is to keep navigating until we reach
-                # a child node that is NULL, and so we set that
-                # "null child" as a new node with the key and value
-                # specified
-                if key < node.get_key():
-                    if node.get_left() is None:
-                        new_leaf = Node(key, value, parent=node)
-                        node.set_left(new_leaf)
-                        break
-                    else:
-                        node = node.get_left()
-                elif key > node.get_key():
-                    if node.get_right() is None:
-                        new_leaf = Node(key, value, parent=node)
-                        node.set_right(new_leaf)
-                        break
-                    else:
-                        node = node.get_right()
-                else:  # key is equal, set value
-                    node.set_value(value)
+        self._insert(key, value)
+
+    def _insert(self, key, value):
+        """Insert or update a key; returns the new node, or None if the
+        key was already in the tree.
+        """
+        node = self._root
+        if node is None:
+            self._root = self.Node(key, value, None)
+            self._size = 1
+            return self._root
+        while True:
+            # walk down to the empty child where the key belongs
+            k = node.key
+            if key < k:
+                child = node.left
+                if child is None:
+                    new = node.left = self.Node(key, value, node)
+                    break
+            elif k < key:
+                child = node.right
+                if child is None:
+                    new = node.right = self.Node(key, value, node)
                     break
-        # update size counter
+            else:  # key is equal, set value
+                node.value = value
+                return None
+            node = child
         self._size += 1
+        return new
 
     def remove(self, key):
-        try:
-            node = self._find(key)
-        except KeyError:
-            # TODO
-            pass
+        self._remove_node(self._find(key))
+
+    def _remove_node(self, node):
+        """Take a node out of the tree.
+
+        A node with two children is replaced by its successor, which has
+        no left child, so every node in the tree keeps its key. Returns
+        the lowest node whose subtree lost a node, None if the root was
+        removed and its child, if any, took its place.
+        """
+        parent = node.parent
+        if node.left is None or node.right is None:
+            child = node.left if node.left is not None else node.right
+            if child is not None:
+                child.parent = parent
+            lowest = parent
         else:
-            lc = node.get_left()
-            rc = node.get_right()
-            p = node.get_parent()
-            # leaf node (no children)
-            if lc is None and rc is None:
-                if p.get_left() is node:
-                    p.set_left(None)
-                elif p.get_right() is node:
-                    p.set_right(None)
-            # node has one children
-            elif lc is None and rc is not None:
-                rc.set_parent(p)
-                p.set_right(rc)
-            elif lc is not None and rc is None:
-                lc.set_parent(p)
-                p.set_left(lc)
-            # node has two children
-            elif lc is not None and rc is not None:
-                min_node = self._pop_min_node(rc)
-                node.set_key(min_node.get_key())
-                node.set_value(min_node.get_value())
-            # update size counter
-            self._size -= 1
+            child = succ = BinarySearchTree._find_min_node(node.right)
+            if succ.parent is node:
+                lowest = succ
+            else:
+                # unlink the successor from the bottom of the subtree
+                lowest = succ.parent
+                lowest.left = succ.right
+                if succ.right is not None:
+                    succ.right.parent = lowest
+                succ.right = node.right
+                succ.right.parent = succ
+            succ.left = node.left
+            succ.left.parent = succ
+            succ.parent = parent
+        if parent is None:
+            self._root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        node.parent = node.left = node.right = None
+        self._size -= 1
+        return lowest
 
     def __iter__(self):
-        """Iterate the elements of the tree from smallest to biggest."""
-        self._curr = None
-        return self
-
-    def __next__(self):
-        if self._curr is None:
-            self._curr = self._find_min()
-            return self._curr
-        elif self._curr.get_right() is not None:  # get leftmost leaf
-            self._curr = BinarySearchTree._find_min_node(
-                self._curr.get_right()
-            )
-            return self._curr
-        else:
-            while self._curr.get_parent() is not None:
-                # the next biggest element is only when
-                # you travel to a parent from a left node
-                if self._curr.get_parent().get_left() is self._curr:
-                    self._curr = self._curr.get_parent()
-                    return self._curr
-                else:
-                    self._curr = self._curr.get_parent()
-            # by now we cannot find any bigger elements
-            # which means we have reached the end of the iterator
-            # so we stop returning
-            raise StopIteration
+        """Iterate the nodes of the tree from smallest to biggest key."""
+        node = self._find_min()
+        while node is not None:
+            yield node
+            node = BinarySearchTree._successor(node)
 
     def __nonzero__(self):
         return not self.is_empty()
 
-    @staticmethod
-    def _pop_min_node(node):
-        """Recursive implementation for removing the minimum node.
-
-        Returns the removed node (previous minimum).
-        """
-        if node.get_left() is None:
-            if node.get_right() is not None:
-                node.get_right().set_parent(node.get_parent())
-            return node.get_right()
-        return node.set_left(
-            BinarySearchTree._pop_min_node(node.get_left())
-        )
-
     @staticmethod
     def _print_root(root):
         # TODO
@@ -234,27 +214,38 @@ class BinarySearchTree(object):
 
     @staticmethod
     def _find_min_node(node):
-        min_node = node
-        while min_node.get_left() is not None:
-            min_node = min_node.get_left()
-        return min_node
+        while node.left is not None:
+            node = node.left
+        return node
+
+    @staticmethod
+    def _successor(node):
+        """The node with the next bigger key, or None."""
+        if node.right is not None:
+            return BinarySearchTree._find_min_node(node.right)
+        # the next bigger key is the first ancestor reached from the left
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
 
     def _find_min(self):
-        """Find the node with the minimum key in the tree.
+        """Find the node with the minimum key in the tree, or None if empty.
 
         Useful for finding the beginning of the iterator.
         """
+        if self._root is None:
+            return None
         return self._find_min_node(self._root)
 
     def _find(self, key):
         """Internal find function that returns the node with the key."""
         node = self._root
         while node is not None:
-            if node.get_key() == key:
-                return node
-            elif node.get_key() < key:
-                node = node.get_left()
+            k = node.key
+            if key < k:
+                node = node.left
+            elif k < key:
+                node = node.right
             else:
-                node = node.get_right()
-        # not found
-        raise KeyError
+                return node
+        raise KeyError("key={} not found.".format(key))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import queue
+import threading
+
+from ._waiting import AsyncWaiters, wait
+from .DoublyLinkedList import DoublyLinkedList
+
+
+class _Deque(object):
+    """Optionally bounded deque of items in a DoublyLinkedList.
+
+    Holds the unsynchronized operations; the subclasses decide how a
+    caller waits for room or for items.
+    """
+
+    def __init__(self, capacity=None):
+        """Construct an empty deque.
+
+        :param capacity: maximum number of items, or None for no limit
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self._capacity = capacity
+        self._items = DoublyLinkedList()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def size(self):
+        return self._items.size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self._items.is_empty()
+
+    def is_full(self):
+        return self._capacity is not None and self.size >= self._capacity
+
+    def _put(self, val, front):
+        if front:
+            self._items.shift(val)
+        else:
+            self._items.push(val)
+
+    def _get(self, back):
+        return self._items.pop() if back else self._items.unshift()
+
+    def _get_many(self, n, back):
+        return [self._get(back) for _ in range(min(n, self.size))]
+
+
+class BlockingDeque(_Deque):
+    """Thread-safe deque whose ``put`` and ``get`` can block.
+
+    ``put`` appends to the end and ``get`` takes from the front, so the
+    deque works as a FIFO queue; ``put_front`` and ``get_back`` give the
+    other ends. Blocking calls wait until there is room or an item, for
+    at most timeout seconds, and otherwise raise ``queue.Full`` or
+    ``queue.Empty`` like the standard library's queues.
+    """
+
+    def __init__(self, capacity=None):
+        super(BlockingDeque, self).__init__(capacity)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _put_blocking(self, val, front, block, timeout):
+        with self._lock:
+            wait(self._not_full, lambda: not self.is_full(), block,
+                 timeout, queue.Full)
+            self._put(val, front)
+            self._not_empty.notify()
+
+    def _get_blocking(self, n, back, block, timeout):
+        with self._lock:
+            wait(self._not_empty, lambda: not self.is_empty(), block,
+                 timeout, queue.Empty)
+            vals = self._get_many(n, back)
+            self._not_full.notify(len(vals))
+            return vals
+
+    def put(self, val, block=True, timeout=None):
+        """Append an item to the end, waiting for room if bounded."""
+        self._put_blocking(val, False, block, timeout)
+
+    def put_front(self, val, block=True, timeout=None):
+        """Append an item to the front, waiting for room if bounded."""
+        self._put_blocking(val, True, block, timeout)
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the first item, waiting for one if empty."""
+        return self._get_blocking(1, False, block, timeout)[0]
+
+    def get_back(self, block=True, timeout=None):
+        """Remove and return the last item, waiting for one if empty."""
+        return self._get_blocking(1, True, block, timeout)[0]
+
+    def get_many(self, n, block=True, timeout=None):
+        """Remove and return up to n items from the front as a list.
+
+        Waits only until at least one item is available, then takes as
+        many as there are, up to n, under a single lock acquisition.
+        """
+        return self._get_blocking(n, False, block, timeout)
+
+
+class AsyncDeque(_Deque):
+    """Deque for coroutines of one event loop, with awaitable put and get.
+
+    The same interface as BlockingDeque, except that waiting methods are
+    coroutines taking only a timeout, after which they raise
+    ``asyncio.TimeoutError``; the ``*_nowait`` methods raise
+    ``asyncio.QueueFull`` and ``asyncio.QueueEmpty`` instead of waiting.
+    Waiting coroutines are woken in order, one per freed slot or new
+    item.
+    """
+
+    def __init__(self, capacity=None):
+        super(AsyncDeque, self).__init__(capacity)
+        self._getters = AsyncWaiters()
+        self._putters = AsyncWaiters()
+
+    def put_nowait(self, val, front=False):
+        """Append an item to the end, or the front, without waiting."""
+        if self.is_full():
+            raise asyncio.QueueFull
+        self._put(val, front)
+        self._getters.wake()
+
+    def get_many_nowait(self, n, back=False):
+        """Remove and return up to n items from the front, or the back."""
+        if self.is_empty():
+            raise asyncio.QueueEmpty
+        vals = self._get_many(n, back)
+        for _ in vals:
+            self._putters.wake()
+        return vals
+
+    def get_nowait(self, back=False):
+        """Remove and return the first, or last, item without waiting."""
+        return self.get_many_nowait(1, back)[0]
+
+    async def put(self, val, timeout=None):
+        """Append an item to the end, waiting for room if bounded."""
+        await self._putters.wait(lambda: not self.is_full(), timeout)
+        self.put_nowait(val)
+
+    async def put_front(self, val, timeout=None):
+        """Append an item to the front, waiting for room if bounded."""
+        await self._putters.wait(lambda: not self.is_full(), timeout)
+        self.put_nowait(val, front=True)
+
+    async def get(self, timeout=None):
+        """Remove and return the first item, waiting for one if empty."""
+        await self._getters.wait(lambda: not self.is_empty(), timeout)
+        return self.get_nowait()
+
+    async def get_back(self, timeout=None):
+        """Remove and return the last item, waiting for one if empty."""
+        await self._getters.wait(lambda: not self.is_empty(), timeout)
+        return self.get_nowait(back=True)
+
+    async def get_many(self, n, timeout=None):
+        """Remove and return up to n items from the front as a list.
+
+        Waits only until at least one item is available.
+        """
+        await self._getters.wait(lambda: not self.is_empty(), timeout)
+        return self.get_many_nowait(n)
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import queue
+import threading
+import time
+
+from ._waiting import AsyncWaiters, wait
+from .PriorityQueue import BINARY_HEAP, PriorityQueue
+
+
+class _PriorityQueue(object):
+    """Optionally bounded PriorityQueue with the unsynchronized operations.
+
+    The subclasses decide how a caller waits for room or for elements.
+    """
+
+    def __init__(self, backend=BINARY_HEAP, capacity=None):
+        """Construct an empty queue.
+
+        :param backend: heap backend, as for PriorityQueue
+        :param capacity: maximum number of elements, or None for no limit
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self._capacity = capacity
+        self._queue = PriorityQueue(backend)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def size(self):
+        return self._queue.size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self._queue.is_empty()
+
+    def is_full(self):
+        return self._capacity is not None and self.size >= self._capacity
+
+
+class BlockingPriorityQueue(_PriorityQueue):
+    """Thread-safe PriorityQueue whose ``put`` and ``get`` can block.
+
+    ``get`` returns the element with the highest priority. Blocking calls
+    wait until there is room or an element, for at most timeout seconds,
+    and otherwise raise ``queue.Full`` or ``queue.Empty`` like the
+    standard library's queues. Putting an element that is already queued
+    only changes its priority, so it never waits for room.
+    """
+
+    def __init__(self, backend=BINARY_HEAP, capacity=None):
+        super(BlockingPriorityQueue, self).__init__(backend, capacity)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __contains__(self, el):
+        with self._lock:
+            return el in self._queue
+
+    def put(self, el, priority, block=True, timeout=None):
+        """Queue an element, waiting for room if bounded."""
+        with self._lock:
+            if el not in self._queue:
+                wait(self._not_full, lambda: not self.is_full(), block,
+                     timeout, queue.Full)
+            self._queue.insert(el, priority)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the highest priority element.
+
+        Waits for one if the queue is empty.
+        """
+        with self._lock:
+            wait(self._not_empty, lambda: not self.is_empty(), block,
+                 timeout, queue.Empty)
+            el = self._queue.pop_highest_priority()
+            self._not_full.notify()
+            return el
+
+    def peek(self):
+        """Return the highest priority element without removing it."""
+        with self._lock:
+            if self.is_empty():
+                raise queue.Empty
+            return self._queue.peek_highest_priority()
+
+    def get_priority(self, el):
+        """Return the priority of a queued element."""
+        with self._lock:
+            return self._queue.get_priority(el)
+
+    def update_priority(self, el, priority):
+        """Change the priority of a queued element."""
+        with self._lock:
+            self._queue.update_priority(el, priority)
+
+    def remove(self, el):
+        """Remove a queued element, making room for a waiting put."""
+        with self._lock:
+            self._queue.remove(el)
+            self._not_full.notify()
+
+
+class AsyncPriorityQueue(_PriorityQueue):
+    """PriorityQueue for coroutines of one event loop.
+
+    The same interface as BlockingPriorityQueue, except that ``put`` and
+    ``get`` are coroutines taking only a timeout, after which they raise
+    ``asyncio.TimeoutError``; ``put_nowait`` and ``get_nowait`` raise
+    ``asyncio.QueueFull`` and ``asyncio.QueueEmpty`` instead of waiting.
+    Waiting coroutines are woken in order, one per freed slot or new
+    element.
+    """
+
+    def __init__(self, backend=BINARY_HEAP, capacity=None):
+        super(AsyncPriorityQueue, self).__init__(backend, capacity)
+        self._getters = AsyncWaiters()
+        self._putters = AsyncWaiters()
+
+    def __contains__(self, el):
+        return el in self._queue
+
+    def put_nowait(self, el, priority):
+        """Queue an element without waiting."""
+        if el not in self._queue and self.is_full():
+            raise asyncio.QueueFull
+        self._queue.insert(el, priority)
+        self._getters.wake()
+
+    def get_nowait(self):
+        """Remove and return the highest priority element without waiting.
+        """
+        if self.is_empty():
+            raise asyncio.QueueEmpty
+        el = self._queue.pop_highest_priority()
+        self._putters.wake()
+        return el
+
+    async def put(self, el, priority, timeout=None):
+        """Queue an element, waiting for room if bounded."""
+        await self._putters.wait(
+            lambda: el in self._queue or not self.is_full(), timeout)
+        self.put_nowait(el, priority)
+
+    async def get(self, timeout=None):
+        """Remove and return the highest priority element.
+
+        Waits for one if the queue is empty.
+        """
+        await self._getters.wait(lambda: not self.is_empty(), timeout)
+        return self.get_nowait()
+
+    def peek(self):
+        """Return the highest priority element without removing it."""
+        if self.is_empty():
+            raise asyncio.QueueEmpty
+        return self._queue.peek_highest_priority()
+
+    def get_priority(self, el):
+        """Return the priority of a queued element."""
+        return self._queue.get_priority(el)
+
+    def update_priority(self, el, priority):
+        """Change the priority of a queued element."""
+        self._queue.update_priority(el, priority)
+
+    def remove(self, el):
+        """Remove a queued element, making room for a waiting put."""
+        self._queue.remove(el)
+        self._putters.wake()
+
+
+class DelayQueue(BlockingPriorityQueue):
+    """Thread-safe queue whose elements become available at a set time.
+
+    Each element is queued with the time it is due as its priority,
+    negated so that the earliest is served first, and ``get`` only
+    returns an element once its time has come, waiting for it if
+    necessary. Times are read from clock, which should count seconds
+    like ``time.monotonic``, the default.
+    """
+
+    def __init__(self, backend=BINARY_HEAP, capacity=None,
+                 clock=time.monotonic):
+        super(DelayQueue, self).__init__(backend, capacity)
+        self._clock = clock
+
+    def put(self, el, delay=0, block=True, timeout=None):
+        """Queue an element to become available after delay seconds."""
+        self.put_at(el, self._clock() + delay, block, timeout)
+
+    def put_at(self, el, when, block=True, timeout=None):
+        """Queue an element to become available at clock time when.
+
+        Queueing an element again reschedules it.
+        """
+        super(DelayQueue, self).put(el, -when, block, timeout)
+
+    def get_due_time(self, el):
+        """Return the clock time at which a queued element is due."""
+        return -self.get_priority(el)
+
+    def reschedule(self, el, delay):
+        """Make a queued element available after delay seconds instead."""
+        with self._lock:
+            self._queue.update_priority(el, -(self._clock() + delay))
+            # the head may have moved to an earlier time
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the element that is due first.
+
+        Waits until it is due, or for an element if the queue is empty;
+        raises ``queue.Empty`` if none is due within timeout seconds.
+        """
+        with self._lock:
+            deadline = None
+            if timeout is not None:
+                deadline = self._clock() + timeout
+            while True:
+                now = self._clock()
+                wait = None
+                if not self.is_empty():
+                    wait = self._due_in(now)
+                    if wait <= 0:
+                        break
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise queue.Empty
+                    wait = remaining if wait is None else \
+                        min(wait, remaining)
+                if not block:
+                    raise queue.Empty
+                self._not_empty.wait(wait)
+            el = self._queue.pop_highest_priority()
+            self._not_full.notify()
+            if not self.is_empty():
+                # another getter may be waiting for the new head
+                self._not_empty.notify()
+            return el
+
+    def _due_in(self, now):
+        head = self._queue.peek_highest_priority()
+        return -self._queue.get_priority(head) - now
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+from .BinaryHeap import BinaryHeap
+from .PriorityQueue import BINARY_HEAP, PriorityQueue
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only used by offer_many
+    np = None
+
+
+class TopK(BinaryHeap):
+    """The k largest elements seen so far, or the k smallest if reversed.
+
+    A heap of at most k elements with the worst one kept at the root, so
+    it is the threshold an offered element has to beat: offer rejects an
+    element with one comparison, and otherwise replaces the root in
+    O(log k). Among equal keys the element offered first is kept.
+    """
+
+    def __init__(self, k, items=None, key=None, reverse=False):
+        """Construct an empty selection, then offer items if given.
+
+        :param k: number of elements to keep, at least 1
+        :param key: function returning the key to order an element by
+        :param reverse: keep the k smallest keys instead
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        self._k = k
+        self._reverse = reverse
+        # the root is the smallest of the k largest, and vice versa
+        super(TopK, self).__init__(None, 2, key, reverse)
+        if items is not None:
+            self.offer_many(items)
+
+    @property
+    def k(self):
+        return self._k
+
+    def is_full(self):
+        return self.size >= self._k
+
+    def threshold(self):
+        """Return the worst element kept, which the next one must beat."""
+        return self.peek_min()
+
+    def offer(self, el):
+        """Keep an element if it is among the k best; returns whether it is.
+        """
+        if self.size < self._k:
+            super(TopK, self).insert(el)
+            return True
+        if not self._lt(self._keys[0], self._key_of(el)):
+            return False
+        self.replace(el)
+        return True
+
+    def insert(self, el):
+        """Same as offer."""
+        self.offer(el)
+
+    def heapify(self, items):
+        """Same as offer_many."""
+        self.offer_many(items)
+
+    def offer_many(self, items):
+        """Offer every element of an iterable.
+
+        A NumPy array is pre-filtered without a Python loop: once the
+        selection is full only the elements that beat the threshold are
+        looked at, and of those at most the k best, found with
+        ``numpy.partition`` in linear time. Arrays are only filtered when
+        there is no key function, since it is applied per element.
+        """
+        if np is not None and isinstance(items, np.ndarray) and \
+                self._key is None:
+            items = self._prefilter(items.ravel())
+        lt = self._lt
+        key_of = self._key_of
+        insert = super(TopK, self).insert
+        for el in items:
+            if self.size < self._k:
+                insert(el)
+            elif lt(self._keys[0], key_of(el)):
+                self.replace(el)
+
+    def _prefilter(self, arr):
+        """Elements of a 1-d array that could be kept, as Python scalars."""
+        if self.is_full():
+            t = self._keys[0]
+            arr = arr[arr < t] if self._reverse else arr[arr > t]
+        k = self._k
+        if len(arr) > k:
+            if self._reverse:
+                arr = np.partition(arr, k - 1)[:k]
+            else:
+                arr = np.partition(arr, len(arr) - k)[len(arr) - k:]
+        return arr.tolist()
+
+    def merge(self, other):
+        """Offer the elements kept by another selection, such as a partial
+        result from another worker; other is left as it is.
+        """
+        if other is self:
+            raise ValueError("Cannot merge a selection with itself.")
+        self.offer_many(list(other._heap))
+
+    def to_list(self):
+        """Return the elements kept, best first."""
+        return sorted(self._heap, key=self._key, reverse=not self._reverse)
+
+
+class BoundedPriorityQueue(PriorityQueue):
+    """PriorityQueue that holds at most k elements.
+
+    When full, an element is only queued if its priority is higher than
+    the lowest queued one, which is then evicted. The array backend has
+    the lowest priority element next to the root, so this is O(log k).
+    """
+
+    def __init__(self, k):
+        """Construct an empty queue.
+
+        :param k: maximum number of elements, at least 1
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        super(BoundedPriorityQueue, self).__init__(BINARY_HEAP)
+        self._k = k
+
+    @property
+    def k(self):
+        return self._k
+
+    def is_full(self):
+        return self.size >= self._k
+
+    def insert(self, el, priority):
+        """Queue an element, or give it a new priority if already queued.
+
+        Returns whether the element is queued afterwards.
+        """
+        if self.size >= self._k and el not in self:
+            if not priority > self._data.peek_max().get_priority():
+                return False
+            self.remove_lowest_priority()
+        super(BoundedPriorityQueue, self).insert(el, priority)
+        return True
+
+    def offer(self, el, priority):
+        """Same as insert."""
+        return self.insert(el, priority)
+
+    def batch_insert(self, prioritized_elements):
+        """Queue an iterable of (element, priority) pairs, one at a time."""
+        for el, priority in prioritized_elements:
+            self.insert(el, priority)
+
+    def meld(self, other):
+        """Move all elements of another queue into this one, as inserts.
+
+        Elements queued in both keep the priority from other. other is
+        left empty.
+        """
+        if other is self:
+            raise ValueError("Cannot meld a queue with itself.")
+        for el, entry in other._entries.items():
+            self.insert(el, entry.get_priority())
+        other.clear()
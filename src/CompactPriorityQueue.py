@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+
+class CompactPriorityQueue(object):
+    """Array-backed queue of elements served by priority, highest first.
+
+    A binary heap kept in three parallel arrays: a list of the elements,
+    an ``array('d')`` of their priorities and an ``array('q')`` of
+    insertion numbers. An entry costs a list slot and 16 bytes rather
+    than an object, and sifting compares raw floats, so it is smaller
+    and faster than PriorityQueue. Elements of equal priority are served
+    in the order they were inserted.
+
+    Priorities must be real numbers. There is no index of the elements,
+    so unlike PriorityQueue an element may be queued more than once, and
+    only the highest priority element can be looked at or removed.
+    """
+
+    def __init__(self, prioritized_elements=None):
+        """Construct a queue, optionally from (element, priority) pairs."""
+        self._elements = []
+        self._priorities = array('d')
+        self._seqs = array('q')
+        self._counter = 0
+        if prioritized_elements is not None:
+            self.batch_insert(prioritized_elements)
+
+    @property
+    def size(self):
+        return len(self._elements)
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def clear(self):
+        self._elements = []
+        self._priorities = array('d')
+        self._seqs = array('q')
+        self._counter = 0
+
+    def _append(self, el, priority):
+        self._priorities.append(priority)
+        self._elements.append(el)
+        self._seqs.append(self._counter)
+        self._counter += 1
+
+    def _sift_up(self, i):
+        """Move the last inserted entry at i up to its place.
+
+        Its insertion number is the largest, so it stops below any equal
+        priority without comparing them.
+        """
+        els, prios, seqs = self._elements, self._priorities, self._seqs
+        el, p, s = els[i], prios[i], seqs[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if prios[parent] >= p:
+                break
+            els[i] = els[parent]
+            prios[i] = prios[parent]
+            seqs[i] = seqs[parent]
+            i = parent
+        els[i] = el
+        prios[i] = p
+        seqs[i] = s
+
+    def _sift_down(self, i):
+        """Move the entry at i down past every child that goes first."""
+        els, prios, seqs = self._elements, self._priorities, self._seqs
+        n = len(els)
+        el, p, s = els[i], prios[i], seqs[i]
+        while True:
+            c = 2 * i + 1
+            if c >= n:
+                break
+            r = c + 1
+            if r < n and (prios[r] > prios[c] or
+                          prios[r] == prios[c] and seqs[r] < seqs[c]):
+                c = r
+            cp = prios[c]
+            if p > cp or p == cp and s < seqs[c]:
+                break
+            els[i] = els[c]
+            prios[i] = cp
+            seqs[i] = seqs[c]
+            i = c
+        els[i] = el
+        prios[i] = p
+        seqs[i] = s
+
+    def insert(self, el, priority):
+        """Queue an element in O(log n)."""
+        self._append(el, priority)
+        self._sift_up(self.size - 1)
+
+    def batch_insert(self, prioritized_elements):
+        """Queue an iterable of (element, priority) pairs.
+
+        A batch that is large next to the queue is appended whole and the
+        order restored bottom-up, in O(n + k) instead of k sifts.
+        """
+        start = self.size
+        for el, priority in prioritized_elements:
+            self._append(el, priority)
+        k = self.size - start
+        if k * start.bit_length() < start:
+            for i in range(start, self.size):
+                self._sift_up(i)
+        else:
+            for i in reversed(range(self.size // 2)):
+                self._sift_down(i)
+
+    def peek_highest_priority(self):
+        if not self._elements:
+            raise IndexError("No elements in queue.")
+        return self._elements[0]
+
+    def remove_highest_priority(self):
+        self.pop_highest_priority()
+
+    def pop_highest_priority(self):
+        """Remove and return the highest priority element in O(log n)."""
+        els = self._elements
+        if not els:
+            raise IndexError("No elements in queue.")
+        top = els[0]
+        el = els.pop()
+        p = self._priorities.pop()
+        s = self._seqs.pop()
+        if els:
+            els[0] = el
+            self._priorities[0] = p
+            self._seqs[0] = s
+            self._sift_down(0)
+        return top
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from .HashTable import HashTable, LINEAR_PROBING
+
+# marker for a missing key, distinct from any stored value
+_MISSING = object()
+
+
+class ConcurrentHashTable(object):
+    """Thread-safe hash table split into independently locked segments.
+
+    Each key belongs to one segment, an ordinary HashTable guarded by its
+    own lock, so writers to different segments never wait for each other
+    and a resize only blocks the segment that grows.
+
+    Reads take no lock. Every segment has a version counter that writers
+    bump before and after changing it (odd while a write is in progress),
+    and a read is accepted only if the version was even and unchanged
+    across the lookup. Otherwise the read retries under the lock.
+    """
+
+    def __init__(self, segments=16, method=LINEAR_PROBING,
+                 load_factor_threshold=0.50, **kwargs):
+        """Construct an empty table.
+
+        :param segments: number of independently locked segments
+        :param method: collision resolution of every segment
+        :param load_factor_threshold: resize threshold of every segment
+        :param kwargs: other HashTable arguments for every segment
+        """
+        if segments < 1:
+            raise ValueError("Need at least one segment.")
+        self._segments = [
+            HashTable(method=method,
+                      load_factor_threshold=load_factor_threshold, **kwargs)
+            for _ in range(segments)
+        ]
+        self._locks = [threading.Lock() for _ in range(segments)]
+        self._versions = [0] * segments
+
+    @property
+    def size(self):
+        """Number of keys; only a snapshot while writers are active."""
+        return sum(seg.size for seg in self._segments)
+
+    def __len__(self):
+        return self.size
+
+    def _segment_index(self, k):
+        return hash(k) % len(self._segments)
+
+    def _read(self, k, default):
+        """Look k up optimistically, falling back to the segment lock."""
+        i = self._segment_index(k)
+        seg = self._segments[i]
+        version = self._versions[i]
+        if not version & 1:
+            try:
+                value = seg._lookup(k, default)
+            except Exception:
+                # raced with a writer; the locked lookup below either
+                # succeeds or raises the error for real
+                pass
+            else:
+                if self._versions[i] == version:
+                    return value
+        with self._locks[i]:
+            return seg._lookup(k, default)
+
+    def _write(self, k, op, *args):
+        """Apply a segment method to the segment of k under its lock."""
+        i = self._segment_index(k)
+        with self._locks[i]:
+            self._versions[i] += 1
+            try:
+                return op(self._segments[i], k, *args)
+            finally:
+                self._versions[i] += 1
+
+    def __contains__(self, k):
+        return self._read(k, _MISSING) is not _MISSING
+
+    def get(self, k, default=None):
+        """Return the value stored for k, or default if it is absent."""
+        return self._read(k, default)
+
+    def __getitem__(self, k):
+        value = self._read(k, _MISSING)
+        if value is _MISSING:
+            raise KeyError("key={} not found.".format(k))
+        return value
+
+    def insert(self, k, value=None):
+        """Insert k with an associated value, or update its value."""
+        self._write(k, HashTable.insert, value)
+
+    def __setitem__(self, k, value):
+        self.insert(k, value)
+
+    def remove(self, k):
+        self._write(k, HashTable.remove)
+
+    def __delitem__(self, k):
+        self.remove(k)
+
+    def setdefault(self, k, default=None):
+        """Return the value of k, inserting default first if it is absent.
+
+        The check and the insert happen atomically.
+        """
+        return self._write(k, _setdefault, default)
+
+    def items(self):
+        """Iterate over the (key, value) pairs.
+
+        Each segment is copied under its lock, so the pairs of a segment
+        are consistent with each other but not with other segments.
+        """
+        for i, seg in enumerate(self._segments):
+            with self._locks[i]:
+                pairs = list(seg.items())
+            for pair in pairs:
+                yield pair
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+
+def _setdefault(seg, k, default):
+    value = seg.get(k, _MISSING)
+    if value is _MISSING:
+        seg.insert(k, default)
+        return default
+    return value
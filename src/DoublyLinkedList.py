@@ -1,25 +1,28 @@
 # -*- coding: utf-8 -*-
 
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only used by to_numpy
+    np = None
+
 
 class Node(object):
+    """A list node; also the handle returned by the O(1) node methods.
+
+    Nodes compare and hash by identity, so handles can be kept in sets
+    and used as dictionary keys.
+    """
+
+    # no per-node __dict__, which more than halves the size of a node
+    __slots__ = ('val', 'prev', 'next')
 
     def __init__(self, val, prev=None, next=None):
         self.val = val
         self.prev = prev
         self.next = next
 
-    def __eq__(self, other):
-        if self is other:
-            return True
-        elif other is None:
-            return False
-        else:
-            return (
-                self.prev == other.prev and
-                self.next == other.next and
-                self.val == other.val
-            )
-
 
 class DoublyLinkedList(object):
     _head = None
@@ -34,9 +37,56 @@ class DoublyLinkedList(object):
         """
         if lst is None:
             pass
-        elif (type(lst) in {DoublyLinkedList, list}):
-            for item in lst:
-                self.push(item)
+        elif isinstance(lst, (DoublyLinkedList, list)):
+            self.extend(lst)
+
+    @classmethod
+    def from_iterable(cls, items):
+        """Build a list from an iterable or a NumPy array in one pass."""
+        res = cls()
+        res.extend(items)
+        return res
+
+    @classmethod
+    def from_buffer(cls, buf, typecode=None):
+        """Build a list from the items of a buffer, e.g. an array.array.
+
+        :param buf: object supporting the buffer protocol
+        :param typecode: struct format to read a raw byte buffer as; by
+            default the buffer's own format is used
+        """
+        view = memoryview(buf)
+        if typecode is not None:
+            view = view.cast('B').cast(typecode)
+        return cls.from_iterable(view.tolist())
+
+    def extend(self, items):
+        """Append every item of an iterable or NumPy array to the end.
+
+        The new nodes are linked to each other in one loop, and then
+        attached to the tail as a whole.
+        """
+        if np is not None and isinstance(items, np.ndarray):
+            items = items.tolist()
+        head = pred = None
+        cnt = 0
+        for item in items:
+            node = Node(item, pred)
+            if pred is None:
+                head = node
+            else:
+                pred.next = node
+            pred = node
+            cnt += 1
+        if head is None:
+            return
+        head.prev = self._tail
+        if self._tail is None:  # empty list
+            self._head = head
+        else:
+            self._tail.next = head
+        self._tail = pred
+        self._size += cnt
 
     def clear(self):
         """Empty the list."""
@@ -60,7 +110,11 @@ class DoublyLinkedList(object):
         return self.size == 0
 
     def push(self, val):
-        """Append an item to the end of the list."""
+        """Append an item to the end of the list.
+
+        Returns the node holding the item, a handle for the O(1) node
+        methods.
+        """
         node = Node(val)
         if self._head is None:  # empty list
             self._head = self._tail = node
@@ -70,6 +124,7 @@ class DoublyLinkedList(object):
             self._tail.next = node
             self._tail = node
         self._size += 1
+        return node
 
     def pop(self):
         """Remove and return the last item from the list."""
@@ -80,7 +135,11 @@ class DoublyLinkedList(object):
         return self.remove(0)
 
     def shift(self, val):
-        """Append an item to the front of the list."""
+        """Append an item to the front of the list.
+
+        Returns the node holding the item, a handle for the O(1) node
+        methods.
+        """
         node = Node(val=val)
         if self._tail is None:  # empty list
             self._head = self._tail = node
@@ -90,15 +149,16 @@ class DoublyLinkedList(object):
             self._head.prev = node
             self._head = node
         self._size += 1
+        return node
 
     def insert(self, pos, val):
         """Insert an item at a certain position in the list."""
         if (pos < 0 or pos > self.size):
             raise IndexError("Out of bounds.")
         if pos == 0:
-            self.push(val)
-        elif pos == self.size:
             self.shift(val)
+        elif pos == self.size:
+            self.push(val)
         else:
             node = self._get_node_at(pos)
             pred = node.prev
@@ -112,6 +172,101 @@ class DoublyLinkedList(object):
         if (pos < 0 or pos >= self.size):
             raise IndexError("Out of bounds.")
         node = self._get_node_at(pos)
+        self._unlink(node)
+        return node.val
+
+    @property
+    def head(self):
+        """Node of the first item, or None if the list is empty."""
+        return self._head
+
+    @property
+    def tail(self):
+        """Node of the last item, or None if the list is empty."""
+        return self._tail
+
+    def remove_node(self, node):
+        """Remove a node of this list and return its item in O(1)."""
+        self._unlink(node)
+        return node.val
+
+    def move_to_front(self, node):
+        """Move a node of this list to the front in O(1)."""
+        if node is not self._head:
+            self._unlink(node)
+            self._link_after(None, node)
+
+    def move_to_back(self, node):
+        """Move a node of this list to the end in O(1)."""
+        if node is not self._tail:
+            self._unlink(node)
+            self._link_after(self._tail, node)
+
+    def insert_after(self, node, val):
+        """Insert an item right after a node of this list in O(1).
+
+        Returns the node holding the new item.
+        """
+        new_node = Node(val)
+        self._link_after(node, new_node)
+        return new_node
+
+    def insert_before(self, node, val):
+        """Insert an item right before a node of this list in O(1).
+
+        Returns the node holding the new item.
+        """
+        new_node = Node(val)
+        self._link_after(node.prev, new_node)
+        return new_node
+
+    def splice(self, node, other):
+        """Move all items of other right after a node of this list.
+
+        If node is None the items go to the front. Runs in O(1) since only
+        the end nodes are relinked; other is left empty.
+        """
+        if other is self:
+            raise ValueError("Cannot splice a list into itself.")
+        if other._head is None:
+            return
+        first = other._head
+        last = other._tail
+        succ = self._head if node is None else node.next
+        first.prev = node
+        last.next = succ
+        if node is None:
+            self._head = first
+        else:
+            node.next = first
+        if succ is None:
+            self._tail = last
+        else:
+            succ.prev = last
+        self._size += other._size
+        other._head = other._tail = None
+        other._size = 0
+
+    def _link_after(self, pred, node):
+        """Link a detached node after pred, or at the front if pred is None.
+
+        Runs in O(1), for structures that keep references to nodes.
+        """
+        succ = self._head if pred is None else pred.next
+        node.prev = pred
+        node.next = succ
+        if pred is None:  # at head
+            self._head = node
+        else:
+            pred.next = node
+        if succ is None:  # at tail
+            self._tail = node
+        else:
+            succ.prev = node
+        self._size += 1
+
+    def _unlink(self, node):
+        """Detach a node of this list in O(1)."""
         pred = node.prev
         succ = node.next
         if pred is None:  # at head
@@ -122,8 +277,8 @@ class DoublyLinkedList(object):
             self._tail = pred
         else:
             succ.prev = pred
+        node.prev = node.next = None
         self._size -= 1
-        return node.val
 
     def __delitem__(self, pos):
         self.remove(pos)
@@ -139,24 +294,21 @@ class DoublyLinkedList(object):
         if isinstance(key, int):
             return self.get(key)
         elif isinstance(key, slice):
-            start, stop, step = key.indices(len(self))
-            # create new list
-            res = DoublyLinkedList()
-            # "jump" to starting index
-            head = self._get_node_at(start)
-            res.push(head.val)
-            start += step
-            cond = (start < stop) if step > 0 else (start > stop)
-            while cond:
-                for _ in range(abs(step)):
-                    head = head.next if step > 0 else head.prev
-                res.push(head.val)
-                start += step
-                cond = (start < stop) if step > 0 else (start > stop)
-            return res
+            # copy the items of a view of the slice into a new list
+            return self.view(key.start, key.stop, key.step).to_list()
         else:
             raise TypeError('Index must be int or slice')
 
+    def view(self, start=None, stop=None, step=None):
+        """Return a lazy view of a slice of the list.
+
+        Unlike slicing, nothing is copied: the view walks the nodes of
+        this list whenever it is iterated. It is only valid until this
+        list is changed.
+        """
+        key = slice(start, stop, step)
+        return DoublyLinkedListView(self, range(*key.indices(len(self))))
+
     def set(self, pos, val):
         """Set a new value for an item at a certain position in the list."""
         if (pos < 0 or pos >= self.size):
@@ -166,7 +318,7 @@ class DoublyLinkedList(object):
 
     def __setitem__(self, key, value):
         if isinstance(key, int):
-            return self.get(key, value)
+            self.set(key, value)
         elif isinstance(key, slice):
             start, stop, step = key.indices(len(self))
             # TODO
@@ -202,7 +354,7 @@ class DoublyLinkedList(object):
 
         Calls the constructor with this list as the parameter.
         """
-        return DoublyLinkedList(self)
+        return type(self)(self)
 
     def __eq__(self, other):
         """Check whether all values in the two lists are equal."""
@@ -241,21 +393,30 @@ class DoublyLinkedList(object):
         if not isinstance(other, DoublyLinkedList):
             raise TypeError
         res = self.clone()
-        other = other.clone()
-        res._tail.next = other._head
-        other._head.prev = res._tail
-        res._tail = other._tail
+        res.splice(res._tail, other.clone())
         return res
 
+    def __iadd__(self, other):
+        """Append a copy of another list to the end in O(len(other))."""
+        if not isinstance(other, DoublyLinkedList):
+            raise TypeError
+        self.splice(self._tail, other.clone())
+        return self
+
+    def extend_from(self, other):
+        """Move all items of other to the end of this list.
+
+        Runs in O(1) by relinking the ends; other is left empty.
+        """
+        self.splice(self._tail, other)
+
     def __mul__(self, n):
         """Returns a new list by appending the same list n times."""
         if not isinstance(n, int):
             raise TypeError
-        if n < 1:
-            return DoublyLinkedList()
-        res = self.clone()
-        for _ in range(n - 1):
-            res += self
+        res = type(self)()
+        for _ in range(n):
+            res.extend_from(self.clone())
         return res
 
     def reverse(self):
@@ -277,9 +438,164 @@ class DoublyLinkedList(object):
         reversed_list.reverse()
         return reversed_list
 
+    def sort(self, key=None, reverse=False):
+        """Sort the items of the list in place, by relinking the nodes.
+
+        A stable natural merge sort: the list is cut into its already
+        sorted runs, which are merged pairwise until one is left. Sorted
+        or nearly sorted lists take O(n), others O(n log n). Handles stay
+        attached to their items.
+        """
+        if self._size < 2:
+            return
+        keys = None
+        if key is not None:
+            keys = dict((node, key(node.val)) for node in self._nodes())
+
+        def after(a, b):
+            """Whether the item of node a goes strictly after node b's."""
+            ka = a.val if keys is None else keys[a]
+            kb = b.val if keys is None else keys[b]
+            return ka < kb if reverse else kb < ka
+
+        # cut into runs, singly linked through next
+        runs = []
+        node = self._head
+        while node is not None:
+            runs.append(node)
+            while node.next is not None and not after(node, node.next):
+                node = node.next
+            succ = node.next
+            node.next = None
+            node = succ
+
+        while len(runs) > 1:
+            merged = []
+            for i in range(0, len(runs) - 1, 2):
+                merged.append(self._merge(runs[i], runs[i + 1], after))
+            if len(runs) % 2:
+                merged.append(runs[-1])
+            runs = merged
+
+        # restore the prev links and the tail
+        self._head = runs[0]
+        pred = None
+        node = self._head
+        while node is not None:
+            node.prev = pred
+            pred = node
+            node = node.next
+        self._tail = pred
+
+    @staticmethod
+    def _merge(a, b, after):
+        """Merge two sorted runs linked through next, taking ties from a."""
+        dummy = tail = Node(None)
+        while a is not None and b is not None:
+            if after(a, b):
+                tail.next = b
+                b = b.next
+            else:
+                tail.next = a
+                a = a.next
+            tail = tail.next
+        tail.next = a if a is not None else b
+        return dummy.next
+
+    def _nodes(self):
+        node = self._head
+        while node is not None:
+            yield node
+            node = node.next
+
+    def _values(self):
+        """Return the items as a Python list, filled in one loop."""
+        res = [None] * self._size
+        node = self._head
+        for i in range(self._size):
+            res[i] = node.val
+            node = node.next
+        return res
+
+    def to_array(self, typecode):
+        """Copy the items into an array.array of the given typecode."""
+        return array(typecode, self._values())
+
+    def to_numpy(self, dtype=None):
+        """Copy the items into a NumPy array.
+
+        With a dtype the array is allocated once and filled straight from
+        the nodes; otherwise NumPy infers the dtype from the items.
+        """
+        if np is None:
+            raise ImportError("to_numpy requires numpy.")
+        if dtype is None:
+            return np.array(self._values())
+        return np.fromiter(self, dtype=dtype, count=self._size)
+
     def __nonzero__(self):
         return not self.is_empty()
 
+
+class DoublyLinkedListView(object):
+    """Lazy view of a slice of a DoublyLinkedList.
+
+    Holds the positions of the slice as a range, and walks the nodes of
+    the list from the first of them when iterated.
+    """
+
+    def __init__(self, lst, positions):
+        self._list = lst
+        self._positions = positions
+
+    def __str__(self):
+        return "[{}]".format(", ".join(str(item) for item in self))
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __nonzero__(self):
+        return len(self) > 0
+
+    def _walk(self, positions):
+        if not positions:
+            return
+        step = positions.step
+        node = self._list._get_node_at(positions[0])
+        yield node.val
+        for _ in range(len(positions) - 1):
+            for _ in range(abs(step)):
+                node = node.next if step > 0 else node.prev
+            yield node.val
+
+    def __iter__(self):
+        return self._walk(self._positions)
+
+    def __reversed__(self):
+        return self._walk(self._positions[::-1])
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._list.get(self._positions[key])
+        elif isinstance(key, slice):
+            return DoublyLinkedListView(self._list, self._positions[key])
+        else:
+            raise TypeError('Index must be int or slice')
+
+    def __contains__(self, value):
+        for item in self:
+            if value == item:
+                return True
+        return False
+
+    def to_list(self):
+        """Copy the items of the view into a new DoublyLinkedList."""
+        res = DoublyLinkedList()
+        for item in self:
+            res.push(item)
+        return res
+
+
 if __name__ == '__main__':
     x = DoublyLinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
     print(x)
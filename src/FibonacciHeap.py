@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+import operator
+
+
+class FibonacciNode(object):
+    """A Fibonacci heap node; also the handle returned by insert.
+
+    Siblings, and the roots, form circular doubly linked lists.
+    """
+
+    __slots__ = ('val', 'key', 'parent', 'child', 'left', 'right',
+                 'degree', 'mark')
+
+    def __init__(self, val, key):
+        self.val = val
+        self.key = key
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+        self.degree = 0
+        # lost a child since it became a child itself
+        self.mark = False
+
+
+def _splice(a, b):
+    """Join two circular lists, given a node of each."""
+    a_right = a.right
+    b_left = b.left
+    a.right = b
+    b.left = a
+    b_left.right = a_right
+    a_right.left = b_left
+
+
+def _detach(node):
+    """Take a node out of its circular list."""
+    node.left.right = node.right
+    node.right.left = node.left
+    node.left = node.right = node
+
+
+class FibonacciHeap(object):
+    """Lazily consolidated forest of heap-ordered trees.
+
+    insert and meld only add trees to the root list in O(1), and moving
+    a node towards the root cuts it out in O(1) amortized, cutting any
+    parent that loses a second child as well. delete_min does the
+    deferred work, linking roots of equal degree, in O(log n) amortized.
+
+    Ordering is the same as in BinaryHeap: by ``key(el)``, smallest key
+    at the root unless ``reverse=True``. The ``*_max`` methods have to
+    search the whole forest and take O(n).
+    """
+
+    def __init__(self, items=None, key=None, reverse=False):
+        """Construct a heap, optionally from an iterable of elements.
+
+        :param key: function returning the key to order an element by
+        :param reverse: put the largest key at the root instead
+        """
+        self._key = key
+        self._lt = operator.gt if reverse else operator.lt
+        # the first root in heap order, which is also the entry point to
+        # the root list
+        self._min = None
+        self._size = 0
+        if items is not None:
+            for el in items:
+                self.insert(el)
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def clear(self):
+        """Remove all elements."""
+        self._min = None
+        self._size = 0
+
+    def _key_of(self, el):
+        return el if self._key is None else self._key(el)
+
+    def _add_root(self, node):
+        node.parent = None
+        node.mark = False
+        if self._min is None:
+            self._min = node
+        else:
+            _splice(self._min, node)
+            if self._lt(node.key, self._min.key):
+                self._min = node
+
+    def insert(self, el):
+        """Add an element in O(1); returns its node."""
+        node = FibonacciNode(el, self._key_of(el))
+        self._add_root(node)
+        self._size += 1
+        return node
+
+    def peek_min(self):
+        """Return the root element, first in heap order."""
+        if self._min is None:
+            raise IndexError("No elements in heap.")
+        return self._min.val
+
+    def delete_min(self):
+        """Remove and return the root element in O(log n) amortized."""
+        if self._min is None:
+            raise IndexError("No elements in heap.")
+        return self._pop_min()
+
+    def remove_min(self):
+        """Same as delete_min, named to pair with remove_max."""
+        return self.delete_min()
+
+    def _pop_min(self):
+        node = self._min
+        # the children become roots
+        child = node.child
+        if child is not None:
+            cur = child
+            while True:
+                cur.parent = None
+                cur = cur.right
+                if cur is child:
+                    break
+            _splice(node, child)
+            node.child = None
+            node.degree = 0
+        rest = node.right
+        _detach(node)
+        self._size -= 1
+        self._min = None if rest is node else rest
+        if self._min is not None:
+            self._consolidate()
+        return node.val
+
+    def _consolidate(self):
+        """Link roots of equal degree until all degrees differ."""
+        roots = []
+        cur = self._min
+        while True:
+            roots.append(cur)
+            cur = cur.right
+            if cur is self._min:
+                break
+        by_degree = []
+        for node in roots:
+            _detach(node)
+            while node.degree < len(by_degree) and \
+                    by_degree[node.degree] is not None:
+                other = by_degree[node.degree]
+                by_degree[node.degree] = None
+                if self._lt(other.key, node.key):
+                    node, other = other, node
+                # other becomes a child of node
+                other.parent = node
+                other.mark = False
+                if node.child is None:
+                    node.child = other
+                else:
+                    _splice(node.child, other)
+                node.degree += 1
+            while len(by_degree) <= node.degree:
+                by_degree.append(None)
+            by_degree[node.degree] = node
+        self._min = None
+        for node in by_degree:
+            if node is not None:
+                self._add_root(node)
+
+    def _cut(self, node):
+        """Move a non-root node to the root list, cascading upwards."""
+        while node.parent is not None:
+            parent = node.parent
+            if parent.child is node:
+                parent.child = None if node.right is node else node.right
+            _detach(node)
+            parent.degree -= 1
+            self._add_root(node)
+            if parent.parent is None:
+                break
+            if not parent.mark:
+                parent.mark = True
+                break
+            node = parent
+
+    def remove_node(self, node):
+        """Remove a node of this heap and return its element."""
+        if node.parent is not None:
+            self._cut(node)
+        # treat the node as the minimum to remove it
+        self._min = node
+        return self._pop_min()
+
+    def update_node(self, node, el):
+        """Replace the element of a node and restore the order.
+
+        Moving the node towards the root cuts it out in O(1) amortized;
+        moving it away from the root removes and reinserts it.
+        """
+        key = self._key_of(el)
+        if not self._lt(node.key, key):
+            node.val = el
+            node.key = key
+            if node.parent is not None and \
+                    self._lt(key, node.parent.key):
+                self._cut(node)
+            if self._lt(key, self._min.key):
+                self._min = node
+        else:
+            self.remove_node(node)
+            node.val = el
+            node.key = key
+            node.parent = node.child = None
+            node.degree = 0
+            self._add_root(node)
+            self._size += 1
+
+    def meld(self, other):
+        """Move all elements of another Fibonacci heap into this one in O(1).
+
+        Both heaps must order their elements the same way; other is left
+        empty, and its nodes become nodes of this heap.
+        """
+        if other is self:
+            raise ValueError("Cannot meld a heap with itself.")
+        if other._min is None:
+            return
+        if self._min is None:
+            self._min = other._min
+        else:
+            _splice(self._min, other._min)
+            if self._lt(other._min.key, self._min.key):
+                self._min = other._min
+        self._size += other._size
+        other.clear()
+
+    def _nodes(self):
+        if self._min is None:
+            return
+        stack = [self._min]
+        while stack:
+            first = stack.pop()
+            node = first
+            while True:
+                yield node
+                if node.child is not None:
+                    stack.append(node.child)
+                node = node.right
+                if node is first:
+                    break
+
+    def _find_max(self):
+        """Node of the last element in heap order, by a full search."""
+        if self._min is None:
+            raise IndexError("No elements in heap.")
+        res = self._min
+        for node in self._nodes():
+            if self._lt(res.key, node.key):
+                res = node
+        return res
+
+    def peek_max(self):
+        """Return the element last in heap order in O(n)."""
+        return self._find_max().val
+
+    def remove_max(self):
+        """Remove and return the element last in heap order in O(n)."""
+        return self.remove_node(self._find_max())
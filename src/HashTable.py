@@ -1,168 +1,1161 @@
 # -*- coding: utf-8 -*-
 
-from pyprimes import next_prime
+import hashlib
+import itertools
+import mmap
+import pickle
+import struct
+from array import array
+
+from pyprimes import isprime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only used by the batch methods
+    np = None
 
 # constants
 SEPARATE_CHAINING = 0
 LINEAR_PROBING = 1
 QUADRATIC_PROBING = 2
 DOUBLE_HASHING = 3
+ROBIN_HOOD = 4
+HOPSCOTCH = 5
+CUCKOO_HASHING = 6
+
+# hopscotch neighbourhood size; an entry lives at most this many slots
+# after its home slot, and each home slot keeps a bitmap of that width
+HOP_RANGE = 32
+
+# cuckoo hashing gives up on an eviction chain after this many moves and
+# parks the homeless entry in a stash of this many extra slots
+CUCKOO_MAX_KICKS = 32
+CUCKOO_STASH_SIZE = 4
+
+# with two candidate slots per key, cuckoo insertions start failing just
+# short of half full and force a rebuild, so higher load factor
+# thresholds are lowered to this
+CUCKOO_MAX_LOAD = 0.45
 
 
 class HashMethodException(Exception):
     pass
 
 
+class _Marker(object):
+    """Sentinel stored in the key array of an open-addressing table."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __repr__(self):
+        return "<{}>".format(self._name)
+
+
+# slot states for open addressing; anything else in a key slot is live
+_FREE = _Marker("free")
+_DELETED = _Marker("deleted")
+
+# snapshot layout: header, then the hash, key offset and value offset
+# arrays of a linear probing table, then the pickled keys and values.
+# The header records a byte order mark since the arrays are native.
+_SNAPSHOT_MAGIC = b'PYDSHT01'
+_SNAPSHOT_HEADER = struct.Struct('=8sQQQ')  # magic, bom, capacity, size
+_SNAPSHOT_BOM = 0x0102030405060708
+_NO_ENTRY = 2 ** 64 - 1
+
+
+def next_prime(n):
+    """Return the smallest prime strictly greater than n."""
+    n += 1
+    while not isprime(n):
+        n += 1
+    return n
+
+
+def _stable_hash(k):
+    """Hash that is the same in every process, unlike ``hash`` on str.
+
+    Supports None, numbers, str, bytes and tuples of those. Equal numbers
+    hash equally regardless of type, as with ``hash``.
+    """
+    if k is None:
+        return 0
+    elif isinstance(k, (int, float)):
+        # numeric hashes are not randomized
+        return hash(k)
+    elif isinstance(k, str):
+        data = b's' + k.encode('utf-8')
+    elif isinstance(k, bytes):
+        data = b'b' + k
+    elif isinstance(k, tuple):
+        data = b't' + b''.join(
+            struct.pack('<q', _stable_hash(el)) for el in k
+        )
+    else:
+        raise TypeError(
+            "Cannot snapshot key of type {}.".format(type(k).__name__)
+        )
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+def _pack_snapshot(items, size, load_factor_threshold):
+    """Lay out (key, value) pairs as a snapshot and return its bytes.
+
+    The entries are placed by linear probing on their stable hash at a
+    prime capacity that keeps the load below the given threshold.
+    """
+    capacity = next_prime(max(int(size / load_factor_threshold) + 1, 3) - 1)
+    hashes = array('q', [0]) * capacity
+    key_offsets = array('Q', [_NO_ENTRY]) * capacity
+    value_offsets = array('Q', [_NO_ENTRY]) * capacity
+    base = _SNAPSHOT_HEADER.size + 3 * 8 * capacity
+    blob = bytearray()
+    for k, v in items:
+        h = _stable_hash(k)
+        j = h % capacity
+        while key_offsets[j] != _NO_ENTRY:
+            j = (j + 1) % capacity
+        hashes[j] = h
+        key_offsets[j] = base + len(blob)
+        blob += pickle.dumps(k, pickle.HIGHEST_PROTOCOL)
+        value_offsets[j] = base + len(blob)
+        blob += pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+    header = _SNAPSHOT_HEADER.pack(
+        _SNAPSHOT_MAGIC, _SNAPSHOT_BOM, capacity, size
+    )
+    return b''.join((header, hashes.tobytes(), key_offsets.tobytes(),
+                     value_offsets.tobytes(), blob))
+
+
+def _unwrap(seq):
+    """Turn a NumPy array into a list of Python scalars.
+
+    Iterating the list is much faster than indexing the array, and the
+    scalars hash and compare like the values they hold.
+    """
+    if np is not None and isinstance(seq, np.ndarray):
+        return seq.tolist()
+    return seq
+
+
+def _wrap(res, like):
+    """Return a list of bools as a NumPy array if like is an array."""
+    if np is not None and isinstance(like, np.ndarray):
+        return np.array(res, dtype=bool)
+    return res
+
+
+class _Slots(object):
+    """Parallel key/value/hash arrays backing an open-addressing table.
+
+    Hashes are cached in a typed array so that probing can reject most
+    non-matching slots without calling ``__eq__`` on the stored key, and
+    so that resizing never has to call ``hash`` again.
+    """
+
+    __slots__ = ('capacity', 'keys', 'values', 'hashes', 'hops', 'used',
+                 'stashed')
+
+    def __init__(self, capacity, hopscotch=False, stash=0):
+        self.capacity = capacity
+        # a cuckoo stash is kept in extra slots after the table proper
+        self.keys = [_FREE] * (capacity + stash)
+        self.values = [None] * (capacity + stash)
+        self.hashes = array('q', [0]) * (capacity + stash)
+        # per home slot, bit i set means slot home + i holds one of its keys
+        self.hops = array('L', [0]) * capacity if hopscotch else None
+        # live entries plus tombstones, i.e. slots that are not free
+        self.used = 0
+        self.stashed = 0
+
+
 class HashTable(object):
 
-    def __init__(self, method=LINEAR_PROBING, load_factor_threshold=0.50):
+    def __init__(self, method=LINEAR_PROBING, load_factor_threshold=0.50,
+                 incremental_resize=False, rehash_step=16, capacity=11):
+        """Construct an empty hash table.
+
+        :param method: collision resolution, one of the method constants
+        :param load_factor_threshold: occupied fraction of the slots
+            (tombstones included) that triggers a resize, in (0, 1);
+            at most CUCKOO_MAX_LOAD for cuckoo hashing, which can't fill
+            its slots much further
+        :param incremental_resize: if True, spread each resize over the
+            following operations instead of rehashing everything at once
+        :param rehash_step: least number of old slots (buckets for
+            separate chaining) migrated by each operation during an
+            incremental resize; more are migrated when needed to finish
+            before the next resize is due, up to about
+            max(rehash_step, 2 / load_factor_threshold)
+        :param capacity: initial number of slots, rounded up to a prime
+        """
         self._size = 0
-        self._capacity = 11
+        self._capacity = next_prime(max(capacity, 3) - 1)
+        if not 0.0 < load_factor_threshold < 1.0:
+            raise ValueError("load_factor_threshold must be in (0, 1).")
+        if method == CUCKOO_HASHING:
+            load_factor_threshold = min(load_factor_threshold,
+                                        CUCKOO_MAX_LOAD)
         self._load_factor_threshold = load_factor_threshold
+        if rehash_step < 1:
+            raise ValueError("rehash_step must be at least 1.")
+        self._incremental_resize = incremental_resize
+        self._rehash_step = rehash_step
+        # old slots migrated per operation by the current resize
+        self._migrate_step = rehash_step
 
         # hashing method - separate chaining or open addressing
-        if method not in (0, 1, 2, 3):
+        if method not in (0, 1, 2, 3, 4, 5, 6):
             raise HashMethodException(
                 "Must use separate chaining or open addressing:\n"
                 "0 = separate chaining\n"
                 "1 = linear probing\n"
                 "2 = quadratic probing\n"
                 "3 = double hashing\n"
+                "4 = robin hood hashing\n"
+                "5 = hopscotch hashing\n"
+                "6 = cuckoo hashing\n"
             )
         else:
             self._method = method
 
-        self._table = [
-            # list of lists if separate chaining
-            [] if method == SEPARATE_CHAINING else None
-            for _ in range(self._capacity)
-        ]
+        # open addressing primitives for the chosen method
+        if method == ROBIN_HOOD:
+            self._find = self._find_robin_hood
+            self._place = self._place_robin_hood
+            self._delete_at = self._delete_robin_hood
+        elif method == HOPSCOTCH:
+            self._find = self._find_hopscotch
+            self._place = self._place_hopscotch
+            self._delete_at = self._delete_hopscotch
+        elif method == CUCKOO_HASHING:
+            self._find = self._find_cuckoo
+            self._place = self._place_cuckoo
+            self._delete_at = self._delete_cuckoo
+        else:
+            self._find = self._find_probing
+            self._place = self._place_probing
+            self._delete_at = self._delete_probing
+
+        self._table = self._new_table(self._capacity)
+        # table being drained by an incremental resize, and the index of
+        # the next slot (or bucket) in it to migrate
+        self._old_table = None
+        self._rehash_index = 0
+
+    def _new_table(self, capacity):
+        if self._method == SEPARATE_CHAINING:
+            # list of [key, value] buckets
+            return [[] for _ in range(capacity)]
+        elif self._method == CUCKOO_HASHING:
+            return _Slots(capacity, stash=CUCKOO_STASH_SIZE)
+        else:
+            return _Slots(capacity, hopscotch=self._method == HOPSCOTCH)
 
     @property
     def size(self):
         return self._size
 
+    @property
+    def capacity(self):
+        return self._capacity
+
     @property
     def load_factor(self):
         return float(self.size) / self._capacity
 
+    @property
+    def is_rehashing(self):
+        """Whether an incremental resize is still migrating entries."""
+        return self._old_table is not None
+
+    def __len__(self):
+        return self.size
+
     def __contains__(self, k):
-        i = self._internal_hash(k)
+        if self._old_table is not None:
+            self._migrate(self._migrate_step)
+        return self._locate(k, self._hash(k))[1] >= 0
 
-        if self._method == SEPARATE_CHAINING:
-            found = False
-            for n, el in enumerate(self._table[i]):
-                if el == k:
-                    found = True
-                    break
-            return found
+    def _tables(self):
+        if self._old_table is None:
+            return (self._table,)
+        return (self._table, self._old_table)
+
+    def __iter__(self):
+        """Iterate over the keys of the table in slot order."""
+        for k, _ in self.items():
+            yield k
+
+    def items(self):
+        """Iterate over the (key, value) pairs of the table."""
+        for table in self._tables():
+            if self._method == SEPARATE_CHAINING:
+                for bucket in table:
+                    for k, v in bucket:
+                        yield k, v
+            else:
+                for i, k in enumerate(table.keys):
+                    if k is not _FREE and k is not _DELETED:
+                        yield k, table.values[i]
+
+    def get(self, k, default=None):
+        """Return the value stored for k, or default if it is absent."""
+        if self._old_table is not None:
+            self._migrate(self._migrate_step)
+        return self._lookup(k, default)
+
+    def __getitem__(self, k):
+        if self._old_table is not None:
+            self._migrate(self._migrate_step)
+        value = self._lookup(k, _FREE)
+        if value is _FREE:
+            raise KeyError("key={} not found.".format(k))
+        return value
+
+    def _lookup(self, k, default):
+        """Return the value for k, or default, without migrating entries.
 
+        Never writes to the table, which lets ConcurrentHashTable run it
+        without holding a lock.
+        """
+        table, i = self._locate(k, self._hash(k))
+        if i < 0:
+            return default
+        elif self._method == SEPARATE_CHAINING:
+            return table[i][1]
         else:
-            return self._table[i] is not None
+            return table.values[i]
 
-    def _internal_hash(self, k):
-        """TODO"""
-        i = self._hash(k)
+    def __setitem__(self, k, value):
+        self.insert(k, value)
 
-        # separate chaining doesn't use open addressing
-        if self._method == SEPARATE_CHAINING:
-            return i
+    def __delitem__(self, k):
+        self.remove(k)
+
+    def _hash(self, k):
+        """Main hash function.
+
+        The full hash is cached next to the key, so the home slot is
+        derived from it as ``h % capacity`` whenever the table changes size.
+        """
+        return hash(k)
+
+    def _hash_2(self, h, capacity):
+        """Hash function used __only__ for double and cuckoo hashing.
+
+        Returns the probe step for a cached hash. The step lies in
+        [1, capacity - 1], and since the capacity is prime the probe
+        sequence visits every slot. Cuckoo hashing uses the slot one step
+        from home as the key's second candidate.
+        """
+        return 1 + (h // capacity) % (capacity - 1)
+
+    def _probe_params(self, h, capacity):
+        """Return (step, acceleration, switch) of the probe sequence for h.
+
+        Slot ``j`` is advanced by ``step`` after each probe, and ``step``
+        grows by ``acceleration``; this covers the offsets ``cnt``,
+        ``cnt ** 2`` and ``cnt * _hash_2`` without a multiplication per
+        probe. Quadratic offsets only reach (capacity + 1) / 2 distinct
+        slots of a prime table, so after ``switch`` probes the sequence
+        continues linearly; the other methods never switch.
+
+        Every sequence reaches every slot, and the table always keeps a
+        free slot (``used`` stays below the load factor threshold), so
+        the probing loops always terminate.
+        """
+        if self._method == LINEAR_PROBING:
+            return 1, 0, -1
+        elif self._method == QUADRATIC_PROBING:
+            return 1, 2, (capacity + 1) // 2
+        else:
+            return self._hash_2(h, capacity), 0, -1
+
+    def _find_probing(self, slots, k, h):
+        """Return the slot index holding k, or -1 if it is absent.
+
+        Tombstones are probed past, and the search stops at the first
+        free slot because k would have been placed there.
+        """
+        keys = slots.keys
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        step, accel, switch = self._probe_params(h, cap)
+        while True:
+            sk = keys[j]
+            if sk is _FREE:
+                return -1
+            if hashes[j] == h and sk is not _DELETED and (sk is k or sk == k):
+                return j
+            if switch == 0:
+                step, accel = 1, 0
+            switch -= 1
+            j = (j + step) % cap
+            step += accel
+
+    def _place_probing(self, slots, k, value, h):
+        """Store k, which is known to be absent, in the first reusable slot.
 
-        # probing
-        cnt = 1
+        The first tombstone on the probe path is reused, falling back to
+        the free slot that ends it. Returns True, since some slot is
+        always free.
+        """
+        keys = slots.keys
+        cap = slots.capacity
+        j = h % cap
+        step, accel, switch = self._probe_params(h, cap)
+        while keys[j] is not _FREE and keys[j] is not _DELETED:
+            if switch == 0:
+                step, accel = 1, 0
+            switch -= 1
+            j = (j + step) % cap
+            step += accel
+        if keys[j] is _FREE:
+            slots.used += 1
+        keys[j] = k
+        slots.values[j] = value
+        slots.hashes[j] = h
+        return True
+
+    def _delete_probing(self, slots, j):
+        # leave a tombstone so probe chains through this slot stay intact
+        slots.keys[j] = _DELETED
+        slots.values[j] = None
+
+    def _find_robin_hood(self, slots, k, h):
+        """Return the slot index holding k, or -1 if it is absent.
+
+        Robin Hood insertion keeps entries ordered by distance from their
+        home slot, so the search also stops at the first entry that is
+        closer to its home than k would be. Tombstones (only left in a
+        table being drained by an incremental resize) keep their hash and
+        count with their original distance.
+        """
+        keys = slots.keys
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        d = 0
         while True:
-            if self._method == LINEAR_PROBING:
-                j = i + cnt
-            elif self._method == QUADRATIC_PROBING:
-                j = i + cnt ** 2
-            elif self._method == DOUBLE_HASHING:
-                j = i + cnt * self._hash_2(k)
-            j = j % self._capacity
-
-            if self._table[j] is None:
-                break
+            sk = keys[j]
+            if sk is _FREE:
+                return -1
+            sh = hashes[j]
+            if (j - sh) % cap < d:
+                return -1
+            if sh == h and sk is not _DELETED and (sk is k or sk == k):
+                return j
+            j += 1
+            if j == cap:
+                j = 0
+            d += 1
+
+    def _place_robin_hood(self, slots, k, value, h):
+        """Store k, which is known to be absent, by Robin Hood insertion.
+
+        Walking linearly from the home slot, k takes the place of the
+        first entry that is closer to its own home than k is to its home,
+        and that entry carries on in the same way. This evens out the
+        probe lengths. Returns True.
+        """
+        keys = slots.keys
+        values = slots.values
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        d = 0
+        while True:
+            sk = keys[j]
+            if sk is _FREE:
+                keys[j] = k
+                values[j] = value
+                hashes[j] = h
+                slots.used += 1
+                return True
+            sh = hashes[j]
+            sd = (j - sh) % cap
+            if sd < d:
+                # take the slot from the richer entry and carry it forward
+                keys[j], k = k, sk
+                values[j], value = value, values[j]
+                hashes[j], h = h, sh
+                d = sd
+            j += 1
+            if j == cap:
+                j = 0
+            d += 1
+
+    def _delete_robin_hood(self, slots, j):
+        """Remove slot j by shifting the following entries back one slot.
+
+        No tombstone is left, so lookups keep stopping early. A table
+        being drained by an incremental resize gets a tombstone instead,
+        since shifting could move entries behind the migration index.
+        """
+        if slots is not self._table:
+            self._delete_probing(slots, j)
+            return
+        keys = slots.keys
+        values = slots.values
+        hashes = slots.hashes
+        cap = slots.capacity
+        nxt = (j + 1) % cap
+        while keys[nxt] is not _FREE and (nxt - hashes[nxt]) % cap != 0:
+            keys[j] = keys[nxt]
+            values[j] = values[nxt]
+            hashes[j] = hashes[nxt]
+            j = nxt
+            nxt = (nxt + 1) % cap
+        keys[j] = _FREE
+        values[j] = None
+        slots.used -= 1
+
+    def _find_hopscotch(self, slots, k, h):
+        """Return the slot index holding k, or -1 if it is absent.
+
+        Only the slots flagged in the home slot's hop bitmap are examined,
+        all of them within HOP_RANGE slots of home.
+        """
+        keys = slots.keys
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        bits = slots.hops[j]
+        while bits:
+            if bits & 1:
+                sk = keys[j]
+                if hashes[j] == h and (sk is k or sk == k):
+                    return j
+            bits >>= 1
+            j += 1
+            if j == cap:
+                j = 0
+        return -1
+
+    def _place_hopscotch(self, slots, k, value, h):
+        """Store k, which is known to be absent, within its neighbourhood.
+
+        The nearest free slot is found by linear probing and then moved
+        back towards the home slot by displacing entries that may live
+        further from their own home, until it lies within HOP_RANGE.
+        Returns False, leaving the table consistent, if no entry can be
+        displaced.
+        """
+        keys = slots.keys
+        values = slots.values
+        hashes = slots.hashes
+        hops = slots.hops
+        cap = slots.capacity
+        home = h % cap
+        j = home
+        d = 0
+        while keys[j] is not _FREE:
+            j += 1
+            if j == cap:
+                j = 0
+            d += 1
+        while d >= HOP_RANGE:
+            # try the homes furthest from j first, as they free a slot
+            # closest to the new key's home
+            for back in range(HOP_RANGE - 1, 0, -1):
+                b = (j - back) % cap
+                bits = hops[b]
+                o = 0
+                while o < back and not (bits >> o) & 1:
+                    o += 1
+                if o < back:
+                    i = (b + o) % cap
+                    keys[j] = keys[i]
+                    values[j] = values[i]
+                    hashes[j] = hashes[i]
+                    hops[b] = (bits & ~(1 << o)) | (1 << back)
+                    keys[i] = _FREE
+                    values[i] = None
+                    j = i
+                    d -= back - o
+                    break
             else:
-                cnt += 1
+                return False
+        keys[j] = k
+        values[j] = value
+        hashes[j] = h
+        hops[home] |= 1 << d
+        slots.used += 1
+        return True
 
-        return j
+    def _delete_hopscotch(self, slots, j):
+        cap = slots.capacity
+        home = slots.hashes[j] % cap
+        slots.hops[home] &= ~(1 << ((j - home) % cap))
+        slots.keys[j] = _FREE
+        slots.values[j] = None
+        slots.used -= 1
 
-    def _hash(self, k):
-        """Main hash function."""
-        # TODO
-        raise NotImplemented
+    def _find_cuckoo(self, slots, k, h):
+        """Return the slot index holding k, or -1 if it is absent.
 
-    def _hash_2(self, k):
-        """Hash function used __only__ for double hashing."""
-        # TODO
-        raise NotImplemented
+        Only the two candidate slots of k are examined, plus the stash
+        when it is not empty.
+        """
+        keys = slots.keys
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        sk = keys[j]
+        if hashes[j] == h and sk is not _FREE and (sk is k or sk == k):
+            return j
+        j = (j + self._hash_2(h, cap)) % cap
+        sk = keys[j]
+        if hashes[j] == h and sk is not _FREE and (sk is k or sk == k):
+            return j
+        if slots.stashed:
+            for j in range(cap, cap + CUCKOO_STASH_SIZE):
+                sk = keys[j]
+                if hashes[j] == h and sk is not _FREE and (sk is k or sk == k):
+                    return j
+        return -1
 
-    def insert(self, k):
-        i = self._internal_hash(k)
+    def _place_cuckoo(self, slots, k, value, h):
+        """Store k, which is known to be absent, in a candidate slot.
+
+        If both candidates are taken, k evicts the entry in its first
+        one, which moves to its own other candidate, and so on for at
+        most CUCKOO_MAX_KICKS moves. An entry still homeless after that
+        goes to the stash. Returns False, with every move undone, when
+        the stash is full too.
+        """
+        keys = slots.keys
+        values = slots.values
+        hashes = slots.hashes
+        cap = slots.capacity
+        j = h % cap
+        if keys[j] is not _FREE:
+            alt = (j + self._hash_2(h, cap)) % cap
+            if keys[alt] is _FREE:
+                j = alt
+            else:
+                path = []
+                for _ in range(CUCKOO_MAX_KICKS):
+                    path.append(j)
+                    keys[j], k = k, keys[j]
+                    values[j], value = value, values[j]
+                    hashes[j], h = h, hashes[j]
+                    # the evicted entry moves to its other candidate
+                    home = h % cap
+                    if j == home:
+                        j = (home + self._hash_2(h, cap)) % cap
+                    else:
+                        j = home
+                    if keys[j] is _FREE:
+                        break
+                else:
+                    for j in range(cap, cap + CUCKOO_STASH_SIZE):
+                        if keys[j] is _FREE:
+                            slots.stashed += 1
+                            break
+                    else:
+                        for j in reversed(path):
+                            keys[j], k = k, keys[j]
+                            values[j], value = value, values[j]
+                            hashes[j], h = h, hashes[j]
+                        return False
+        keys[j] = k
+        values[j] = value
+        hashes[j] = h
+        slots.used += 1
+        return True
+
+    def _delete_cuckoo(self, slots, j):
+        if j >= slots.capacity:
+            slots.stashed -= 1
+        slots.keys[j] = _FREE
+        slots.values[j] = None
+        slots.used -= 1
+
+    def _probe_length(self, slots, j):
+        """Number of slots a successful lookup examines to reach slot j."""
+        cap = slots.capacity
+        h = slots.hashes[j]
+        home = h % cap
+        if self._method in (LINEAR_PROBING, ROBIN_HOOD):
+            return (j - home) % cap + 1
+        elif self._method == CUCKOO_HASHING:
+            if j >= cap:  # stash, searched after both candidates
+                return j - cap + 3
+            return 1 if j == home else 2
+        elif self._method == HOPSCOTCH:
+            below = slots.hops[home] & ((1 << ((j - home) % cap)) - 1)
+            return bin(below).count('1') + 1
+        i = home
+        n = 1
+        step, accel, switch = self._probe_params(h, cap)
+        while i != j:
+            if switch == 0:
+                step, accel = 1, 0
+            switch -= 1
+            i = (i + step) % cap
+            step += accel
+            n += 1
+        return n
+
+    def probe_histogram(self):
+        """Return a dict mapping probe length to the number of keys.
+
+        The probe length of a key is the number of slots (chain entries
+        for separate chaining) that a successful lookup of it examines,
+        so 1 means the key was found at its home slot. Useful to compare
+        the spread of lookup costs between methods on real keys.
+        """
+        hist = {}
+        for table in self._tables():
+            if self._method == SEPARATE_CHAINING:
+                for bucket in table:
+                    for n in range(1, len(bucket) + 1):
+                        hist[n] = hist.get(n, 0) + 1
+            else:
+                for j, k in enumerate(table.keys):
+                    if k is not _FREE and k is not _DELETED:
+                        n = self._probe_length(table, j)
+                        hist[n] = hist.get(n, 0) + 1
+        return hist
+
+    @staticmethod
+    def _chain_find(bucket, k):
+        """Return the position of k in a separate chaining bucket, or -1."""
+        for n, el in enumerate(bucket):
+            if el[0] == k:
+                return n
+        return -1
+
+    def _locate(self, k, h):
+        """Return (table, index) of the entry for k, or (None, -1).
+
+        The table is the _Slots holding k for open addressing, and the
+        bucket holding it for separate chaining. During an incremental
+        resize the old table is searched after the new one.
+        """
+        for table in self._tables():
+            if self._method == SEPARATE_CHAINING:
+                bucket = table[h % len(table)]
+                n = self._chain_find(bucket, k)
+                if n >= 0:
+                    return bucket, n
+            else:
+                j = self._find(table, k, h)
+                if j >= 0:
+                    return table, j
+        return None, -1
+
+    def insert(self, k, value=None):
+        """Insert k with an associated value.
+
+        If the key already exists, update it with the new value.
+        """
+        self._insert(k, value)
+
+    def _insert(self, k, value):
+        """Insert or update k; returns whether k was not there before."""
+        h = self._hash(k)
+        if self._old_table is not None:
+            self._migrate(self._migrate_step)
 
         if self._method == SEPARATE_CHAINING:
             # search through the list and see if it exists
-            # so it can be incremeented, otherwise create new
-            found = False
-            for n, el in enumerate(self._table[i]):
-                if el == k:
-                    found = True
-                    break
-            if not found:
-                self._table[i].append([k, 0])
-                self._size += 1
+            # so it can be updated, otherwise create new
+            table, n = self._locate(k, h)
+            if n >= 0:
+                table[n][1] = value
+                return False
+            self._table[h % self._capacity].append([k, value])
+            self._size += 1
+            used = self._size
 
         # open addressing
         else:
-            if self._table[i] is None:
-                self._table[i] = k
-                self._size += 1
+            table, j = self._locate(k, h)
+            if j >= 0:
+                table.values[j] = value
+                return False
+            if not self._place(self._table, k, value, h):
+                # hopscotch or cuckoo hashing could not make room for k
+                self._rebuild(next_prime(self._capacity * 2), (k, value, h))
+            self._size += 1
+            used = self._table.used
 
-        # resize if load factor is above 0.50
-        if self.load_factor >= self._load_factor_threshold:
+        # resize once the occupied slots (tombstones included)
+        # reach the load factor threshold
+        if used >= self._load_factor_threshold * self._capacity:
             self._resize()
+        return True
 
     def remove(self, k):
-        i = self._internal_hash(k)
+        if not self._discard(k):
+            raise KeyError("key={} not found.".format(k))
 
-        if self._method == SEPARATE_CHAINING:
-            found = False
-            for n, el in enumerate(self._table[i]):
-                if el == k:
-                    found = True
-                    self._table[i].pop(n)
-                    break
-                if not found:
-                    raise KeyError("key={} not found.".format(k))
+    def _resize(self, capacity=None):
+        """Rehash every entry into a new table.
 
-        else:  # open addressing
-            if self._table[i] is None:
-                raise KeyError("key={} not found.".format(k))
-            else:
-                self._table[i] = None
+        The table grows to the next prime above twice its capacity, unless
+        most occupied slots are tombstones; then it is rebuilt at the same
+        capacity, which is enough to purge them. An explicit capacity
+        overrides this.
 
-        self._size -= 1
+        With incremental resizing only the new table is allocated here,
+        and the entries are migrated by the operations that follow, at
+        least ``rehash_step`` slots at a time and enough to be done before
+        inserts can fill the new table up to the threshold. Only an
+        explicit capacity too small for that, or a batch insert reserving
+        room, finishes a previous migration here all at once.
+        """
+        if self._old_table is not None:
+            self._migrate(None)
 
-    def _resize(self):
         old_capacity = self._capacity
-        self._capacity = next_prime(old_capacity * 2)
+        if capacity is not None:
+            self._capacity = capacity
+        elif self._size >= self._load_factor_threshold * old_capacity / 2:
+            self._capacity = next_prime(old_capacity * 2)
+
+        self._old_table = self._table
+        self._rehash_index = 0
+        self._table = self._new_table(self._capacity)
+        if not self._incremental_resize:
+            self._migrate(None)
+            return
+        # each insert is an operation that migrates a step, and at most
+        # room of them fit before the threshold is reached again
+        if self._method == SEPARATE_CHAINING:
+            n = len(self._old_table)
+        else:
+            n = len(self._old_table.keys)
+        room = int(self._load_factor_threshold * self._capacity) - self._size
+        self._migrate_step = max(self._rehash_step, -(-n // max(room, 1)))
 
+    def _migrate(self, limit):
+        """Move entries from the old table into the new one.
+
+        Visits at most ``limit`` old slots (or buckets), continuing from
+        where the previous call stopped; ``limit=None`` drains the rest of
+        the old table. Migrated slots are deleted from the old table the
+        way the method deletes during a resize, which for probing means
+        tombstones that keep its probe chains intact.
+        """
+        old = self._old_table
+        start = self._rehash_index
         if self._method == SEPARATE_CHAINING:
-            rehashed = []
-            for i, el in enumerate(self._table):
-                if len(el) > 0:
-                    rehashed.extend(el)
-                    self._table[i] = []
-            for j in range(self._capacity - old_capacity):
-                rehashed.append([])
+            n = len(old)
+            stop = n if limit is None else min(n, start + limit)
+            table = self._table
+            cap = self._capacity
+            for i in range(start, stop):
+                for el in old[i]:
+                    table[self._hash(el[0]) % cap].append(el)
+                old[i] = []
+        else:
+            # slot arrays may extend past the capacity with a cuckoo stash
+            n = len(old.keys)
+            stop = n if limit is None else min(n, start + limit)
+            keys = old.keys
+            values = old.values
+            hashes = old.hashes
+            for i in range(start, stop):
+                k = keys[i]
+                if k is _FREE or k is _DELETED:
+                    continue
+                if not self._place(self._table, k, values[i], hashes[i]):
+                    # no room for k in the new table; the rebuild also
+                    # collects the entries not migrated yet
+                    self._rebuild(next_prime(self._capacity * 2))
+                    return
+                self._delete_at(old, i)
+
+        if stop == n:
+            self._old_table = None
+            self._rehash_index = 0
         else:
-            rehashed = []
-            for i, el in enumerate(self._table):
-                if el is not None:
-                    rehashed.append(el)
-                    self._table[i] = None
-            for j in range(self._capacity - old_capacity):
-                rehashed.append(None)
-
-        # now that everything is resized, rehash again
-        for el in rehashed:
-            self.insert(el)
+            self._rehash_index = stop
+
+    def _reserve(self, n):
+        """Resize once so that n more keys fit below the threshold."""
+        needed = int((self._size + n) / self._load_factor_threshold) + 1
+        if needed > self._capacity:
+            self._resize(next_prime(needed))
+
+    @classmethod
+    def from_iterable(cls, keys, values=None, expected_size=None, **kwargs):
+        """Build a table from keys (and parallel values) in one pass.
+
+        The table is sized for ``expected_size`` keys up front, so it is
+        never resized while loading. If omitted, ``len(keys)`` is used
+        when available. Other keyword arguments go to the constructor.
+        """
+        ht = cls(**kwargs)
+        keys = _unwrap(keys)
+        if expected_size is None and hasattr(keys, '__len__'):
+            expected_size = len(keys)
+        if expected_size:
+            ht._reserve(expected_size)
+        ht.insert_many(keys, values)
+        return ht
+
+    def insert_many(self, keys, values=None):
+        """Insert every key of an iterable or NumPy array.
+
+        values, if given, is a parallel iterable; otherwise every key maps
+        to None. The table is resized at most once up front when the
+        number of keys is known.
+
+        Returns which keys were new rather than updated, as a list of
+        bools or as a NumPy bool array if keys is a NumPy array.
+        """
+        unwrapped = _unwrap(keys)
+        if hasattr(unwrapped, '__len__'):
+            self._reserve(len(unwrapped))
+        if values is None:
+            pairs = zip(unwrapped, itertools.repeat(None))
+        else:
+            pairs = zip(unwrapped, _unwrap(values))
+        res = []
+        append = res.append
+        insert = self._insert
+        hash_ = self._hash
+        threshold = self._load_factor_threshold
+        if self._method == SEPARATE_CHAINING:
+            chain_find = self._chain_find
+            for k, v in pairs:
+                if self._old_table is not None:
+                    # an incremental resize is migrating entries
+                    append(insert(k, v))
+                    continue
+                h = hash_(k)
+                bucket = self._table[h % self._capacity]
+                n = chain_find(bucket, k)
+                if n >= 0:
+                    bucket[n][1] = v
+                    append(False)
+                    continue
+                bucket.append([k, v])
+                self._size += 1
+                if self._size >= threshold * self._capacity:
+                    self._resize()
+                append(True)
+        else:
+            find = self._find
+            place = self._place
+            for k, v in pairs:
+                if self._old_table is not None:
+                    append(insert(k, v))
+                    continue
+                h = hash_(k)
+                table = self._table
+                j = find(table, k, h)
+                if j >= 0:
+                    table.values[j] = v
+                    append(False)
+                    continue
+                if not place(table, k, v, h):
+                    self._rebuild(next_prime(self._capacity * 2), (k, v, h))
+                self._size += 1
+                if self._table.used >= threshold * self._capacity:
+                    self._resize()
+                append(True)
+        return _wrap(res, keys)
+
+    def contains_many(self, keys):
+        """Return which of the keys are in the table.
+
+        The result is a list of bools, or a NumPy bool array if keys is a
+        NumPy array.
+        """
+        unwrapped = _unwrap(keys)
+        if self._old_table is None:
+            # nothing to migrate, skip the per-key bookkeeping
+            locate = self._locate
+            hash_ = self._hash
+            res = [locate(k, hash_(k))[1] >= 0 for k in unwrapped]
+        else:
+            res = [k in self for k in unwrapped]
+        return _wrap(res, keys)
+
+    def remove_many(self, keys):
+        """Remove the keys that are present; missing keys are skipped.
+
+        Returns which keys were removed, as a list of bools or as a NumPy
+        bool array if keys is a NumPy array.
+        """
+        discard = self._discard
+        return _wrap([discard(k) for k in _unwrap(keys)], keys)
+
+    def _discard(self, k):
+        """Remove k if it is present, and return whether it was."""
+        if self._old_table is not None:
+            self._migrate(self._migrate_step)
+        table, i = self._locate(k, self._hash(k))
+        if i < 0:
+            return False
+        if self._method == SEPARATE_CHAINING:
+            table.pop(i)
+        else:  # open addressing
+            self._delete_at(table, i)
+        self._size -= 1
+        return True
+
+    def save(self, path):
+        """Write the table to a snapshot file for MappedHashTable.
+
+        Keys must be None, numbers, str, bytes or tuples of those, since
+        the snapshot is laid out by a hash that does not change between
+        processes; values can be anything picklable.
+        """
+        data = _pack_snapshot(self.items(), self._size,
+                              self._load_factor_threshold)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def _rebuild(self, capacity, extra=None):
+        """Rehash all entries, plus an extra (key, value, hash), at once.
+
+        Only needed by hopscotch and cuckoo hashing, whose inserts fail
+        when no entry can be displaced to make room. The capacity keeps
+        doubling until everything fits; if it still does not after a few
+        attempts, too many keys share (almost) the same hash and
+        HashMethodException is raised with the table left unchanged.
+        """
+        entries = []
+        for table in self._tables():
+            for j, k in enumerate(table.keys):
+                if k is not _FREE and k is not _DELETED:
+                    entries.append((k, table.values[j], table.hashes[j]))
+        if extra is not None:
+            entries.append(extra)
+        for _ in range(4):
+            table = self._new_table(capacity)
+            if all(self._place(table, k, v, h) for k, v, h in entries):
+                self._table = table
+                self._capacity = capacity
+                self._old_table = None
+                self._rehash_index = 0
+                return
+            capacity = next_prime(capacity * 2)
+        raise HashMethodException(
+            "Too many keys collide to fit into the table."
+        )
+
+
+class MappedHashTable(object):
+    """Read-only hash table that works directly on a memory-mapped snapshot.
+
+    Opening a snapshot written by ``HashTable.save`` only maps the file;
+    lookups probe the mapped slot arrays and unpickle just the keys they
+    compare and the value they return. Processes that open the same
+    snapshot share its pages through the page cache.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._attach(memoryview(self._mmap))
+
+    @classmethod
+    def from_buffer(cls, buf):
+        """Open a snapshot held in a buffer, e.g. a shared memory block.
+
+        The buffer must stay valid until ``close`` is called.
+        """
+        self = cls.__new__(cls)
+        self._file = self._mmap = None
+        self._attach(memoryview(buf))
+        return self
+
+    def _attach(self, buf):
+        """Set up the slot array views over a snapshot buffer."""
+        magic, bom, capacity, size = _SNAPSHOT_HEADER.unpack_from(buf)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("Not a HashTable snapshot.")
+        if bom != _SNAPSHOT_BOM:
+            raise ValueError("Snapshot was written with another byte order.")
+        self._capacity = capacity
+        self._size = size
+        self._buf = buf
+        start = _SNAPSHOT_HEADER.size
+        step = 8 * capacity
+        self._hashes = buf[start:start + step].cast('q')
+        self._key_offsets = buf[start + step:start + 2 * step].cast('Q')
+        self._value_offsets = buf[start + 2 * step:start + 3 * step].cast('Q')
+
+    def close(self):
+        """Release the views and unmap the snapshot."""
+        for view in (self._hashes, self._key_offsets, self._value_offsets,
+                     self._buf):
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self.size
+
+    def _find(self, k):
+        """Return the slot index holding k, or -1 if it is absent."""
+        h = _stable_hash(k)
+        hashes = self._hashes
+        key_offsets = self._key_offsets
+        buf = self._buf
+        cap = self._capacity
+        j = h % cap
+        while True:
+            off = key_offsets[j]
+            if off == _NO_ENTRY:
+                return -1
+            if hashes[j] == h and pickle.loads(buf[off:]) == k:
+                return j
+            j += 1
+            if j == cap:
+                j = 0
+
+    def __contains__(self, k):
+        return self._find(k) >= 0
+
+    def get(self, k, default=None):
+        """Return the value stored for k, or default if it is absent."""
+        j = self._find(k)
+        if j < 0:
+            return default
+        return pickle.loads(self._buf[self._value_offsets[j]:])
+
+    def __getitem__(self, k):
+        j = self._find(k)
+        if j < 0:
+            raise KeyError("key={} not found.".format(k))
+        return pickle.loads(self._buf[self._value_offsets[j]:])
+
+    def __iter__(self):
+        """Iterate over the keys of the snapshot in slot order."""
+        for k, _ in self.items():
+            yield k
+
+    def items(self):
+        """Iterate over the (key, value) pairs of the snapshot."""
+        buf = self._buf
+        for j, off in enumerate(self._key_offsets):
+            if off != _NO_ENTRY:
+                yield (pickle.loads(buf[off:]),
+                       pickle.loads(buf[self._value_offsets[j]:]))
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from .DoublyLinkedList import DoublyLinkedList, Node
+
+# probability that a node also appears on the next level up
+SKIP_PROBABILITY = 0.5
+MAX_LEVEL = 32
+
+
+class SkipNode(Node):
+    """A list node with forward links on the skip-list levels above it.
+
+    ``links[i]`` is the next node on level i + 1 and ``widths[i]`` the
+    number of items it skips over, or None for the last node of a level.
+    """
+
+    __slots__ = ('links', 'widths')
+
+    def __init__(self, val, prev=None, next=None):
+        super(SkipNode, self).__init__(val, prev, next)
+        self.links = ()
+        self.widths = ()
+
+
+class IndexableDoublyLinkedList(DoublyLinkedList):
+    """DoublyLinkedList with O(log n) expected positional access.
+
+    The nodes stay an ordinary doubly linked list, and a random subset of
+    them is linked again on sparser skip-list levels whose links record
+    how many items they span. ``get``, ``set``, ``insert`` and ``remove``
+    descend those levels instead of walking the whole list, and slices
+    jump to their start the same way.
+
+    Widths are not stored for the ends of a level; instead every level
+    remembers the coordinates of its first and last node, counted from an
+    origin that moves when items are added or removed at the front. So
+    ``push`` and ``shift`` touch only the new node's own levels, which is
+    O(1) expected, as is ``unshift``. The node methods inherited from
+    DoublyLinkedList still work, but cost O(log n) expected since they
+    first have to find the node's position.
+    """
+
+    def __init__(self, lst=None, seed=None):
+        """Construct a new list, optionally from a list of items.
+
+        :param seed: seed for the random node heights, for reproducible
+            layouts
+        """
+        self._random = random.Random(seed)
+        # first and last node of each level above the base list, and
+        # their coordinates; position = coordinate - origin
+        self._first = []
+        self._first_pos = []
+        self._last = []
+        self._last_pos = []
+        self._origin = 0
+        super(IndexableDoublyLinkedList, self).__init__(lst)
+
+    def clear(self):
+        """Empty the list."""
+        self._head = self._tail = None
+        self._size = 0
+        del self._first[:], self._first_pos[:]
+        del self._last[:], self._last_pos[:]
+        self._origin = 0
+
+    def _new_tower(self, node):
+        """Give a node a random number of levels above the base list."""
+        height = 0
+        limit = min(len(self._first) + 1, MAX_LEVEL)
+        while height < limit and self._random.random() < SKIP_PROBABILITY:
+            height += 1
+        if height:
+            node.links = [None] * height
+            node.widths = [None] * height
+        else:
+            node.links = node.widths = ()
+        return node
+
+    def push(self, val):
+        """Append an item to the end of the list in O(1) expected.
+
+        Returns the node holding the item.
+        """
+        node = SkipNode(val)
+        self._insert_node(self._size, node, self._tail)
+        return node
+
+    def shift(self, val):
+        """Append an item to the front of the list in O(1) expected.
+
+        Returns the node holding the item.
+        """
+        node = SkipNode(val)
+        self._insert_node(0, node, None)
+        return node
+
+    def extend(self, items):
+        """Append every item of an iterable to the end."""
+        push = self.push
+        for item in items:
+            push(item)
+
+    def sort(self, key=None, reverse=False):
+        """Sort the items of the list in place, by relinking the nodes.
+
+        The skip-list levels are rebuilt for the new order in O(n).
+        """
+        super(IndexableDoublyLinkedList, self).sort(key, reverse)
+        nodes = list(self._nodes())
+        self.clear()
+        for node in nodes:
+            self._insert_node(self._size, node, self._tail)
+
+    def insert(self, pos, val):
+        """Insert an item at a certain position in O(log n) expected."""
+        if (pos < 0 or pos > self.size):
+            raise IndexError("Out of bounds.")
+        self._insert_node(pos, SkipNode(val))
+
+    def remove(self, pos):
+        """Remove and return an item at a certain position.
+
+        O(1) expected at the front, O(log n) expected elsewhere.
+        """
+        if (pos < 0 or pos >= self.size):
+            raise IndexError("Out of bounds.")
+        return self._remove_node(pos).val
+
+    def insert_after(self, node, val):
+        """Insert an item right after a node of this list.
+
+        Returns the node holding the new item.
+        """
+        new_node = SkipNode(val)
+        self._link_after(node, new_node)
+        return new_node
+
+    def insert_before(self, node, val):
+        """Insert an item right before a node of this list.
+
+        Returns the node holding the new item.
+        """
+        new_node = SkipNode(val)
+        self._link_after(node.prev, new_node)
+        return new_node
+
+    def splice(self, node, other):
+        """Move all items of other right after a node of this list.
+
+        Each item has to be indexed, so this runs in O(m log n) expected
+        for m items; other is left empty. Nodes of an indexable list keep
+        their identity.
+        """
+        if other is self:
+            raise ValueError("Cannot splice a list into itself.")
+        pred = node
+        while other._head is not None:
+            moved = other._head
+            other._unlink(moved)
+            if not isinstance(moved, SkipNode):
+                moved = SkipNode(moved.val)
+            self._link_after(pred, moved)
+            pred = moved
+
+    def _link_after(self, pred, node):
+        """Link a detached node after pred, or at the front if pred is None.
+        """
+        if pred is None:
+            pos = 0
+        elif pred is self._tail:
+            pos = self._size
+        else:
+            pos = self._position(pred) + 1
+        self._insert_node(pos, node, pred)
+
+    def _unlink(self, node):
+        """Detach a node of this list."""
+        pos = 0 if node is self._head else self._position(node)
+        self._remove_node(pos)
+
+    def _position(self, node):
+        """Return the position of a node of this list.
+
+        Climbs towards the end until reaching the last node of a level,
+        whose coordinate is known, which takes O(log n) expected steps.
+        """
+        dist = 0
+        while True:
+            top = len(node.links) - 1
+            if top < 0:
+                if node.next is None:  # at tail
+                    return self._size - 1 - dist
+                node = node.next
+                dist += 1
+            elif node.links[top] is None:  # last node of its top level
+                return self._last_pos[top] - self._origin - dist
+            else:
+                dist += node.widths[top]
+                node = node.links[top]
+
+    def _path(self, coord):
+        """Find the last node before a coordinate on every upper level.
+
+        Returns the nodes, None where a level has no such node, and their
+        coordinates.
+        """
+        levels = len(self._first)
+        preds = [None] * levels
+        coords = [0] * levels
+        node = None
+        node_pos = 0
+        for level in reversed(range(levels)):
+            if node is None and self._first_pos[level] < coord:
+                node = self._first[level]
+                node_pos = self._first_pos[level]
+            if node is not None:
+                while node.links[level] is not None and \
+                        node_pos + node.widths[level] < coord:
+                    node_pos += node.widths[level]
+                    node = node.links[level]
+            preds[level] = node
+            coords[level] = node_pos
+        return preds, coords
+
+    def _get_node_at(self, pos):
+        """Get node from a certain position in O(log n) expected.
+
+        :param pos: index of desired node
+        :type pos: int
+        :returns: Node object
+        """
+        coord = self._origin + pos
+        node = None
+        node_pos = 0
+        for level in reversed(range(len(self._first))):
+            if node is None and self._first_pos[level] <= coord:
+                node = self._first[level]
+                node_pos = self._first_pos[level]
+            if node is not None:
+                while node.links[level] is not None and \
+                        node_pos + node.widths[level] <= coord:
+                    node_pos += node.widths[level]
+                    node = node.links[level]
+        return self._walk(node, node_pos, coord)
+
+    def _walk(self, node, node_pos, coord):
+        """Walk the base list from a node, or the head if it is None."""
+        if node is None:
+            node = self._head
+            node_pos = self._origin
+        while node_pos < coord:
+            node = node.next
+            node_pos += 1
+        return node
+
+    def _insert_node(self, pos, node, pred=False):
+        """Link a detached node in at a position.
+
+        :param pred: the node before the position, None at the front, or
+            False if it is not known yet
+        """
+        self._new_tower(node)
+        height = len(node.links)
+        levels = len(self._first)
+        if pos == 0:
+            pred = None
+            # the new node gets the coordinate before the old front, so no
+            # other coordinate changes
+            self._origin -= 1
+            coord = self._origin
+            for level in range(min(height, levels)):
+                node.links[level] = self._first[level]
+                node.widths[level] = self._first_pos[level] - coord
+                self._first[level] = node
+                self._first_pos[level] = coord
+        elif pos == self._size:
+            pred = self._tail
+            coord = self._origin + pos
+            for level in range(min(height, levels)):
+                last = self._last[level]
+                last.links[level] = node
+                last.widths[level] = coord - self._last_pos[level]
+                self._last[level] = node
+                self._last_pos[level] = coord
+        else:
+            # every item from pos onwards moves one place up
+            coord = self._origin + pos
+            preds, coords = self._path(coord)
+            if pred is False:
+                pred = self._walk(preds[0], coords[0], coord - 1) \
+                    if levels else self._walk(None, 0, coord - 1)
+            for level in range(levels):
+                prev = preds[level]
+                succ = self._first[level] if prev is None else \
+                    prev.links[level]
+                if level < height:
+                    node.links[level] = succ
+                    if succ is not None:
+                        if prev is None:
+                            succ_pos = self._first_pos[level]
+                        else:
+                            succ_pos = coords[level] + prev.widths[level]
+                        node.widths[level] = succ_pos + 1 - coord
+                        self._last_pos[level] += 1
+                    else:
+                        self._last[level] = node
+                        self._last_pos[level] = coord
+                    if prev is None:
+                        self._first[level] = node
+                        self._first_pos[level] = coord
+                    else:
+                        prev.widths[level] = coord - coords[level]
+                        prev.links[level] = node
+                elif succ is not None:
+                    if prev is None:
+                        self._first_pos[level] += 1
+                    else:
+                        prev.widths[level] += 1
+                    self._last_pos[level] += 1
+        for level in range(levels, height):
+            # the node is alone on a new level
+            self._first.append(node)
+            self._first_pos.append(coord)
+            self._last.append(node)
+            self._last_pos.append(coord)
+        super(IndexableDoublyLinkedList, self)._link_after(pred, node)
+
+    def _remove_node(self, pos):
+        """Detach and return the node at a position."""
+        coord = self._origin + pos
+        if pos == 0:
+            node = self._head
+            height = len(node.links)
+            # drop the coordinate of the front instead of moving the rest
+            self._origin += 1
+            for level in range(height):
+                succ = node.links[level]
+                if succ is None:
+                    self._truncate(level)
+                    break
+                self._first[level] = succ
+                self._first_pos[level] = coord + node.widths[level]
+        else:
+            # every item after pos moves one place down
+            preds, coords = self._path(coord)
+            node = self._walk(preds[0], coords[0], coord) \
+                if preds else self._walk(None, 0, coord)
+            height = len(node.links)
+            for level in range(len(preds)):
+                prev = preds[level]
+                if level < height:
+                    succ = node.links[level]
+                    if succ is not None:
+                        succ_pos = coord + node.widths[level] - 1
+                        self._last_pos[level] -= 1
+                    elif prev is None:
+                        self._truncate(level)
+                        break
+                    else:
+                        self._last[level] = prev
+                        self._last_pos[level] = coords[level]
+                    if prev is None:
+                        self._first[level] = succ
+                        self._first_pos[level] = succ_pos
+                    else:
+                        prev.links[level] = succ
+                        prev.widths[level] = None if succ is None else \
+                            succ_pos - coords[level]
+                else:
+                    succ = self._first[level] if prev is None else \
+                        prev.links[level]
+                    if succ is not None:
+                        if prev is None:
+                            self._first_pos[level] -= 1
+                        else:
+                            prev.widths[level] -= 1
+                        self._last_pos[level] -= 1
+        node.links = node.widths = ()
+        super(IndexableDoublyLinkedList, self)._unlink(node)
+        return node
+
+    def _truncate(self, level):
+        """Drop the levels from level upwards, which have become empty."""
+        del self._first[level:], self._first_pos[level:]
+        del self._last[level:], self._last_pos[level:]
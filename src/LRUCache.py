@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import sys
+import time
+
+from .DoublyLinkedList import DoublyLinkedList
+from .HashTable import HashTable
+
+# marker for a missing key, distinct from any stored value
+_MISSING = object()
+
+
+class _Entry(object):
+    """A cached value with its bookkeeping."""
+
+    __slots__ = ('key', 'value', 'nbytes', 'expires', 'node', 'bucket')
+
+    def __init__(self, key, value, nbytes, expires):
+        self.key = key
+        self.value = value
+        self.nbytes = nbytes
+        self.expires = expires
+        # list node holding this entry, and for LFU the frequency bucket
+        self.node = None
+        self.bucket = None
+
+
+class _Cache(object):
+    """Bounded key-value cache with O(1) lookups, updates and evictions.
+
+    A HashTable maps each key to its entry, and the subclass keeps the
+    entries in linked lists ordered by eviction priority, so that no
+    operation has to search.
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, ttl=None,
+                 sizeof=sys.getsizeof, clock=time.monotonic):
+        """Construct an empty cache.
+
+        :param capacity: maximum number of entries, or None for no limit
+        :param max_bytes: maximum total of ``sizeof(value)`` over all
+            entries, or None for no limit
+        :param ttl: default number of seconds an entry stays valid, or
+            None to keep entries until they are evicted
+        :param sizeof: function returning the size of a value in bytes
+        :param clock: function returning the current time in seconds
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self._capacity = capacity
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._index = HashTable()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def size(self):
+        return self._index.size
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Total size of the cached values in bytes."""
+        return self._nbytes
+
+    def __contains__(self, k):
+        """Check whether k is cached, without counting it as a use."""
+        entry = self._index.get(k)
+        if entry is None:
+            return False
+        if entry.expires is not None and entry.expires <= self._clock():
+            self._expire(entry)
+            return False
+        return True
+
+    def get(self, k, default=None):
+        """Return the cached value of k, or default if it is not cached."""
+        entry = self._index.get(k)
+        if entry is not None and entry.expires is not None and \
+                entry.expires <= self._clock():
+            self._expire(entry)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(entry)
+        return entry.value
+
+    def __getitem__(self, k):
+        value = self.get(k, _MISSING)
+        if value is _MISSING:
+            raise KeyError("key={} not found.".format(k))
+        return value
+
+    def put(self, k, value, ttl=None):
+        """Cache value under k, evicting entries to respect the bounds.
+
+        :param ttl: seconds until this entry expires, overriding the
+            cache's default
+        """
+        ttl = self._ttl if ttl is None else ttl
+        expires = None if ttl is None else self._clock() + ttl
+        nbytes = self._sizeof(value) if self._max_bytes is not None else 0
+
+        entry = self._index.get(k)
+        if self._max_bytes is not None and nbytes > self._max_bytes:
+            # would evict everything else and still not fit
+            if entry is not None:
+                self._discard(entry)
+            return
+
+        if entry is None:
+            entry = _Entry(k, value, nbytes, expires)
+            self._index.insert(k, entry)
+            self._add(entry)
+        else:
+            self._nbytes -= entry.nbytes
+            entry.value = value
+            entry.nbytes = nbytes
+            entry.expires = expires
+            self._touch(entry)
+        self._nbytes += nbytes
+
+        while (self._capacity is not None and
+               self.size > self._capacity) or \
+                (self._max_bytes is not None and
+                 self._nbytes > self._max_bytes):
+            self._discard(self._victim(entry))
+            self.evictions += 1
+
+    def __setitem__(self, k, value):
+        self.put(k, value)
+
+    def remove(self, k):
+        entry = self._index.get(k)
+        if entry is None:
+            raise KeyError("key={} not found.".format(k))
+        self._discard(entry)
+
+    def __delitem__(self, k):
+        self.remove(k)
+
+    def clear(self):
+        """Empty the cache; the counters are kept."""
+        for k in list(self._index):
+            self._discard(self._index[k])
+
+    def memoize(self, fn):
+        """Decorator that caches the results of fn by its arguments."""
+        @functools.wraps(fn)
+        def wrapper(*args):
+            value = self.get(args, _MISSING)
+            if value is _MISSING:
+                value = fn(*args)
+                self.put(args, value)
+            return value
+        return wrapper
+
+    def _expire(self, entry):
+        self._discard(entry)
+        self.expirations += 1
+
+    def _discard(self, entry):
+        self._index.remove(entry.key)
+        self._nbytes -= entry.nbytes
+        self._unlink(entry)
+
+    def _add(self, entry):
+        """Link a new entry into the eviction order."""
+        raise NotImplementedError
+
+    def _touch(self, entry):
+        """Record a use of the entry."""
+        raise NotImplementedError
+
+    def _unlink(self, entry):
+        """Remove the entry from the eviction order."""
+        raise NotImplementedError
+
+    def _victim(self, keep):
+        """Return the entry to evict next, other than the entry keep."""
+        raise NotImplementedError
+
+
+class LRUCache(_Cache):
+    """Cache that evicts the least recently used entry.
+
+    Entries are kept in a DoublyLinkedList from most to least recently
+    used; a use moves the entry's node to the front.
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, ttl=None,
+                 sizeof=sys.getsizeof, clock=time.monotonic):
+        super(LRUCache, self).__init__(capacity, max_bytes, ttl, sizeof,
+                                       clock)
+        self._order = DoublyLinkedList()
+
+    def _add(self, entry):
+        entry.node = self._order.shift(entry)
+
+    def _touch(self, entry):
+        self._order.move_to_front(entry.node)
+
+    def _unlink(self, entry):
+        self._order.remove_node(entry.node)
+
+    def _victim(self, keep):
+        # keep was just used, so it is at the front
+        return self._order.tail.val
+
+
+class _FreqBucket(object):
+    """Entries used the same number of times, most recent first."""
+
+    __slots__ = ('freq', 'entries')
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.entries = DoublyLinkedList()
+
+
+class LFUCache(_Cache):
+    """Cache that evicts the least frequently used entry.
+
+    Ties go to the least recently used entry. Entries are grouped into
+    buckets by use count, and the buckets are kept in a DoublyLinkedList
+    in increasing count order. A use moves the entry to the bucket right
+    after its own, creating that bucket if needed, so every operation is
+    O(1).
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, ttl=None,
+                 sizeof=sys.getsizeof, clock=time.monotonic):
+        super(LFUCache, self).__init__(capacity, max_bytes, ttl, sizeof,
+                                       clock)
+        self._buckets = DoublyLinkedList()
+
+    def _move(self, entry, pred, freq):
+        """Move the entry to the bucket of freq, right after bucket pred."""
+        succ = self._buckets.head if pred is None else pred.next
+        if succ is None or succ.val.freq != freq:
+            succ = self._buckets.insert_after(pred, _FreqBucket(freq))
+        if entry.bucket is not None:
+            self._unlink(entry)
+        entry.node = succ.val.entries.shift(entry)
+        entry.bucket = succ
+
+    def _add(self, entry):
+        self._move(entry, None, 1)
+
+    def _touch(self, entry):
+        bucket = entry.bucket
+        self._move(entry, bucket, bucket.val.freq + 1)
+
+    def _unlink(self, entry):
+        bucket = entry.bucket
+        bucket.val.entries.remove_node(entry.node)
+        if bucket.val.entries.is_empty():
+            self._buckets.remove_node(bucket)
+        entry.bucket = None
+
+    def _victim(self, keep):
+        bucket = self._buckets.head
+        victim = bucket.val.entries.tail.val
+        if victim is keep:
+            # keep was just used, so it is alone in its bucket
+            victim = bucket.next.val.entries.tail.val
+        return victim
+
+    def frequency(self, k):
+        """Return the use count of k; storing it counts as the first use."""
+        entry = self._index.get(k)
+        if entry is None:
+            raise KeyError("key={} not found.".format(k))
+        return entry.bucket.val.freq
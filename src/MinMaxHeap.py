@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from .BinaryHeap import BinaryHeap
+
+
+class MinMaxHeap(BinaryHeap):
+    """Binary heap with both ends of the order at the top.
+
+    Levels alternate between min and max levels, starting with a min
+    level at the root: an element on a min level comes before all of its
+    descendants, and one on a max level after them. So the first element
+    is the root and the last is one of its children, which makes
+    ``peek_min`` and ``peek_max`` O(1), and ``delete_min`` and
+    ``remove_max`` O(log n).
+
+    Accepts the same key and reverse arguments as BinaryHeap; with
+    reverse=True the ``*_min`` methods return the largest key.
+    """
+
+    def __init__(self, items=None, key=None, reverse=False):
+        """Construct a heap, optionally from an iterable of elements.
+
+        :param key: function returning the key to order an element by
+        :param reverse: put the largest key at the root instead
+        """
+        super(MinMaxHeap, self).__init__(items, 2, key, reverse)
+
+    @staticmethod
+    def _on_min_level(i):
+        # the root is on level 0, a min level
+        return bool((i + 1).bit_length() & 1)
+
+    def _before(self, i, j, on_min):
+        """Whether element i goes before element j on a min or max level."""
+        if on_min:
+            return self._lt(self._keys[i], self._keys[j])
+        return self._lt(self._keys[j], self._keys[i])
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        if self._keys is not heap:
+            keys = self._keys
+            keys[i], keys[j] = keys[j], keys[i]
+
+    def _percolate_up(self, i):
+        if i == 0:
+            return
+        on_min = self._on_min_level(i)
+        parent = (i - 1) // 2
+        if self._before(parent, i, on_min):
+            # belongs to the other kind of level
+            self._swap(i, parent)
+            i = parent
+            on_min = not on_min
+        # move up through the grandparents on the same kind of level
+        while i > 2:
+            grandparent = (i - 3) // 4
+            if not self._before(i, grandparent, on_min):
+                break
+            self._swap(i, grandparent)
+            i = grandparent
+
+    def _percolate_down(self, i):
+        """Trickle the element at i down; returns where it ended up.
+
+        The element may end up on the other kind of level, where it can
+        come before its new ancestors after a change of key, so callers
+        follow up with _percolate_up from the returned index.
+        """
+        size = self.size
+        on_min = self._on_min_level(i)
+        pos = i
+        settled = False
+        while True:
+            first = 2 * i + 1
+            if first >= size:
+                break
+            # first in order among the children and grandchildren
+            m = first
+            for c in (first + 1, 2 * first + 1, 2 * first + 2,
+                      2 * first + 3, 2 * first + 4):
+                if c < size and self._before(c, m, on_min):
+                    m = c
+            if not self._before(m, i, on_min):
+                break
+            self._swap(m, i)
+            if not settled:
+                pos = m
+            if m <= first + 1:
+                # a child, on the other kind of level
+                break
+            parent = (m - 1) // 2
+            if self._before(parent, m, on_min):
+                # the parent's element continues down in its place
+                self._swap(m, parent)
+                if not settled:
+                    pos = parent
+                    settled = True
+            i = m
+        return pos
+
+    def _find_max(self):
+        """Index of the last element in heap order: the root or a child."""
+        if self.size < 3:
+            return self.size - 1
+        return 2 if self._lt(self._keys[1], self._keys[2]) else 1
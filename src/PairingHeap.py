@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+import operator
+
+
+class PairingNode(object):
+    """A pairing heap node; also the handle returned by insert.
+
+    ``prev`` is the parent for a first child and the left sibling
+    otherwise.
+    """
+
+    __slots__ = ('val', 'key', 'child', 'next', 'prev')
+
+    def __init__(self, val, key):
+        self.val = val
+        self.key = key
+        self.child = None
+        self.next = None
+        self.prev = None
+
+
+class PairingHeap(object):
+    """Heap-ordered multiway tree that is restructured lazily.
+
+    insert and meld link a tree under the root with one comparison, so
+    they are O(1); delete_min merges the root's subtrees in two passes
+    for O(log n) amortized. Moving a node towards the root is a cut and a
+    link, which in practice makes it much cheaper than in an array heap.
+
+    Ordering is the same as in BinaryHeap: by ``key(el)``, smallest key
+    at the root unless ``reverse=True``. The ``*_max`` methods have to
+    search the whole tree and take O(n).
+    """
+
+    def __init__(self, items=None, key=None, reverse=False):
+        """Construct a heap, optionally from an iterable of elements.
+
+        :param key: function returning the key to order an element by
+        :param reverse: put the largest key at the root instead
+        """
+        self._key = key
+        self._lt = operator.gt if reverse else operator.lt
+        self._root = None
+        self._size = 0
+        if items is not None:
+            for el in items:
+                self.insert(el)
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def clear(self):
+        """Remove all elements."""
+        self._root = None
+        self._size = 0
+
+    def _key_of(self, el):
+        return el if self._key is None else self._key(el)
+
+    def _link(self, a, b):
+        """Make the later of two roots the first child of the other."""
+        if self._lt(b.key, a.key):
+            a, b = b, a
+        b.prev = a
+        b.next = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.next = a.prev = None
+        return a
+
+    def _merge_pairs(self, first):
+        """Merge a list of sibling trees into one in two passes."""
+        if first is None:
+            return None
+        # link the siblings in pairs, left to right
+        pairs = []
+        node = first
+        while node is not None:
+            a = node
+            b = node.next
+            node = b.next if b is not None else None
+            a.next = a.prev = None
+            if b is None:
+                pairs.append(a)
+            else:
+                b.next = b.prev = None
+                pairs.append(self._link(a, b))
+        # then fold the pairs into one tree, right to left
+        res = pairs.pop()
+        while pairs:
+            res = self._link(pairs.pop(), res)
+        return res
+
+    def _cut(self, node):
+        """Detach the subtree of a non-root node from its parent."""
+        if node.prev.child is node:  # first child
+            node.prev.child = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        node.next = node.prev = None
+
+    def insert(self, el):
+        """Add an element in O(1); returns its node."""
+        node = PairingNode(el, self._key_of(el))
+        self._root = node if self._root is None else \
+            self._link(self._root, node)
+        self._size += 1
+        return node
+
+    def peek_min(self):
+        """Return the root element, first in heap order."""
+        if self._root is None:
+            raise IndexError("No elements in heap.")
+        return self._root.val
+
+    def delete_min(self):
+        """Remove and return the root element in O(log n) amortized."""
+        if self._root is None:
+            raise IndexError("No elements in heap.")
+        return self.remove_node(self._root)
+
+    def remove_min(self):
+        """Same as delete_min, named to pair with remove_max."""
+        return self.delete_min()
+
+    def remove_node(self, node):
+        """Remove a node of this heap and return its element."""
+        if node is self._root:
+            self._root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            subtree = self._merge_pairs(node.child)
+            if subtree is not None:
+                self._root = self._link(self._root, subtree)
+        node.child = None
+        self._size -= 1
+        return node.val
+
+    def update_node(self, node, el):
+        """Replace the element of a node and restore the order.
+
+        Moving the node towards the root is a cut and a link; moving it
+        away from the root removes and reinserts it.
+        """
+        key = self._key_of(el)
+        if not self._lt(node.key, key):
+            node.val = el
+            node.key = key
+            if node is not self._root:
+                self._cut(node)
+                self._root = self._link(self._root, node)
+        else:
+            self.remove_node(node)
+            node.val = el
+            node.key = key
+            self._root = node if self._root is None else \
+                self._link(self._root, node)
+            self._size += 1
+
+    def meld(self, other):
+        """Move all elements of another pairing heap into this one in O(1).
+
+        Both heaps must order their elements the same way; other is left
+        empty, and its nodes become nodes of this heap.
+        """
+        if other is self:
+            raise ValueError("Cannot meld a heap with itself.")
+        if other._root is not None:
+            self._root = other._root if self._root is None else \
+                self._link(self._root, other._root)
+            self._size += other._size
+            other.clear()
+
+    def _nodes(self):
+        stack = [] if self._root is None else [self._root]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.next is not None:
+                stack.append(node.next)
+            if node.child is not None:
+                stack.append(node.child)
+
+    def _find_max(self):
+        """Node of the last element in heap order, by a full search."""
+        if self._root is None:
+            raise IndexError("No elements in heap.")
+        res = self._root
+        for node in self._nodes():
+            if self._lt(res.key, node.key):
+                res = node
+        return res
+
+    def peek_max(self):
+        """Return the element last in heap order in O(n)."""
+        return self._find_max().val
+
+    def remove_max(self):
+        """Remove and return the element last in heap order in O(n)."""
+        return self.remove_node(self._find_max())
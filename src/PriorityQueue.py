@@ -1,60 +1,260 @@
 # -*- coding: utf-8 -*-
 
-from .BinaryHeap import BinaryHeap
+from .FibonacciHeap import FibonacciHeap
+from .HashTable import HashTable
+from .MinMaxHeap import MinMaxHeap
+from .PairingHeap import PairingHeap
+
+# backends
+BINARY_HEAP = 0
+PAIRING_HEAP = 1
+FIBONACCI_HEAP = 2
 
 
 class PrioritizedElement(object):
 
+    __slots__ = ('_el', '_priority', '_handle')
+
     def __init__(self, el, priority):
         self._el = el
         self._priority = priority
+        # where the backend keeps this entry: a slot or a node
+        self._handle = None
 
     def get_element(self):
         return self._el
 
-    def __cmp__(self, other):
-        # greater priority means closer to the root
-        if self._priority > other._priority:
-            return -1
-        elif self._priority == other._priority:
-            return 0
+    def get_priority(self):
+        return self._priority
+
+
+class _IndexedHeap(MinMaxHeap):
+    """MinMaxHeap of PrioritizedElements that know their own slot.
+
+    Every write of an entry into the heap array goes through _append,
+    _set or _swap, which record the new slot on the entry.
+    """
+
+    def _append(self, entry):
+        entry._handle = self.size
+        super(_IndexedHeap, self)._append(entry)
+
+    def _set(self, i, entry):
+        entry._handle = i
+        super(_IndexedHeap, self)._set(i, entry)
+
+    def _swap(self, i, j):
+        super(_IndexedHeap, self)._swap(i, j)
+        self._heap[i]._handle = i
+        self._heap[j]._handle = j
+
+    def update(self, entry, priority):
+        """Change the priority of an entry and restore the order."""
+        entry._priority = priority
+        self._set(entry._handle, entry)
+        self._percolate_up(self._percolate_down(entry._handle))
+
+    def remove(self, entry):
+        return self._remove_at(entry._handle)
+
+    def insert_many(self, entries):
+        """Add a list of entries in O(n + k), or O(k log n) if k is small.
+        """
+        if len(entries) * self.size.bit_length() < self.size:
+            for entry in entries:
+                self.insert(entry)
         else:
-            return 1
+            self.heapify(entries)
+
+
+class _NodeHandles(object):
+    """Gives a pointer-based heap the entry methods of _IndexedHeap.
+
+    The node returned by the heap's insert is the entry's handle.
+    """
+
+    def insert(self, entry):
+        entry._handle = super(_NodeHandles, self).insert(entry)
+
+    def update(self, entry, priority):
+        entry._priority = priority
+        self.update_node(entry._handle, entry)
+
+    def remove(self, entry):
+        return self.remove_node(entry._handle)
+
+    def insert_many(self, entries):
+        for entry in entries:
+            self.insert(entry)
+
+
+class _IndexedPairingHeap(_NodeHandles, PairingHeap):
+    pass
+
+
+class _IndexedFibonacciHeap(_NodeHandles, FibonacciHeap):
+    pass
+
+
+_BACKENDS = {
+    BINARY_HEAP: _IndexedHeap,
+    PAIRING_HEAP: _IndexedPairingHeap,
+    FIBONACCI_HEAP: _IndexedFibonacciHeap,
+}
 
 
 class PriorityQueue(object):
+    """Queue of elements served by priority, highest first.
+
+    The heap is chosen by the backend argument:
+
+    - BINARY_HEAP: a MinMaxHeap array with the highest priority at the
+      root, so both the highest and the lowest priority element can be
+      peeked in O(1) and removed in O(log n).
+    - PAIRING_HEAP: a PairingHeap, with O(1) insert and cheap priority
+      increases, for workloads dominated by those.
+    - FIBONACCI_HEAP: a FibonacciHeap, with O(1) insert and O(1)
+      amortized priority increases.
+
+    The pointer-based heaps only keep the highest priority end in order,
+    so peeking or removing the lowest priority element takes O(n) there.
 
-    def __init__(self):
-        self._data = BinaryHeap()
+    The heap entries record their slot or node, and a HashTable maps
+    every element to its entry, so any element can be found, removed or
+    given a new priority without a search. Elements must therefore be
+    hashable, and each is queued at most once.
+    """
+
+    def __init__(self, backend=BINARY_HEAP):
+        if backend not in _BACKENDS:
+            raise ValueError("Unknown backend {}.".format(backend))
+        self._data = _BACKENDS[backend](key=PrioritizedElement.get_priority,
+                                        reverse=True)
+        self._entries = HashTable()
+
+    @property
+    def size(self):
+        return self._data.size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self._data.is_empty()
 
     def clear(self):
-        self._data = BinaryHeap()
+        self._data.clear()
+        self._entries = HashTable()
+
+    def __contains__(self, el):
+        return el in self._entries
+
+    def _entry(self, el):
+        entry = self._entries.get(el)
+        if entry is None:
+            raise KeyError("element={} not found.".format(el))
+        return entry
 
     def insert(self, el, priority):
+        """Queue an element, or give it a new priority if already queued.
+        """
+        entry = self._entries.get(el)
+        if entry is not None:
+            self._data.update(entry, priority)
+            return
         prioritized_element = PrioritizedElement(el, priority)
+        self._entries.insert(el, prioritized_element)
         self._data.insert(prioritized_element)
 
     def batch_insert(self, prioritized_elements):
-        pass
+        """Queue an iterable of (element, priority) pairs.
+
+        With the array heap the whole batch is appended and the order is
+        restored bottom-up once, in O(n + k) instead of k sifts; pointer
+        heaps insert each element in O(1). Elements that are already
+        queued get the new priority, as with insert.
+        """
+        if hasattr(prioritized_elements, '__len__'):
+            # grow the index once rather than while loading
+            self._entries._reserve(len(prioritized_elements))
+        new = []
+        for el, priority in prioritized_elements:
+            entry = self._entries.get(el)
+            if entry is None:
+                entry = PrioritizedElement(el, priority)
+                self._entries.insert(el, entry)
+                new.append(entry)
+            elif entry._handle is None:  # earlier in this batch
+                entry._priority = priority
+            else:
+                self._data.update(entry, priority)
+        self._data.insert_many(new)
+
+    def meld(self, other):
+        """Move all elements of another queue into this one.
+
+        Queues with the same pointer-based backend are melded in O(1)
+        plus O(m) to index the m moved elements; otherwise the elements
+        are added as a batch, which is O(n + m) for the array heap.
+        Elements queued in both keep the priority from other. other is
+        left empty.
+        """
+        if other is self:
+            raise ValueError("Cannot meld a queue with itself.")
+        moved = []
+        for el, entry in other._entries.items():
+            mine = self._entries.get(el)
+            if mine is None:
+                self._entries.insert(el, entry)
+                moved.append(entry)
+            else:
+                other._data.remove(entry)
+                self._data.update(mine, entry.get_priority())
+        if type(other._data) is type(self._data) and \
+                isinstance(self._data, _NodeHandles):
+            self._data.meld(other._data)
+        else:
+            self._data.insert_many(moved)
+            other._data.clear()
+        other._entries = HashTable()
+
+    def merge(self, other):
+        """Same as meld."""
+        self.meld(other)
+
+    def get_priority(self, el):
+        """Return the priority of a queued element."""
+        return self._entry(el).get_priority()
+
+    def update_priority(self, el, priority):
+        """Change the priority of a queued element."""
+        self._data.update(self._entry(el), priority)
+
+    def remove(self, el):
+        """Remove a queued element in O(log n), amortized for pointer heaps.
+        """
+        entry = self._entry(el)
+        self._data.remove(entry)
+        self._entries.remove(el)
+
+    def _pop(self, entry):
+        self._entries.remove(entry.get_element())
+        return entry.get_element()
 
     def peek_lowest_priority(self):
-        return self._data.peek_max()
+        return self._data.peek_max().get_element()
 
     def remove_lowest_priority(self):
-        self._data.remove_max()
+        self.pop_lowest_priority()
 
     def pop_lowest_priority(self):
-        lp = self.peek_lowest_priority()
-        self.remove_lowest_priority()
-        return lp
+        return self._pop(self._data.remove_max())
 
     def peek_highest_priority(self):
         return self._data.peek_min().get_element()
 
     def remove_highest_priority(self):
-        self._data.remove_min()
+        self.pop_highest_priority()
 
     def pop_highest_priority(self):
-        hp = self.peek_highest_priority()
-        self.remove_highest_priority()
-        return hp
+        return self._pop(self._data.remove_min())
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+import uuid
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from .HashTable import (MappedHashTable, _pack_snapshot, _stable_hash,
+                        _unwrap, _wrap)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only used to unwrap keys
+    np = None
+
+# marker for a missing key, distinct from any stored value; it never
+# leaves the process that uses it
+_MISSING = object()
+
+# shards attached by worker processes, which keep them open between
+# tasks: table token -> (generation, {block name: attachment}), least
+# recently used first
+_worker_shards = OrderedDict()
+
+# most tables a worker keeps attached at once
+_WORKER_TABLES = 4
+
+
+def _open(name):
+    """Return a (SharedMemory, MappedHashTable) pair for a block name."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, MappedHashTable.from_buffer(shm.buf)
+
+
+def _close(attachment):
+    shm, table = attachment
+    table.close()
+    shm.close()
+
+
+def _unlinked(name):
+    """Whether the block of a name has been unlinked by its owner."""
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return True
+    return False
+
+
+def _forget(token):
+    for attachment in _worker_shards.pop(token)[1].values():
+        _close(attachment)
+
+
+def _worker_shard(spec, i):
+    """The MappedHashTable of shard i, attached by a worker process.
+
+    spec is the (token, generation, names) of the handle that sent the
+    task. A newer generation of the same table means that insert_many
+    has replaced blocks, so attachments to blocks that are no longer in
+    names are closed. The other tables are dropped once their owner has
+    closed them, or when more than _WORKER_TABLES are attached.
+    """
+    token, generation, names = spec
+    for other, (_, attached) in list(_worker_shards.items()):
+        if other != token and (not attached or
+                               _unlinked(next(iter(attached)))):
+            _forget(other)
+    latest, attached = _worker_shards.get(token, (generation, {}))
+    if generation > latest:
+        live = set(names)
+        for name in [name for name in attached if name not in live]:
+            _close(attached.pop(name))
+        latest = generation
+    _worker_shards[token] = latest, attached
+    _worker_shards.move_to_end(token)
+    while len(_worker_shards) > _WORKER_TABLES:
+        _forget(next(iter(_worker_shards)))
+    name = names[i]
+    if name not in attached:
+        attached[name] = _open(name)
+    return attached[name][1]
+
+
+def _run_on_shard(fn, spec, i, keys):
+    return fn(_worker_shard(spec, i), keys)
+
+
+def _pack_shard(pairs, load_factor_threshold):
+    """Snapshot bytes for (key, value) pairs; the last duplicate wins."""
+    merged = dict(pairs)
+    return _pack_snapshot(merged.items(), len(merged), load_factor_threshold)
+
+
+def _repack_shard(name, pairs, load_factor_threshold):
+    """Snapshot bytes for an existing shard updated with new pairs."""
+    # not cached, the block is about to be replaced
+    attachment = _open(name)
+    try:
+        merged = dict(attachment[1].items())
+    finally:
+        _close(attachment)
+    merged.update(pairs)
+    return _pack_snapshot(merged.items(), len(merged), load_factor_threshold)
+
+
+def _lookup_shard(table, keys):
+    """Presence flags for keys, and their values with None if missing."""
+    values = [table.get(k, _MISSING) for k in keys]
+    return ([value is not _MISSING for value in values],
+            [None if value is _MISSING else value for value in values])
+
+
+def _contains_shard(table, keys):
+    return [k in table for k in keys]
+
+
+def _restore(names, load_factor_threshold, token, generation):
+    """Unpickle a non-owning handle that workers can share a cache with."""
+    sht = ShardedHashTable(names, load_factor_threshold)
+    sht._token = token
+    sht._generation = generation
+    return sht
+
+
+class ShardedHashTable(object):
+    """Hash table split across shards in shared memory blocks.
+
+    Each shard is a HashTable snapshot (see ``HashTable.save``) stored in
+    a ``multiprocessing.shared_memory`` block, and a key belongs to the
+    shard given by its process-independent hash modulo the shard count.
+    Any process can attach to the shards by name and look keys up in
+    place, so batches of lookups, and the hashing and packing work of
+    bulk inserts, can be spread over a ProcessPoolExecutor.
+
+    Shards are read-only: ``insert_many`` builds replacement blocks for
+    the shards it touches. Keys have the same restrictions as for
+    ``HashTable.save``.
+    """
+
+    def __init__(self, names, load_factor_threshold=0.50, owner=False):
+        """Attach to existing shards.
+
+        :param names: shared memory block names, one per shard
+        :param owner: whether this handle unlinks the blocks on exit
+        """
+        self._names = list(names)
+        self._load_factor_threshold = load_factor_threshold
+        self._owner = owner
+        # identifies this set of shards to the workers' caches, and
+        # counts the insert_many calls that replaced blocks
+        self._token = uuid.uuid4().hex
+        self._generation = 0
+        # every handle has attachments of its own, so closing one handle
+        # never pulls the blocks out from under another
+        self._attached = {}
+        for name in self._names:
+            self._attached[name] = _open(name)
+
+    @classmethod
+    def from_iterable(cls, keys, values=None, shards=4, executor=None,
+                      load_factor_threshold=0.50):
+        """Build a sharded table from keys (and parallel values).
+
+        The shards are packed in parallel if an executor is given. The
+        returned handle owns the new blocks.
+        """
+        if shards < 1:
+            raise ValueError("Need at least one shard.")
+        groups = _route(keys, values, shards)
+        packed = _map(executor, _pack_shard, groups,
+                      [load_factor_threshold] * shards)
+        blocks = [_create_block(data) for data in packed]
+        try:
+            return cls([shm.name for shm in blocks], load_factor_threshold,
+                       owner=True)
+        finally:
+            for shm in blocks:
+                shm.close()
+
+    def __reduce__(self):
+        # worker processes get a non-owning handle to the same blocks
+        return (_restore, (self._names, self._load_factor_threshold,
+                           self._token, self._generation))
+
+    @property
+    def names(self):
+        """Names of the shared memory blocks, one per shard."""
+        return list(self._names)
+
+    def _table(self, i):
+        return self._attached[self._names[i]][1]
+
+    @property
+    def size(self):
+        return sum(self._table(i).size for i in range(len(self._names)))
+
+    def __len__(self):
+        return self.size
+
+    def _shard(self, k):
+        return self._table(_stable_hash(k) % len(self._names))
+
+    def __contains__(self, k):
+        k = _scalar(k)
+        return k in self._shard(k)
+
+    def get(self, k, default=None):
+        """Return the value stored for k, or default if it is absent."""
+        k = _scalar(k)
+        return self._shard(k).get(k, default)
+
+    def __getitem__(self, k):
+        k = _scalar(k)
+        return self._shard(k)[k]
+
+    def items(self):
+        """Iterate over the (key, value) pairs, shard by shard."""
+        for i in range(len(self._names)):
+            for pair in self._table(i).items():
+                yield pair
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+    def _group(self, keys):
+        """Split keys by shard, with their positions in the list."""
+        n = len(self._names)
+        positions = [[] for _ in range(n)]
+        groups = [[] for _ in range(n)]
+        for pos, k in enumerate(keys):
+            i = _stable_hash(k) % n
+            positions[i].append(pos)
+            groups[i].append(k)
+        return positions, groups
+
+    def _per_shard(self, fn, groups, executor):
+        """Results of fn(table, keys) for the keys of every shard.
+
+        With an executor every shard is a separate task, and the workers
+        attach to the blocks through their own cache.
+        """
+        n = len(self._names)
+        if executor is None:
+            return [fn(self._table(i), groups[i]) for i in range(n)]
+        spec = self._token, self._generation, self._names
+        return list(executor.map(_run_on_shard, [fn] * n, [spec] * n,
+                                 range(n), groups))
+
+    def get_many(self, keys, default=None, executor=None):
+        """Return the values of keys, with default for missing ones.
+
+        keys may be a NumPy array. With an executor, the keys of each
+        shard are looked up by a separate task.
+        """
+        keys = list(_unwrap(keys))
+        positions, groups = self._group(keys)
+        res = [default] * len(keys)
+        found = self._per_shard(_lookup_shard, groups, executor)
+        for shard_positions, (flags, values) in zip(positions, found):
+            for pos, flag, value in zip(shard_positions, flags, values):
+                if flag:
+                    res[pos] = value
+        return res
+
+    def contains_many(self, keys, executor=None):
+        """Return a list of bools telling which keys are present, or a
+        NumPy array of them if keys is an array.
+        """
+        unwrapped = list(_unwrap(keys))
+        positions, groups = self._group(unwrapped)
+        res = [False] * len(unwrapped)
+        found = self._per_shard(_contains_shard, groups, executor)
+        for shard_positions, flags in zip(positions, found):
+            for pos, flag in zip(shard_positions, flags):
+                res[pos] = flag
+        return _wrap(res, keys)
+
+    def insert_many(self, keys, values=None, executor=None):
+        """Insert keys (and parallel values), replacing touched shards.
+
+        Each touched shard is repacked with its new entries, in parallel
+        if an executor is given, and swapped for a new block. Only an
+        owning handle unlinks the blocks it replaces; other handles keep
+        seeing the shards as they were when they were created, as long
+        as they look them up in their own process.
+        """
+        groups = _route(keys, values, len(self._names))
+        touched = [i for i, pairs in enumerate(groups) if pairs]
+        if not touched:
+            return
+        packed = _map(executor, _repack_shard,
+                      [self._names[i] for i in touched],
+                      [groups[i] for i in touched],
+                      [self._load_factor_threshold] * len(touched))
+        for i, data in zip(touched, packed):
+            old = self._names[i]
+            shm = _create_block(data)
+            self._attached[shm.name] = (shm,
+                                        MappedHashTable.from_buffer(shm.buf))
+            self._names[i] = shm.name
+            self._release(old)
+        if not self._owner:
+            # the shards have diverged from the owner's
+            self._token = uuid.uuid4().hex
+        self._generation += 1
+
+    def _release(self, name):
+        attachment = self._attached.pop(name)
+        _close(attachment)
+        if self._owner:
+            attachment[0].unlink()
+
+    def close(self):
+        """Detach from the shards, unlinking them if this is the owner.
+
+        Worker processes detach from unlinked shards at their next task.
+        """
+        for name in self._names:
+            self._release(name)
+        self._names = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        # detach, without unlinking, handles that were never closed, such
+        # as ones unpickled by a worker
+        for attachment in getattr(self, '_attached', {}).values():
+            _close(attachment)
+
+
+def _scalar(k):
+    """Turn a NumPy scalar into the Python value it holds."""
+    if np is not None and isinstance(k, np.generic):
+        return k.item()
+    return k
+
+
+def _route(keys, values, n):
+    """Split keys and values, which may be NumPy arrays, into per-shard
+    lists of pairs.
+    """
+    groups = [[] for _ in range(n)]
+    keys = _unwrap(keys)
+    if values is None:
+        for k in keys:
+            groups[_stable_hash(k) % n].append((k, None))
+    else:
+        for k, v in zip(keys, _unwrap(values)):
+            groups[_stable_hash(k) % n].append((k, v))
+    return groups
+
+
+def _map(executor, fn, *iterables):
+    if executor is None:
+        return list(map(fn, *iterables))
+    return list(executor.map(fn, *iterables))
+
+
+def _create_block(data):
+    """Copy snapshot bytes into a new shared memory block."""
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    shm.buf[:len(data)] = data
+    return shm
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+from itertools import islice
+
+
+class Chunk(object):
+    """A list node holding up to chunk_size consecutive items."""
+
+    __slots__ = ('vals', 'prev', 'next')
+
+    def __init__(self, vals, prev=None, next=None):
+        self.vals = vals
+        self.prev = prev
+        self.next = next
+
+
+class UnrolledLinkedList(object):
+    """Doubly linked list of chunks of items.
+
+    Storing up to ``chunk_size`` items per node cuts the per-item memory
+    from a whole node to a list slot, and lets iteration, membership
+    tests and slicing run over each chunk at C speed. Positional access
+    walks chunks instead of items, from whichever end is closer.
+
+    Chunks are split in half when an insert overflows them. When a
+    removal leaves one less than half full, it is merged with a
+    neighbour if both fit into one chunk, or else takes items over from
+    the next one, so every chunk but the ends stays at least half full.
+    """
+
+    def __init__(self, lst=None, chunk_size=64):
+        """Construct a new list, optionally from an iterable of items."""
+        if chunk_size < 2:
+            raise ValueError("chunk_size must be at least 2.")
+        self._chunk_size = chunk_size
+        self._head = None
+        self._tail = None
+        self._size = 0
+        if lst is not None:
+            self.extend(lst)
+
+    def __str__(self):
+        return "[{}]".format(", ".join(str(item) for item in self))
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def clear(self):
+        """Empty the list."""
+        self._head = self._tail = None
+        self._size = 0
+
+    def _append_chunk(self, vals):
+        chunk = Chunk(vals, prev=self._tail)
+        if self._tail is None:  # empty list
+            self._head = chunk
+        else:
+            self._tail.next = chunk
+        self._tail = chunk
+        return chunk
+
+    def _unlink_chunk(self, chunk):
+        pred = chunk.prev
+        succ = chunk.next
+        if pred is None:  # at head
+            self._head = succ
+        else:
+            pred.next = succ
+        if succ is None:  # at tail
+            self._tail = pred
+        else:
+            succ.prev = pred
+
+    def extend(self, items):
+        """Append every item of an iterable, filling whole chunks at once."""
+        items = list(items)
+        n = self._chunk_size
+        i = 0
+        if self._tail is not None:
+            # top up the last chunk first
+            i = n - len(self._tail.vals)
+            self._tail.vals.extend(items[:i])
+        while i < len(items):
+            self._append_chunk(items[i:i + n])
+            i += n
+        self._size += len(items)
+
+    def push(self, val):
+        """Append an item to the end of the list."""
+        tail = self._tail
+        if tail is None or len(tail.vals) == self._chunk_size:
+            self._append_chunk([val])
+        else:
+            tail.vals.append(val)
+        self._size += 1
+
+    def shift(self, val):
+        """Append an item to the front of the list."""
+        head = self._head
+        if head is None:
+            self._append_chunk([val])
+        elif len(head.vals) == self._chunk_size:
+            chunk = Chunk([val], next=head)
+            head.prev = chunk
+            self._head = chunk
+        else:
+            head.vals.insert(0, val)
+        self._size += 1
+
+    def pop(self):
+        """Remove and return the last item from the list."""
+        return self.remove(self.size - 1)
+
+    def unshift(self):
+        """Remove and return the first item from the list."""
+        return self.remove(0)
+
+    def _get_chunk_at(self, pos):
+        """Return (chunk, offset) of the item at a certain position.
+
+        Given n items, the algorithmic runtime is O(n / chunk_size).
+        """
+        if pos < self.size / 2:
+            chunk = self._head
+            while pos >= len(chunk.vals):
+                pos -= len(chunk.vals)
+                chunk = chunk.next
+        else:
+            pos = self.size - 1 - pos
+            chunk = self._tail
+            while pos >= len(chunk.vals):
+                pos -= len(chunk.vals)
+                chunk = chunk.prev
+            pos = len(chunk.vals) - 1 - pos
+        return chunk, pos
+
+    def insert(self, pos, val):
+        """Insert an item at a certain position in the list."""
+        if (pos < 0 or pos > self.size):
+            raise IndexError("Out of bounds.")
+        if pos == self.size:
+            self.push(val)
+            return
+        chunk, i = self._get_chunk_at(pos)
+        chunk.vals.insert(i, val)
+        if len(chunk.vals) > self._chunk_size:
+            # split the overflowing chunk in half
+            half = len(chunk.vals) // 2
+            new = Chunk(chunk.vals[half:], prev=chunk, next=chunk.next)
+            del chunk.vals[half:]
+            if chunk.next is None:
+                self._tail = new
+            else:
+                chunk.next.prev = new
+            chunk.next = new
+        self._size += 1
+
+    def remove(self, pos):
+        """Remove and return an item at a certain position from the list."""
+        if (pos < 0 or pos >= self.size):
+            raise IndexError("Out of bounds.")
+        chunk, i = self._get_chunk_at(pos)
+        val = chunk.vals.pop(i)
+        self._size -= 1
+        if not chunk.vals:
+            self._unlink_chunk(chunk)
+        elif len(chunk.vals) < self._chunk_size // 2:
+            # merge into a neighbour if both fit into one chunk
+            for pred, succ in ((chunk.prev, chunk), (chunk, chunk.next)):
+                if pred is not None and succ is not None and \
+                        len(pred.vals) + len(succ.vals) <= self._chunk_size:
+                    pred.vals.extend(succ.vals)
+                    self._unlink_chunk(succ)
+                    break
+            else:
+                succ = chunk.next
+                if chunk.prev is not None and succ is not None:
+                    # both neighbours are too full to merge with, so
+                    # even out the items with the next one instead
+                    k = (len(succ.vals) - len(chunk.vals)) // 2
+                    chunk.vals.extend(succ.vals[:k])
+                    del succ.vals[:k]
+        return val
+
+    def __delitem__(self, pos):
+        self.remove(pos)
+
+    def get(self, pos):
+        """Return an item at a certain position in the list."""
+        if (pos < 0 or pos >= self.size):
+            raise IndexError("Out of bounds.")
+        chunk, i = self._get_chunk_at(pos)
+        return chunk.vals[i]
+
+    def set(self, pos, val):
+        """Set a new value for an item at a certain position in the list."""
+        if (pos < 0 or pos >= self.size):
+            raise IndexError("Out of bounds.")
+        chunk, i = self._get_chunk_at(pos)
+        chunk.vals[i] = val
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self.get(key)
+        elif isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            res = UnrolledLinkedList(chunk_size=self._chunk_size)
+            if step > 0 and start < stop:
+                items = self._iter_from(start, forward=True)
+                res.extend(islice(items, 0, stop - start, step))
+            elif step < 0 and start > stop:
+                items = self._iter_from(start, forward=False)
+                res.extend(islice(items, 0, start - stop, -step))
+            return res
+        else:
+            raise TypeError('Index must be int or slice')
+
+    def __setitem__(self, key, value):
+        if isinstance(key, int):
+            self.set(key, value)
+        else:
+            raise TypeError('Index must be int')
+
+    def _iter_from(self, pos, forward):
+        """Iterate from a position towards the end or the front."""
+        chunk, i = self._get_chunk_at(pos)
+        if forward:
+            for val in islice(chunk.vals, i, None):
+                yield val
+            chunk = chunk.next
+            while chunk is not None:
+                for val in chunk.vals:
+                    yield val
+                chunk = chunk.next
+        else:
+            for val in reversed(chunk.vals[:i + 1]):
+                yield val
+            chunk = chunk.prev
+            while chunk is not None:
+                for val in reversed(chunk.vals):
+                    yield val
+                chunk = chunk.prev
+
+    def __iter__(self):
+        chunk = self._head
+        while chunk is not None:
+            for val in chunk.vals:
+                yield val
+            chunk = chunk.next
+
+    def __reversed__(self):
+        chunk = self._tail
+        while chunk is not None:
+            for val in reversed(chunk.vals):
+                yield val
+            chunk = chunk.prev
+
+    def __contains__(self, value):
+        """Check whether an item is in the list, one chunk at a time."""
+        chunk = self._head
+        while chunk is not None:
+            if value in chunk.vals:
+                return True
+            chunk = chunk.next
+        return False
+
+    def __eq__(self, other):
+        """Check whether all values in the two lists are equal."""
+        if self is other:
+            return True
+        elif len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def clone(self):
+        """Copy the list, chunk by chunk."""
+        res = UnrolledLinkedList(chunk_size=self._chunk_size)
+        chunk = self._head
+        while chunk is not None:
+            res._append_chunk(list(chunk.vals))
+            chunk = chunk.next
+        res._size = self._size
+        return res
+
+    def __add__(self, other):
+        """Returns a new list by appending another list to the end."""
+        if not isinstance(other, UnrolledLinkedList):
+            raise TypeError
+        res = self.clone()
+        res.extend(other)
+        return res
+
+    def __nonzero__(self):
+        return not self.is_empty()
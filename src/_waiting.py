@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Waiting helpers shared by the blocking and async queues."""
+
+import asyncio
+
+from .DoublyLinkedList import DoublyLinkedList
+
+
+def wait(cond, ready, block, timeout, error):
+    """Wait on cond until ready() holds, or raise error if not blocking or
+    on timeout; called with the lock of cond held.
+    """
+    if not ready():
+        if not block or not cond.wait_for(ready, timeout):
+            raise error
+
+
+class AsyncWaiters(object):
+    """Coroutines of one event loop waiting for a condition.
+
+    Each waiter is a future in a DoublyLinkedList, and wake resolves the
+    first one that is still pending, so waiters are served in order.
+    """
+
+    def __init__(self):
+        self._futures = DoublyLinkedList()
+
+    def __len__(self):
+        return len(self._futures)
+
+    def wake(self):
+        """Wake the first waiter that is still waiting."""
+        node = self._futures.head
+        while node is not None:
+            if not node.val.done():
+                node.val.set_result(None)
+                return
+            node = node.next
+
+    async def wait(self, ready, timeout=None):
+        """Wait until ready() holds, for at most timeout seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not ready():
+            fut = loop.create_future()
+            node = self._futures.push(fut)
+            try:
+                if deadline is None:
+                    await fut
+                else:
+                    await asyncio.wait_for(fut, deadline - loop.time())
+            except BaseException:
+                self._futures.remove_node(node)
+                if fut.done() and not fut.cancelled():
+                    # woken but leaving, so pass the wakeup on
+                    self.wake()
+                raise
+            self._futures.remove_node(node)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import random
 import unittest
 
 from src.BinarySearchTree import BinarySearchTree, Node
@@ -77,20 +78,77 @@ class AVLNodeTest(unittest.TestCase):
 
 class AVLTreeTest(unittest.TestCase):
 
-    def setUp(self):
-        pass
-
-    def tearDown(self):
-        pass
+    def assertAVL(self, tree, keys):
+        """Check the keys, links, heights, sizes and balance of a tree."""
+        self.assertListEqual([node.key for node in tree], keys)
+        self.assertEqual(len(tree), len(keys))
+        if tree._root is not None:
+            self.assertIsNone(tree._root.parent)
+            self.assertEqual(tree._root.get_size(), len(keys))
+        for node in tree:
+            hl = AVLTree.get_node_height(node.left)
+            hr = AVLTree.get_node_height(node.right)
+            self.assertLessEqual(abs(hl - hr), 1)
+            self.assertEqual(node.get_height(), max(hl, hr) + 1)
+            size = 1
+            for child in (node.left, node.right):
+                if child is not None:
+                    self.assertIs(child.parent, node)
+                    size += child.get_size()
+            self.assertEqual(node.get_size(), size)
 
     def test_insert(self):
-        pass
+        avl = AVLTree()
+        for k in range(1000):
+            avl.insert(k, str(k))
+        self.assertAVL(avl, list(range(1000)))
+        # increasing keys can't make the tree taller than a balanced one
+        self.assertEqual(avl._root.get_height(), 10)
+        avl.insert(500, 'x')
+        self.assertEqual(avl.get(500), 'x')
+        self.assertEqual(len(avl), 1000)
 
     def test_remove(self):
-        pass
+        rnd = random.Random(0)
+        keys = list(range(500))
+        rnd.shuffle(keys)
+        avl = AVLTree((k, k) for k in keys)
+        self.assertAVL(avl, list(range(500)))
+        for k in keys[:400]:
+            avl.remove(k)
+        self.assertAVL(avl, sorted(keys[400:]))
+        with self.assertRaises(KeyError):
+            avl.remove(keys[0])
+        for k in keys[400:]:
+            avl.remove(k)
+        self.assertAVL(avl, [])
+
+    def test_remove_keeps_handles(self):
+        avl = AVLTree.from_sorted((k, str(k)) for k in range(200))
+        handles = dict((node.key, node) for node in avl)
+        # the root and inner nodes have two children
+        for k in [avl._root.key] + list(range(1, 200, 4)):
+            avl.remove(k)
+            del handles[k]
+        self.assertAVL(avl, sorted(handles))
+        for k, node in handles.items():
+            self.assertIs(avl._find(k), node)
+            self.assertEqual(node.value, str(k))
 
     def test_balance_node(self):
-        pass
+        n_1 = AVLNode(1, '', parent=None)
+        n_3 = AVLNode(3, '', parent=n_1)
+        n_2 = AVLNode(2, '', parent=n_3)
+        n_1.set_right(n_3)
+        n_3.set_left(n_2)
+        n_3._refresh()
+        # right subtree's left subtree is higher: a double rotation
+        p = AVLTree.balance_node(n_1)
+        self.assertIs(p, n_2)
+        self.assertIsNone(p.parent)
+        self.assertEqual((p.left.key, p.key, p.right.key), (1, 2, 3))
+        self.assertEqual(p.get_height(), 2)
+        self.assertIs(AVLTree.balance_node(p), p)
 
     def test_rotate_node_left_at_root(self):
         bst = BinarySearchTree([
@@ -117,7 +175,61 @@ class AVLTreeTest(unittest.TestCase):
         self.assertEqual(q.key, 4)
 
     def test_rotate_node_left_at_nonroot(self):
-        pass
+        bst = BinarySearchTree([(4, ''), (2, ''), (6, ''), (5, ''),
+                                (7, '')])
+        q = AVLNode.cast_from_node(bst._root)
+        p = AVLTree.rotate_node_left(q.right)
+        self.assertEqual(p.key, 7)
+        self.assertIs(q.right, p)
+        self.assertIs(p.parent, q)
+        self.assertEqual(p.left.key, 6)
+        self.assertEqual(p.left.left.key, 5)
+        self.assertEqual(q.right.get_size(), 3)
 
     def test_rotate_node_right_at_nonroot(self):
-        pass
+        bst = BinarySearchTree([(4, ''), (2, ''), (6, ''), (1, ''),
+                                (3, '')])
+        q = AVLNode.cast_from_node(bst._root)
+        p = AVLTree.rotate_node_right(q.left)
+        self.assertEqual(p.key, 1)
+        self.assertIs(q.left, p)
+        self.assertIs(p.parent, q)
+        self.assertEqual(p.right.key, 2)
+        self.assertEqual(p.right.right.key, 3)
+
+    def test_from_sorted_and_bst(self):
+        avl = AVLTree.from_sorted((k, -k) for k in range(100))
+        self.assertAVL(avl, list(range(100)))
+        self.assertEqual(avl.get(42), -42)
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([(1, ''), (1, '')])
+        # a path-shaped tree comes out balanced
+        bst = BinarySearchTree((k, '') for k in range(100))
+        avl = AVLTree.from_bst(bst)
+        self.assertIsInstance(avl, AVLTree)
+        self.assertAVL(avl, list(range(100)))
+        self.assertEqual(avl._root.get_height(), 7)
+
+    def test_split_and_join(self):
+        rnd = random.Random(1)
+        for _ in range(50):
+            keys = sorted(rnd.sample(range(1000), rnd.randrange(100)))
+            at = rnd.randrange(-1, 1001)
+            avl = AVLTree.from_sorted((k, '') for k in keys)
+            right = avl.split(at)
+            self.assertAVL(avl, [k for k in keys if k < at])
+            self.assertAVL(right, [k for k in keys if k >= at])
+            avl.join(right)
+            self.assertAVL(avl, keys)
+            self.assertAVL(right, [])
+        # trees of very different heights
+        small = AVLTree.from_sorted([(0, '')])
+        big = AVLTree.from_sorted((k, '') for k in range(1, 200))
+        small.join(big)
+        self.assertAVL(small, list(range(200)))
+        with self.assertRaises(ValueError):
+            small.join(AVLTree([(5, '')]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import random
+import unittest
+
+from src.BinaryHeap import BinaryHeap
+
+
+class BinaryHeapTest(unittest.TestCase):
+
+    def drain(self, heap):
+        res = []
+        while not heap.is_empty():
+            res.append(heap.delete_min())
+        return res
+
+    def assertHeap(self, heap):
+        """Check that no child comes before its parent."""
+        keys = heap._keys
+        for i in range(1, heap.size):
+            self.assertFalse(heap._lt(keys[i], keys[heap._parent(i)]))
+
+    def test_insert_delete_min(self):
+        rnd = random.Random(0)
+        items = [rnd.randrange(1000) for _ in range(500)]
+        for d in (2, 4, 8):
+            heap = BinaryHeap(d=d)
+            for item in items:
+                heap.insert(item)
+            self.assertHeap(heap)
+            self.assertEqual(heap.peek_min(), min(items))
+            self.assertEqual(self.drain(heap), sorted(items))
+
+    def test_key_and_reverse(self):
+        items = ['ccc', 'a', 'bb', 'dddd']
+        self.assertEqual(self.drain(BinaryHeap(items, key=len)),
+                         ['a', 'bb', 'ccc', 'dddd'])
+        self.assertEqual(self.drain(BinaryHeap(items, d=4, reverse=True)),
+                         ['dddd', 'ccc', 'bb', 'a'])
+        by_last = functools.cmp_to_key(lambda a, b: ord(a[-1]) - ord(b[-1]))
+        self.assertEqual(self.drain(BinaryHeap(items, key=by_last)),
+                         ['a', 'bb', 'ccc', 'dddd'])
+
+    def test_heapify(self):
+        rnd = random.Random(1)
+        items = [rnd.random() for _ in range(1000)]
+        heap = BinaryHeap(items[:10], d=4)
+        heap.heapify(items[10:])
+        self.assertHeap(heap)
+        self.assertEqual(heap.size, 1000)
+        self.assertEqual(self.drain(heap), sorted(items))
+
+    def test_pushpop_and_replace(self):
+        heap = BinaryHeap([3, 5, 7])
+        self.assertEqual(heap.pushpop(1), 1)
+        self.assertEqual(heap.pushpop(4), 3)
+        self.assertEqual(heap.replace(1), 4)
+        self.assertEqual(self.drain(heap), [1, 5, 7])
+        self.assertEqual(heap.pushpop(2), 2)
+        with self.assertRaises(IndexError):
+            heap.replace(2)
+
+    def test_max(self):
+        heap = BinaryHeap(range(20), d=3)
+        self.assertEqual(heap.peek_max(), 19)
+        self.assertEqual(heap.remove_max(), 19)
+        self.assertEqual(heap.remove_max(), 18)
+        self.assertHeap(heap)
+        self.assertEqual(self.drain(heap), list(range(18)))
+
+    def test_errors(self):
+        heap = BinaryHeap()
+        for op in (heap.peek_min, heap.delete_min, heap.peek_max,
+                   heap.remove_max):
+            with self.assertRaises(IndexError):
+                op()
+        with self.assertRaises(ValueError):
+            BinaryHeap(d=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import random
 import unittest
 
 from src.BinarySearchTree import BinarySearchTree
@@ -78,6 +79,101 @@ class BinarySearchTreeTest(unittest.TestCase):
         self.assertEqual(bst.size, 7)
         self.assertListEqual([el.get_key() for el in bst], sorted(lst))
 
+    def test_insert_update_keeps_size(self):
+        bst = BinarySearchTree([(5, 'e'), (3, 'c')])
+        bst.insert(5, 'f')
+        bst.insert(3, 'd')
+        self.assertEqual(bst.size, 2)
+
+    def test_get_many(self):
+        rnd = random.Random(0)
+        keys = rnd.sample(range(10000), 1000)
+        bst = BinarySearchTree((k, str(k)) for k in keys)
+        self.assertEqual(len(bst), 1000)
+        for k in keys:
+            self.assertEqual(bst.get(k), str(k))
+            self.assertIn(k, bst)
+        self.assertNotIn(-1, bst)
+        self.assertListEqual([node.key for node in BinarySearchTree(bst)],
+                             sorted(keys))
+
+    def test_remove(self):
+        bst = BinarySearchTree([(k, '') for k in (4, 2, 6, 1, 3, 5, 7, 8)])
+        bst.remove(1)  # leaf
+        bst.remove(7)  # one child
+        bst.remove(2)  # one child, on the left
+        bst.remove(4)  # two children, at the root
+        self.assertEqual(bst._root.key, 5)
+        self.assertIsNone(bst._root.parent)
+        self.assertListEqual([node.key for node in bst], [3, 5, 6, 8])
+        self.assertEqual(bst.size, 4)
+        with self.assertRaises(KeyError):
+            bst.remove(4)
+        for k in (5, 3, 8, 6):
+            bst.remove(k)
+        self.assertTrue(bst.is_empty())
+        self.assertIsNone(bst._root)
+        self.assertListEqual(list(bst), [])
+
+    def test_remove_random(self):
+        rnd = random.Random(1)
+        keys = list(range(500))
+        rnd.shuffle(keys)
+        bst = BinarySearchTree((k, k) for k in keys)
+        removed = keys[::2]
+        for k in removed:
+            bst.remove(k)
+        remaining = sorted(keys[1::2])
+        self.assertListEqual([node.key for node in bst], remaining)
+        for node in bst:
+            for child in (node.left, node.right):
+                if child is not None:
+                    self.assertIs(child.parent, node)
+        self.assertEqual(bst.size, len(remaining))
+
+    def test_degenerate(self):
+        # sorted keys make a path, which must not hit the recursion limit
+        n = 3000
+        bst = BinarySearchTree((k, k) for k in range(n))
+        self.assertEqual(bst._root.get_max_depth(), n)
+        self.assertEqual(bst.get(n - 1), n - 1)
+        bst.remove(0)
+        self.assertEqual(len(list(bst)), n - 1)
+        bst.clear()
+        self.assertTrue(bst.is_empty())
+
+    def test_remove_keeps_handles(self):
+        rnd = random.Random(2)
+        keys = list(range(300))
+        rnd.shuffle(keys)
+        bst = BinarySearchTree((k, str(k)) for k in keys)
+        handles = dict((node.key, node) for node in bst)
+        for k in keys[:150]:
+            node = handles.pop(k)
+            bst.remove(k)
+            # the removed node is detached instead of taking another key
+            self.assertEqual(node.key, k)
+            self.assertIsNone(node.parent)
+        self.assertListEqual([node.key for node in bst], sorted(handles))
+        for node in bst:
+            self.assertIs(handles[node.key], node)
+            self.assertEqual(node.value, str(node.key))
+            for child in (node.left, node.right):
+                if child is not None:
+                    self.assertIs(child.parent, node)
+
+    def test_nodes_compare_by_identity(self):
+        # equal-shaped trees must not be compared node by node, which
+        # recursed through the parent pointers without end
+        a = BinarySearchTree((k, k) for k in range(3000))
+        b = BinarySearchTree((k, k) for k in range(3000))
+        self.assertNotEqual(a._root, b._root)
+        self.assertEqual(a._root, a._root)
+        nodes = set(a)
+        self.assertEqual(len(nodes), 3000)
+        self.assertIn(a._find(1500), nodes)
+        self.assertNotIn(b._find(1500), nodes)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import queue
+import threading
+import unittest
+
+from src.BlockingDeque import AsyncDeque, BlockingDeque
+
+
+class BlockingDequeTest(unittest.TestCase):
+
+    def test_ends(self):
+        dq = BlockingDeque()
+        dq.put(1)
+        dq.put(2)
+        dq.put_front(0)
+        self.assertEqual(len(dq), 3)
+        self.assertEqual(dq.get_back(), 2)
+        self.assertEqual(dq.get(), 0)
+        self.assertEqual(dq.get_many(5), [1])
+        self.assertTrue(dq.is_empty())
+
+    def test_bounds_and_timeouts(self):
+        dq = BlockingDeque(capacity=2)
+        dq.put(0)
+        dq.put(1)
+        self.assertTrue(dq.is_full())
+        with self.assertRaises(queue.Full):
+            dq.put(2, block=False)
+        with self.assertRaises(queue.Full):
+            dq.put(2, timeout=0.01)
+        self.assertEqual(dq.get_many(2), [0, 1])
+        with self.assertRaises(queue.Empty):
+            dq.get(block=False)
+        with self.assertRaises(queue.Empty):
+            dq.get_many(3, timeout=0.01)
+        with self.assertRaises(ValueError):
+            BlockingDeque(capacity=0)
+
+    def test_producers_and_consumers(self):
+        dq = BlockingDeque(capacity=8)
+        n_producers = 4
+        per_producer = 500
+        received = []
+        lock = threading.Lock()
+
+        def produce(p):
+            for i in range(per_producer):
+                dq.put((p, i))
+
+        def consume():
+            while True:
+                vals = dq.get_many(16)
+                with lock:
+                    received.extend(v for v in vals if v is not None)
+                if None in vals:
+                    # hand the other consumers' end markers back
+                    for _ in range(vals.count(None) - 1):
+                        dq.put(None)
+                    return
+
+        producers = [threading.Thread(target=produce, args=(p,))
+                     for p in range(n_producers)]
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        for t in producers + consumers:
+            t.start()
+        for t in producers:
+            t.join()
+        for _ in consumers:
+            dq.put(None)
+        for t in consumers:
+            t.join()
+        self.assertEqual(sorted(received),
+                         [(p, i) for p in range(n_producers)
+                          for i in range(per_producer)])
+
+
+class AsyncDequeTest(unittest.TestCase):
+
+    def test_nowait(self):
+        dq = AsyncDeque(capacity=2)
+        dq.put_nowait(1)
+        dq.put_nowait(0, front=True)
+        with self.assertRaises(asyncio.QueueFull):
+            dq.put_nowait(2)
+        self.assertEqual(dq.get_nowait(back=True), 1)
+        self.assertEqual(dq.get_many_nowait(3), [0])
+        with self.assertRaises(asyncio.QueueEmpty):
+            dq.get_nowait()
+
+    def test_producers_and_consumers(self):
+        async def run():
+            dq = AsyncDeque(capacity=4)
+            received = []
+
+            async def produce(p):
+                for i in range(100):
+                    await dq.put((p, i))
+
+            async def consume():
+                while True:
+                    vals = await dq.get_many(8)
+                    received.extend(v for v in vals if v is not None)
+                    if None in vals:
+                        for _ in range(vals.count(None) - 1):
+                            await dq.put(None)
+                        return
+
+            consumers = [asyncio.ensure_future(consume()) for _ in range(3)]
+            await asyncio.gather(*[produce(p) for p in range(5)])
+            for _ in consumers:
+                await dq.put(None)
+            await asyncio.gather(*consumers)
+            return received
+
+        received = asyncio.run(run())
+        self.assertEqual(sorted(received),
+                         [(p, i) for p in range(5) for i in range(100)])
+
+    def test_timeouts(self):
+        async def run():
+            dq = AsyncDeque(capacity=1)
+            with self.assertRaises(asyncio.TimeoutError):
+                await dq.get(timeout=0.01)
+            await dq.put_front('a')
+            with self.assertRaises(asyncio.TimeoutError):
+                await dq.put('b', timeout=0.01)
+            # the timed out waiters are gone, and the next ones still work
+            self.assertEqual(len(dq._getters), 0)
+            self.assertEqual(len(dq._putters), 0)
+            getter = asyncio.ensure_future(dq.put('c'))
+            self.assertEqual(await dq.get_back(), 'a')
+            await getter
+            self.assertEqual(await dq.get(timeout=1), 'c')
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
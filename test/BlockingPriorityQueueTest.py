@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import queue
+import threading
+import time
+import unittest
+
+from src.BlockingPriorityQueue import (AsyncPriorityQueue,
+                                       BlockingPriorityQueue, DelayQueue)
+from src.PriorityQueue import PAIRING_HEAP
+
+
+class BlockingPriorityQueueTest(unittest.TestCase):
+
+    def test_order(self):
+        pq = BlockingPriorityQueue()
+        for el, priority in [('a', 2), ('b', 5), ('c', 1)]:
+            pq.put(el, priority)
+        pq.update_priority('c', 9)
+        self.assertIn('a', pq)
+        self.assertEqual(pq.peek(), 'c')
+        self.assertEqual([pq.get() for _ in range(3)], ['c', 'b', 'a'])
+        with self.assertRaises(queue.Empty):
+            pq.peek()
+
+    def test_bounds_and_timeouts(self):
+        pq = BlockingPriorityQueue(backend=PAIRING_HEAP, capacity=2)
+        pq.put('a', 1)
+        pq.put('b', 2)
+        with self.assertRaises(queue.Full):
+            pq.put('c', 3, block=False)
+        with self.assertRaises(queue.Full):
+            pq.put('c', 3, timeout=0.01)
+        # already queued, so no room is needed
+        pq.put('a', 3, block=False)
+        self.assertEqual(pq.get_priority('a'), 3)
+        pq.remove('b')
+        pq.put('c', 0, block=False)
+        self.assertEqual(pq.get(), 'a')
+        self.assertEqual(pq.get(), 'c')
+        with self.assertRaises(queue.Empty):
+            pq.get(block=False)
+        with self.assertRaises(queue.Empty):
+            pq.get(timeout=0.01)
+        with self.assertRaises(ValueError):
+            BlockingPriorityQueue(capacity=0)
+
+    def test_producers_and_consumers(self):
+        pq = BlockingPriorityQueue(capacity=8)
+        received = []
+        lock = threading.Lock()
+
+        def produce(p):
+            for i in range(300):
+                pq.put((p, i), i)
+
+        def consume():
+            while True:
+                el = pq.get(timeout=5)
+                if el[0] is None:
+                    return
+                with lock:
+                    received.append(el)
+
+        producers = [threading.Thread(target=produce, args=(p,))
+                     for p in range(4)]
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        for t in producers + consumers:
+            t.start()
+        for t in producers:
+            t.join()
+        for c in range(len(consumers)):
+            # lowest priority, so served after everything else
+            pq.put((None, c), -1)
+        for t in consumers:
+            t.join()
+        self.assertEqual(sorted(received),
+                         [(p, i) for p in range(4) for i in range(300)])
+
+
+class AsyncPriorityQueueTest(unittest.TestCase):
+
+    def test_nowait(self):
+        pq = AsyncPriorityQueue(capacity=2)
+        pq.put_nowait('a', 1)
+        pq.put_nowait('b', 2)
+        with self.assertRaises(asyncio.QueueFull):
+            pq.put_nowait('c', 3)
+        pq.put_nowait('a', 3)
+        self.assertEqual(pq.peek(), 'a')
+        self.assertEqual(pq.get_nowait(), 'a')
+        pq.remove('b')
+        with self.assertRaises(asyncio.QueueEmpty):
+            pq.get_nowait()
+
+    def test_waiting(self):
+        async def run():
+            pq = AsyncPriorityQueue(capacity=1)
+            with self.assertRaises(asyncio.TimeoutError):
+                await pq.get(timeout=0.01)
+            getter = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            await pq.put('a', 1)
+            self.assertEqual(await getter, 'a')
+            await pq.put('b', 1)
+            putter = asyncio.ensure_future(pq.put('c', 2))
+            await asyncio.sleep(0)
+            self.assertFalse(putter.done())
+            self.assertEqual(await pq.get(), 'b')
+            await putter
+            self.assertEqual(await pq.get(timeout=1), 'c')
+            self.assertEqual(len(pq._getters), 0)
+            self.assertEqual(len(pq._putters), 0)
+
+        asyncio.run(run())
+
+
+class DelayQueueTest(unittest.TestCase):
+
+    def test_not_due(self):
+        now = [100.0]
+        dq = DelayQueue(clock=lambda: now[0])
+        dq.put('late', delay=10)
+        dq.put_at('early', 105)
+        dq.put('now')
+        self.assertEqual(dq.get_due_time('early'), 105)
+        self.assertEqual(dq.get(block=False), 'now')
+        with self.assertRaises(queue.Empty):
+            dq.get(block=False)
+        now[0] = 106.0
+        self.assertEqual(dq.get(block=False), 'early')
+        dq.reschedule('late', 0)
+        self.assertEqual(dq.get(block=False), 'late')
+
+    def test_waits_until_due(self):
+        dq = DelayQueue()
+        dq.put('b', delay=0.05)
+        dq.put('a', delay=0.02)
+        start = time.monotonic()
+        self.assertEqual(dq.get(timeout=1), 'a')
+        self.assertEqual(dq.get(timeout=1), 'b')
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        dq.put('c', delay=1)
+        with self.assertRaises(queue.Empty):
+            dq.get(timeout=0.01)
+
+    def test_earlier_put_wakes_getter(self):
+        dq = DelayQueue()
+        dq.put('later', delay=5)
+        received = []
+        getter = threading.Thread(target=lambda: received.append(dq.get()))
+        getter.start()
+        time.sleep(0.01)
+        dq.put('sooner', delay=0.01)
+        getter.join(timeout=2)
+        self.assertEqual(received, ['sooner'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.BoundedPriorityQueue import BoundedPriorityQueue, TopK
+
+
+class TopKTest(unittest.TestCase):
+
+    def test_offer(self):
+        top = TopK(3)
+        self.assertEqual([top.offer(x) for x in (5, 1, 7, 3, 0, 9)],
+                         [True, True, True, True, False, True])
+        self.assertTrue(top.is_full())
+        self.assertEqual(top.threshold(), 5)
+        self.assertEqual(top.to_list(), [9, 7, 5])
+        with self.assertRaises(ValueError):
+            TopK(0)
+
+    def test_key_and_reverse(self):
+        words = ['pear', 'fig', 'banana', 'kiwi', 'apple', 'plum']
+        top = TopK(2, words, key=len)
+        self.assertEqual(top.to_list(), ['banana', 'apple'])
+        bottom = TopK(2, iter(words), key=len, reverse=True)
+        self.assertEqual(bottom.to_list(), ['fig', 'pear'])
+
+    def test_offer_many_and_merge(self):
+        rnd = random.Random(0)
+        stream = [rnd.randrange(10 ** 6) for _ in range(5000)]
+        parts = [TopK(10, stream[i::4]) for i in range(4)]
+        merged = TopK(10)
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.to_list(), sorted(stream)[-10:][::-1])
+        smallest = TopK(10, stream, reverse=True)
+        self.assertEqual(smallest.to_list(), sorted(stream)[:10])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        rnd = np.random.RandomState(0)
+        top = TopK(5)
+        bottom = TopK(5, reverse=True)
+        chunks = [rnd.standard_normal(1000) for _ in range(5)]
+        for chunk in chunks:
+            top.offer_many(chunk)
+            bottom.offer_many(chunk)
+        values = sorted(np.concatenate(chunks).tolist())
+        self.assertEqual(top.to_list(), values[-5:][::-1])
+        self.assertEqual(bottom.to_list(), values[:5])
+        self.assertIs(type(top.threshold()), float)
+        # a short array when not yet full
+        small = TopK(5, np.arange(3))
+        self.assertEqual(small.to_list(), [2, 1, 0])
+
+
+class BoundedPriorityQueueTest(unittest.TestCase):
+
+    def test_eviction(self):
+        pq = BoundedPriorityQueue(3)
+        self.assertTrue(pq.insert('a', 1))
+        pq.batch_insert([('b', 5), ('c', 3)])
+        self.assertTrue(pq.is_full())
+        self.assertFalse(pq.offer('d', 0))
+        self.assertNotIn('d', pq)
+        self.assertTrue(pq.insert('e', 4))
+        self.assertNotIn('a', pq)
+        # already queued, so nothing is evicted
+        self.assertTrue(pq.insert('c', 0))
+        self.assertEqual(len(pq), 3)
+        self.assertEqual([pq.pop_highest_priority() for _ in range(3)],
+                         ['b', 'e', 'c'])
+        with self.assertRaises(ValueError):
+            BoundedPriorityQueue(0)
+
+    def test_meld(self):
+        a = BoundedPriorityQueue(3)
+        b = BoundedPriorityQueue(3)
+        a.batch_insert([(i, i) for i in range(5)])
+        b.batch_insert([(i, -i) for i in range(3, 8)])
+        a.meld(b)
+        self.assertTrue(b.is_empty())
+        # 3 and 4 take their priorities from b, and 5 can't beat them
+        self.assertEqual(a.get_priority(3), -3)
+        self.assertNotIn(5, a)
+        self.assertEqual([a.pop_highest_priority() for _ in range(3)],
+                         [2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
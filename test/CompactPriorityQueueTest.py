@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from src.CompactPriorityQueue import CompactPriorityQueue
+
+
+class CompactPriorityQueueTest(unittest.TestCase):
+
+    def test_order(self):
+        pq = CompactPriorityQueue()
+        for el, priority in (('b', 2), ('d', 4.5), ('a', -1), ('c', 3)):
+            pq.insert(el, priority)
+        self.assertEqual(len(pq), 4)
+        self.assertEqual(pq.peek_highest_priority(), 'd')
+        self.assertEqual(pq.pop_highest_priority(), 'd')
+        pq.remove_highest_priority()
+        self.assertEqual([pq.pop_highest_priority() for _ in range(2)],
+                         ['b', 'a'])
+        self.assertTrue(pq.is_empty())
+        with self.assertRaises(IndexError):
+            pq.pop_highest_priority()
+        with self.assertRaises(TypeError):
+            pq.insert('x', 'high')
+        self.assertTrue(pq.is_empty())
+
+    def test_fifo_among_equal_priorities(self):
+        rnd = random.Random(3)
+        pairs = [(i, rnd.randrange(5)) for i in range(300)]
+        expected = [el for el, _ in sorted(pairs, key=lambda p: -p[1])]
+        pq = CompactPriorityQueue()
+        for el, priority in pairs:
+            pq.insert(el, priority)
+        self.assertEqual([pq.pop_highest_priority() for _ in pairs],
+                         expected)
+        # a batch keeps the same order, whether heapified or sifted in
+        for head in (0, 290):
+            pq = CompactPriorityQueue(pairs[:head])
+            pq.batch_insert(iter(pairs[head:]))
+            self.assertEqual([pq.pop_highest_priority() for _ in pairs],
+                             expected)
+
+    def test_interleaved(self):
+        rnd = random.Random(0)
+        pq = CompactPriorityQueue()
+        queued = []
+        for i in range(1000):
+            priority = rnd.random()
+            pq.insert(i, priority)
+            queued.append((priority, -i))
+            if rnd.random() < 0.4:
+                queued.sort()
+                self.assertEqual(pq.pop_highest_priority(), -queued.pop()[1])
+        pq.clear()
+        self.assertTrue(pq.is_empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
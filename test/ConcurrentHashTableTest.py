@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+from src.ConcurrentHashTable import ConcurrentHashTable
+from src.HashTable import ROBIN_HOOD
+
+
+class ConcurrentHashTableTest(unittest.TestCase):
+
+    def test_basic_operations(self):
+        cht = ConcurrentHashTable(segments=4)
+        for i in range(100):
+            cht[i] = str(i)
+        self.assertEqual(cht.size, 100)
+        self.assertEqual(cht[42], '42')
+        self.assertIn(99, cht)
+        del cht[99]
+        self.assertNotIn(99, cht)
+        self.assertIsNone(cht.get(99))
+        with self.assertRaises(KeyError):
+            cht[99]
+        with self.assertRaises(KeyError):
+            cht.remove(99)
+        self.assertEqual(cht.setdefault(1, 'x'), '1')
+        self.assertEqual(cht.setdefault(100, 'x'), 'x')
+        self.assertEqual(sorted(cht), list(range(99)) + [100])
+
+    def test_invalid_segments(self):
+        with self.assertRaises(ValueError):
+            ConcurrentHashTable(segments=0)
+
+    def test_concurrent_writers_and_readers(self):
+        cht = ConcurrentHashTable(segments=8, method=ROBIN_HOOD,
+                                  incremental_resize=True)
+        n_writers = 4
+        per_writer = 2000
+        errors = []
+
+        def write(w):
+            for i in range(per_writer):
+                cht.insert((w, i), i)
+                if i % 2:
+                    cht.remove((w, i))
+
+        def read():
+            # even keys are never removed once written
+            for _ in range(5):
+                for w in range(n_writers):
+                    for i in range(0, per_writer, 50):
+                        value = cht.get((w, i))
+                        if value not in (None, i):
+                            errors.append(((w, i), value))
+
+        threads = [threading.Thread(target=write, args=(w,))
+                   for w in range(n_writers)]
+        threads += [threading.Thread(target=read) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(cht.size, n_writers * per_writer // 2)
+        for w in range(n_writers):
+            for i in range(per_writer):
+                self.assertEqual(cht.get((w, i)), None if i % 2 else i)
+
+
+if __name__ == '__main__':
+    unittest.main()
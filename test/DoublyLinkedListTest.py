@@ -1,54 +1,237 @@
 # -*- coding: utf-8 -*-
 
+import random
 import unittest
+from array import array
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-class DoublyLinkedListTest(unittest.TestSuite):
+from src.DoublyLinkedList import DoublyLinkedList
+
+
+class DoublyLinkedListTest(unittest.TestCase):
+
+    def assertLinked(self, dll, lst):
+        """Check the items in both directions and the size."""
+        self.assertEqual(list(dll), lst)
+        backwards = []
+        node = dll.tail
+        while node is not None:
+            backwards.append(node.val)
+            node = node.prev
+        self.assertEqual(backwards, lst[::-1])
+        self.assertEqual(dll.size, len(lst))
 
     def test_push(self):
-        pass
+        dll = DoublyLinkedList()
+        dll.push(1)
+        dll.push(2)
+        self.assertLinked(dll, [1, 2])
 
     def test_pop(self):
-        pass
+        dll = DoublyLinkedList([1, 2, 3])
+        self.assertEqual(dll.pop(), 3)
+        self.assertLinked(dll, [1, 2])
 
     def test_shift(self):
-        pass
+        dll = DoublyLinkedList()
+        dll.shift(1)
+        dll.shift(2)
+        self.assertLinked(dll, [2, 1])
 
     def test_unshift(self):
-        pass
+        dll = DoublyLinkedList([1, 2, 3])
+        self.assertEqual(dll.unshift(), 1)
+        self.assertLinked(dll, [2, 3])
 
     def test_insert(self):
-        pass
+        dll = DoublyLinkedList([1, 3])
+        dll.insert(1, 2)
+        dll.insert(0, 0)
+        dll.insert(4, 4)
+        self.assertLinked(dll, [0, 1, 2, 3, 4])
+        with self.assertRaises(IndexError):
+            dll.insert(6, 6)
 
     def test_remove(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2, 3])
+        self.assertEqual(dll.remove(1), 1)
+        self.assertEqual(dll.remove(2), 3)
+        self.assertLinked(dll, [0, 2])
+        with self.assertRaises(IndexError):
+            dll.remove(2)
 
     def test_get(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2, 3, 4])
+        self.assertEqual([dll.get(i) for i in range(5)], [0, 1, 2, 3, 4])
+        self.assertEqual(dll[3], 3)
+        with self.assertRaises(IndexError):
+            dll.get(5)
 
     def test_set(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2])
+        dll.set(1, 10)
+        self.assertLinked(dll, [0, 10, 2])
 
     def test_clone(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2])
+        clone = dll.clone()
+        clone.push(3)
+        self.assertLinked(dll, [0, 1, 2])
+        self.assertLinked(clone, [0, 1, 2, 3])
 
     def test_equality(self):
-        pass
+        self.assertEqual(DoublyLinkedList([1, 2]), DoublyLinkedList([1, 2]))
+        self.assertNotEqual(DoublyLinkedList([1, 2]), DoublyLinkedList([1]))
+        self.assertNotEqual(DoublyLinkedList([1, 2]),
+                            DoublyLinkedList([1, 3]))
 
     def test_contains(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2])
+        self.assertIn(2, dll)
+        self.assertNotIn(3, dll)
 
     def test_iter(self):
-        pass
+        self.assertEqual(list(DoublyLinkedList([0, 1, 2])), [0, 1, 2])
+        self.assertEqual(list(DoublyLinkedList()), [])
 
     def test_add(self):
-        pass
+        a = DoublyLinkedList([0, 1])
+        b = DoublyLinkedList([2])
+        self.assertLinked(a + b, [0, 1, 2])
+        self.assertLinked(a, [0, 1])
+        self.assertLinked(b, [2])
 
     def test_reversed(self):
-        pass
+        self.assertEqual(list(reversed(DoublyLinkedList([0, 1, 2]))),
+                         [2, 1, 0])
 
     def test_nonzero(self):
-        pass
+        self.assertFalse(DoublyLinkedList())
+        self.assertTrue(DoublyLinkedList([0]))
 
     def test_get_node_at(self):
-        pass
+        dll = DoublyLinkedList([0, 1, 2, 3, 4])
+        for i in range(5):
+            self.assertEqual(dll._get_node_at(i).val, i)
+
+    def test_handles(self):
+        dll = DoublyLinkedList()
+        b = dll.push('b')
+        a = dll.shift('a')
+        d = dll.push('d')
+        c = dll.insert_after(b, 'c')
+        self.assertLinked(dll, ['a', 'b', 'c', 'd'])
+        self.assertIs(dll.head, a)
+        self.assertIs(dll.tail, d)
+        self.assertEqual(len(set([a, b, c, d])), 4)
+
+        dll.move_to_front(c)
+        self.assertLinked(dll, ['c', 'a', 'b', 'd'])
+        dll.move_to_back(a)
+        self.assertLinked(dll, ['c', 'b', 'd', 'a'])
+        self.assertEqual(dll.remove_node(d), 'd')
+        self.assertLinked(dll, ['c', 'b', 'a'])
+        dll.insert_before(c, 'z')
+        self.assertLinked(dll, ['z', 'c', 'b', 'a'])
+
+    def test_splice(self):
+        dll = DoublyLinkedList([0, 3])
+        other = DoublyLinkedList([1, 2])
+        dll.splice(dll.head, other)
+        self.assertLinked(dll, [0, 1, 2, 3])
+        self.assertLinked(other, [])
+        dll.splice(None, DoublyLinkedList([-1]))
+        dll.splice(dll.tail, DoublyLinkedList([4]))
+        dll.splice(dll.tail, DoublyLinkedList())
+        self.assertLinked(dll, [-1, 0, 1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            dll.splice(None, dll)
+
+    def test_slice(self):
+        dll = DoublyLinkedList(list(range(10)))
+        self.assertLinked(dll[2:8:3], [2, 5])
+        self.assertLinked(dll[::-4], [9, 5, 1])
+        self.assertLinked(dll[5:2], [])
+
+    def test_view(self):
+        dll = DoublyLinkedList(list(range(10)))
+        view = dll.view(1, 9, 2)
+        self.assertEqual(list(view), [1, 3, 5, 7])
+        self.assertEqual(list(reversed(view)), [7, 5, 3, 1])
+        self.assertEqual(len(view), 4)
+        self.assertEqual(view[-1], 7)
+        self.assertEqual(list(view[::-2]), [7, 3])
+        self.assertIn(5, view)
+        self.assertNotIn(4, view)
+        self.assertEqual(list(dll.view(3, 3)), [])
+        dll.set(3, 30)
+        self.assertEqual(list(view), [1, 30, 5, 7])
+        self.assertLinked(view.to_list(), [1, 30, 5, 7])
+
+    def test_extend_from(self):
+        dll = DoublyLinkedList([0, 1])
+        other = DoublyLinkedList([2, 3])
+        node = other.head
+        dll.extend_from(other)
+        self.assertLinked(dll, [0, 1, 2, 3])
+        self.assertLinked(other, [])
+        self.assertIs(dll._get_node_at(2), node)
+
+    def test_iadd_and_mul(self):
+        dll = DoublyLinkedList([0, 1])
+        other = DoublyLinkedList([2])
+        dll += other
+        self.assertLinked(dll, [0, 1, 2])
+        self.assertLinked(other, [2])
+        self.assertLinked(other * 3, [2, 2, 2])
+        self.assertLinked(other * 0, [])
+
+    def test_from_iterable_and_buffer(self):
+        self.assertLinked(DoublyLinkedList.from_iterable(range(5)),
+                          [0, 1, 2, 3, 4])
+        self.assertLinked(DoublyLinkedList.from_iterable([]), [])
+        buf = array('d', [0.5, 1.5])
+        self.assertLinked(DoublyLinkedList.from_buffer(buf), [0.5, 1.5])
+        self.assertLinked(DoublyLinkedList.from_buffer(buf.tobytes(), 'd'),
+                          [0.5, 1.5])
+        dll = DoublyLinkedList([0])
+        dll.extend(iter([1, 2]))
+        self.assertLinked(dll, [0, 1, 2])
+
+    def test_to_array(self):
+        dll = DoublyLinkedList([3, 1, 2])
+        self.assertEqual(dll.to_array('q'), array('q', [3, 1, 2]))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        dll = DoublyLinkedList.from_iterable(np.arange(4))
+        self.assertLinked(dll, [0, 1, 2, 3])
+        self.assertIs(type(dll.head.val), int)
+        self.assertTrue((dll.to_numpy('int64') == np.arange(4)).all())
+        self.assertEqual(dll.to_numpy().tolist(), [0, 1, 2, 3])
+
+    def test_sort(self):
+        rnd = random.Random(0)
+        items = [(rnd.randrange(10), i) for i in range(500)]
+        dll = DoublyLinkedList(items)
+        nodes = dict((node.val, node) for node in dll._nodes())
+        dll.sort(key=lambda item: item[0])
+        self.assertLinked(dll, sorted(items, key=lambda item: item[0]))
+        dll.sort(key=lambda item: item[0], reverse=True)
+        self.assertLinked(dll, sorted(items, key=lambda item: item[0],
+                                      reverse=True))
+        dll.sort()
+        self.assertLinked(dll, sorted(items))
+        for node in dll._nodes():
+            self.assertIs(nodes[node.val], node)
+        empty = DoublyLinkedList()
+        empty.sort()
+        self.assertLinked(empty, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from src.FibonacciHeap import FibonacciHeap
+from test.MeldableHeapTests import _MeldableHeapTests
+
+
+class FibonacciHeapTest(_MeldableHeapTests, unittest.TestCase):
+
+    heap_cls = FibonacciHeap
+
+    @staticmethod
+    def siblings(node):
+        res = [node]
+        cur = node.right
+        while cur is not node:
+            res.append(cur)
+            cur = cur.right
+        return res
+
+    def test_consolidate_links_equal_degrees(self):
+        heap = FibonacciHeap(range(17))
+        self.assertEqual(len(self.siblings(heap._min)), 17)
+        heap.delete_min()
+        # 16 roots of degree 0 link up into a single tree of degree 4
+        roots = self.siblings(heap._min)
+        self.assertEqual(len(roots), 1)
+        self.assertEqual(heap._min.val, 1)
+        self.assertEqual(heap._min.degree, 4)
+        self.assertEqual(sorted(c.degree
+                                for c in self.siblings(heap._min.child)),
+                         [0, 1, 2, 3])
+
+    def test_cascading_cut(self):
+        heap = FibonacciHeap(range(17))
+        heap.delete_min()
+        nodes = dict((node.val, node) for node in heap._nodes())
+        # a node of degree 2 whose parent is not a root
+        p = next(node for node in nodes.values() if node.degree == 2 and
+                 node.parent is not None and node.parent.parent is not None)
+        grandparent = p.parent
+        first, second = self.siblings(p.child)
+        cut = (first.val, second.val)
+        heap.update_node(first, -1)
+        # the first lost child only marks p
+        self.assertIsNone(first.parent)
+        self.assertIs(p.parent, grandparent)
+        self.assertTrue(p.mark)
+        self.assertEqual(p.degree, 1)
+        self.assertEqual(heap.peek_min(), -1)
+        heap.update_node(second, -2)
+        # the second one cuts p as well, and marks its parent in turn
+        self.assertIsNone(second.parent)
+        self.assertIsNone(p.parent)
+        self.assertFalse(p.mark)
+        self.assertTrue(grandparent.mark)
+        roots = self.siblings(heap._min)
+        self.assertEqual(len(roots), 4)
+        self.assertEqual(heap.peek_min(), -2)
+        self.assertEqual(self.drain(heap),
+                         [-2, -1] + [v for v in range(1, 17)
+                                     if v not in cut])
+
+
+if __name__ == '__main__':
+    unittest.main()
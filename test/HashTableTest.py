@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.HashTable import (
+    HashTable, HashMethodException,
+    SEPARATE_CHAINING, LINEAR_PROBING, QUADRATIC_PROBING, DOUBLE_HASHING,
+    ROBIN_HOOD, HOPSCOTCH, HOP_RANGE, CUCKOO_HASHING, CUCKOO_STASH_SIZE,
+    CUCKOO_MAX_LOAD,
+    MappedHashTable,
+)
+
+METHODS = (SEPARATE_CHAINING, LINEAR_PROBING, QUADRATIC_PROBING,
+           DOUBLE_HASHING, ROBIN_HOOD, HOPSCOTCH, CUCKOO_HASHING)
+
+
+class RebuildCountingHashTable(HashTable):
+    """HashTable that counts the rebuilds forced by failed inserts."""
+
+    rebuilds = 0
+
+    def _rebuild(self, capacity, extra=None):
+        self.rebuilds += 1
+        super(RebuildCountingHashTable, self)._rebuild(capacity, extra)
+
+
+class MigrationRecordingHashTable(HashTable):
+    """HashTable that records the limit of every migration."""
+
+    def __init__(self, *args, **kwargs):
+        self.limits = []
+        super(MigrationRecordingHashTable, self).__init__(*args, **kwargs)
+
+    def _migrate(self, limit):
+        self.limits.append(limit)
+        super(MigrationRecordingHashTable, self)._migrate(limit)
+
+
+class CollidingKey(object):
+    """Key whose hash is constant, to force every insert to probe."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and self.n == other.n
+
+
+class HashTableTest(unittest.TestCase):
+
+    def test_invalid_method(self):
+        with self.assertRaises(HashMethodException):
+            HashTable(method=42)
+
+    def test_insert_and_get(self):
+        for method in METHODS:
+            ht = HashTable(method=method, load_factor_threshold=0.9)
+            for i in range(1000):
+                ht.insert(i, str(i))
+            self.assertEqual(ht.size, 1000)
+            for i in range(1000):
+                self.assertIn(i, ht)
+                self.assertEqual(ht[i], str(i))
+            self.assertNotIn(1000, ht)
+            self.assertIsNone(ht.get(1000))
+            with self.assertRaises(KeyError):
+                ht[1000]
+
+    def test_insert_update(self):
+        for method in METHODS:
+            ht = HashTable(method=method)
+            ht.insert('a', 1)
+            ht['a'] = 2
+            self.assertEqual(ht.size, 1)
+            self.assertEqual(ht['a'], 2)
+
+    def test_remove(self):
+        for method in METHODS:
+            ht = HashTable(method=method)
+            for i in range(100):
+                ht.insert(i, i)
+            for i in range(0, 100, 2):
+                ht.remove(i)
+            self.assertEqual(ht.size, 50)
+            for i in range(100):
+                self.assertEqual(i in ht, i % 2 == 1)
+            with self.assertRaises(KeyError):
+                ht.remove(0)
+
+    def test_lookup_probes_past_tombstones(self):
+        for method in METHODS:
+            ht = HashTable(method=method, load_factor_threshold=0.9)
+            keys = [CollidingKey(n) for n in range(5)]
+            for k in keys:
+                ht.insert(k, k.n)
+            del ht[keys[0]]
+            del ht[keys[2]]
+            self.assertEqual(ht[keys[4]], 4)
+            # the reinserted key must not be duplicated further down
+            ht.insert(keys[4], 40)
+            self.assertEqual(ht.size, 3)
+            self.assertEqual(ht[keys[4]], 40)
+
+    def test_churn_does_not_fill_with_tombstones(self):
+        ht = HashTable(method=LINEAR_PROBING)
+        for i in range(10000):
+            ht.insert(i)
+            ht.remove(i)
+        self.assertEqual(ht.size, 0)
+        self.assertLess(ht.capacity, 100)
+
+    def test_iteration(self):
+        for method in METHODS:
+            ht = HashTable(method=method)
+            for i in range(50):
+                ht.insert(i, -i)
+            self.assertEqual(sorted(ht), list(range(50)))
+            self.assertEqual(sorted(ht.items()),
+                             [(i, -i) for i in range(50)])
+
+    def test_incremental_resize(self):
+        for method in METHODS:
+            ht = HashTable(method=method, incremental_resize=True,
+                           rehash_step=2)
+            seen_rehashing = False
+            for i in range(500):
+                ht.insert(i, i * 2)
+                seen_rehashing = seen_rehashing or ht.is_rehashing
+                if i % 3 == 0:
+                    ht.remove(i)
+            self.assertTrue(seen_rehashing)
+            for i in range(500):
+                self.assertEqual(ht.get(i), None if i % 3 == 0 else i * 2)
+            self.assertEqual(ht.size, len(list(ht)))
+
+    def test_incremental_resize_bounded_work(self):
+        ht = HashTable(incremental_resize=True, rehash_step=4)
+        for i in range(6):
+            ht.insert(i)
+        self.assertTrue(ht.is_rehashing)
+        old_capacity = ht._old_table.capacity
+        ht.insert(6)
+        self.assertEqual(ht._rehash_index, 4)
+        while ht.is_rehashing:
+            self.assertIn(0, ht)
+        self.assertEqual(sorted(ht), list(range(7)))
+        self.assertGreater(ht.capacity, old_capacity)
+
+    def test_incremental_resize_finishes_in_time(self):
+        for method in METHODS:
+            for threshold in (0.5, 0.9):
+                ht = MigrationRecordingHashTable(
+                    method=method, load_factor_threshold=threshold,
+                    incremental_resize=True, rehash_step=1)
+                for i in range(3000):
+                    ht.insert(i)
+                # no resize found the previous migration unfinished
+                self.assertNotIn(None, ht.limits)
+                self.assertLessEqual(max(ht.limits),
+                                     2 / ht._load_factor_threshold)
+                self.assertEqual(sorted(ht), list(range(3000)))
+
+    def test_probe_histogram(self):
+        for method in METHODS:
+            ht = HashTable(method=method, load_factor_threshold=0.9)
+            for i in range(2000):
+                ht.insert('key{}'.format(i))
+            hist = ht.probe_histogram()
+            self.assertEqual(sum(hist.values()), 2000)
+            self.assertGreater(hist[1], 0)
+
+    def test_robin_hood_removal_shifts_back(self):
+        ht = HashTable(method=ROBIN_HOOD, load_factor_threshold=0.9)
+        keys = [CollidingKey(n) for n in range(6)]
+        for k in keys:
+            ht.insert(k)
+        ht.remove(keys[0])
+        self.assertEqual(ht.probe_histogram(),
+                         dict((n, 1) for n in range(1, 6)))
+        self.assertEqual(ht._table.used, 5)
+
+    def test_hopscotch_neighbourhood_overflow(self):
+        ht = HashTable(method=HOPSCOTCH, load_factor_threshold=0.9)
+        keys = [CollidingKey(n) for n in range(HOP_RANGE + 1)]
+        for k in keys[:-1]:
+            ht.insert(k)
+        with self.assertRaises(HashMethodException):
+            ht.insert(keys[-1])
+        self.assertEqual(ht.size, HOP_RANGE)
+        self.assertNotIn(keys[-1], ht)
+
+    def test_from_iterable_presizes(self):
+        for method in METHODS:
+            keys = ['key{}'.format(i) for i in range(1000)]
+            ht = HashTable.from_iterable(keys, values=range(1000),
+                                         method=method)
+            self.assertEqual(ht.size, 1000)
+            self.assertLess(ht.load_factor, 0.5)
+            self.assertEqual(ht['key999'], 999)
+            # the table was sized once and never grew while loading
+            threshold = CUCKOO_MAX_LOAD if method == CUCKOO_HASHING else 0.5
+            self.assertEqual(
+                ht.capacity,
+                HashTable(method=method,
+                          capacity=int(1000 / threshold) + 1).capacity,
+            )
+
+    def test_batch_lookup_and_remove(self):
+        ht = HashTable.from_iterable(range(10))
+        self.assertEqual(ht.contains_many([0, 5, 10]), [True, True, False])
+        self.assertEqual(ht.remove_many([5, 5, 11]), [True, False, False])
+        self.assertEqual(ht.size, 9)
+        self.assertEqual(ht.insert_many([20, 21, 0, 20], ['a', 'b', 'c', 'd']),
+                         [True, True, False, False])
+        self.assertEqual(ht[21], 'b')
+        self.assertEqual(ht[20], 'd')
+        self.assertEqual(ht.size, 11)
+
+    def test_insert_many_methods(self):
+        for method in METHODS:
+            for incremental in (False, True):
+                ht = HashTable(method=method, capacity=5,
+                               incremental_resize=incremental, rehash_step=2)
+                # an iterator has no length, so the table grows while
+                # loading, and incrementally if asked to
+                res = ht.insert_many(iter(range(300)), iter(range(300)))
+                self.assertEqual(res, [True] * 300)
+                res = ht.insert_many(range(250, 350))
+                self.assertEqual(res, [False] * 50 + [True] * 50)
+                self.assertEqual(ht.size, 350)
+                self.assertEqual(sorted(ht), list(range(350)))
+                self.assertEqual(ht[10], 10)
+                self.assertIsNone(ht[260])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_batch_numpy(self):
+        ht = HashTable.from_iterable(np.arange(100))
+        res = ht.contains_many(np.array([1, 100, 99]))
+        self.assertIsInstance(res, np.ndarray)
+        self.assertListEqual(res.tolist(), [True, False, True])
+        res = ht.insert_many(np.array([99, 100]))
+        self.assertIsInstance(res, np.ndarray)
+        self.assertListEqual(res.tolist(), [False, True])
+        ht.remove(100)
+        res = ht.remove_many(np.arange(50, 150))
+        self.assertEqual(int(res.sum()), 50)
+        self.assertEqual(ht.size, 50)
+
+    def test_cuckoo_lookups_touch_two_slots(self):
+        ht = HashTable(method=CUCKOO_HASHING)
+        for i in range(5000):
+            ht.insert('key{}'.format(i))
+        hist = ht.probe_histogram()
+        self.assertLessEqual(max(hist), 2 + CUCKOO_STASH_SIZE)
+        self.assertEqual(hist[1] + hist[2], 5000 - ht._table.stashed)
+
+    def test_cuckoo_load_limit(self):
+        ht = RebuildCountingHashTable(method=CUCKOO_HASHING,
+                                      load_factor_threshold=0.9)
+        rnd = random.Random(1)
+        for _ in range(20000):
+            ht.insert(rnd.getrandbits(64))
+        # the table grows by regular resizes, not by failed insertions
+        self.assertEqual(ht.rebuilds, 0)
+        self.assertLessEqual(ht.load_factor, CUCKOO_MAX_LOAD)
+        self.assertGreater(ht.load_factor, CUCKOO_MAX_LOAD / 2)
+
+    def test_cuckoo_stash(self):
+        ht = HashTable(method=CUCKOO_HASHING, load_factor_threshold=0.9)
+        keys = [CollidingKey(n) for n in range(2 + CUCKOO_STASH_SIZE)]
+        for k in keys:
+            ht.insert(k)
+        self.assertEqual(ht._table.stashed, CUCKOO_STASH_SIZE)
+        stashed = ht._table.keys[ht.capacity]
+        ht.remove(stashed)
+        self.assertEqual(ht._table.stashed, CUCKOO_STASH_SIZE - 1)
+        for k in keys:
+            self.assertEqual(k in ht, k is not stashed)
+        # a third key per candidate pair beyond the stash cannot fit
+        extra = [CollidingKey(n) for n in range(10, 12)]
+        ht.insert(extra[0])
+        with self.assertRaises(HashMethodException):
+            ht.insert(extra[1])
+
+
+class MappedHashTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'table.snap')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        ht = HashTable(method=ROBIN_HOOD)
+        keys = ['key{}'.format(i) for i in range(500)]
+        keys += [7, 2.5, b'raw', ('a', 1), None]
+        for n, k in enumerate(keys):
+            ht.insert(k, {'n': n})
+        ht.save(self.path)
+        with MappedHashTable(self.path) as mht:
+            self.assertEqual(mht.size, len(keys))
+            for n, k in enumerate(keys):
+                self.assertIn(k, mht)
+                self.assertEqual(mht[k], {'n': n})
+            self.assertNotIn('missing', mht)
+            self.assertIsNone(mht.get('missing'))
+            with self.assertRaises(KeyError):
+                mht['missing']
+            self.assertEqual(sorted(map(repr, mht)),
+                             sorted(map(repr, keys)))
+
+    def test_empty(self):
+        HashTable().save(self.path)
+        with MappedHashTable(self.path) as mht:
+            self.assertEqual(len(mht), 0)
+            self.assertNotIn(0, mht)
+
+    def test_unsupported_key(self):
+        ht = HashTable()
+        ht.insert(frozenset([1]))
+        with self.assertRaises(TypeError):
+            ht.save(self.path)
+
+    def test_open_in_another_process(self):
+        # str hashes differ between processes, lookups must not
+        ht = HashTable.from_iterable(['x', 'y'], values=[1, 2])
+        ht.save(self.path)
+        code = (
+            "from src.HashTable import MappedHashTable;"
+            "m = MappedHashTable({!r});"
+            "print(m['x'] + m['y'])".format(self.path)
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.check_output(
+            [sys.executable, '-c', code], cwd=root,
+            env=dict(os.environ, PYTHONHASHSEED='random'),
+        )
+        self.assertEqual(out.strip(), b'3')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from src.DoublyLinkedList import DoublyLinkedList
+from src.IndexableDoublyLinkedList import IndexableDoublyLinkedList
+
+
+class IndexableDoublyLinkedListTest(unittest.TestCase):
+
+    def assertIndexed(self, dll, lst):
+        """Check the items, and the spans and ends of every level."""
+        self.assertEqual(list(dll), lst)
+        self.assertEqual(dll.size, len(lst))
+        nodes = []
+        node = dll.head
+        while node is not None:
+            nodes.append(node)
+            node = node.next
+        coord = dict((id(n), i + dll._origin) for i, n in enumerate(nodes))
+        for level in range(len(dll._first)):
+            on_level = [n for n in nodes if len(n.links) > level]
+            self.assertIs(dll._first[level], on_level[0])
+            self.assertEqual(dll._first_pos[level], coord[id(on_level[0])])
+            self.assertIs(dll._last[level], on_level[-1])
+            self.assertEqual(dll._last_pos[level], coord[id(on_level[-1])])
+            for a, b in zip(on_level, on_level[1:]):
+                self.assertIs(a.links[level], b)
+                self.assertEqual(a.widths[level], coord[id(b)] - coord[id(a)])
+        for i, node in enumerate(nodes):
+            self.assertEqual(dll._position(node), i)
+
+    def test_positional(self):
+        rnd = random.Random(0)
+        dll = IndexableDoublyLinkedList(seed=0)
+        lst = []
+        for n in range(2000):
+            op = rnd.random()
+            if op < 0.2:
+                dll.push(n)
+                lst.append(n)
+            elif op < 0.4:
+                dll.shift(n)
+                lst.insert(0, n)
+            elif op < 0.6 or not lst:
+                pos = rnd.randint(0, len(lst))
+                dll.insert(pos, n)
+                lst.insert(pos, n)
+            elif op < 0.8:
+                pos = rnd.randrange(len(lst))
+                self.assertEqual(dll.remove(pos), lst.pop(pos))
+            else:
+                pos = rnd.randrange(len(lst))
+                self.assertEqual(dll[pos], lst[pos])
+                dll[pos] = -n
+                lst[pos] = -n
+        self.assertIndexed(dll, lst)
+        self.assertEqual(list(dll[3:200:7]), lst[3:200:7])
+        self.assertEqual(list(dll[200:3:-7]), lst[200:3:-7])
+
+    def test_ends(self):
+        dll = IndexableDoublyLinkedList(list(range(100)), seed=1)
+        for i in range(50):
+            self.assertEqual(dll.unshift(), i)
+            dll.push(100 + i)
+        self.assertEqual(dll.pop(), 149)
+        self.assertIndexed(dll, list(range(50, 149)))
+        while dll:
+            dll.unshift()
+        self.assertIndexed(dll, [])
+        self.assertEqual(dll._first, [])
+
+    def test_handles(self):
+        dll = IndexableDoublyLinkedList(seed=2)
+        nodes = [dll.push(i) for i in range(20)]
+        dll.move_to_front(nodes[10])
+        dll.move_to_back(nodes[0])
+        dll.remove_node(nodes[5])
+        dll.insert_before(nodes[6], 'x')
+        dll.insert_after(nodes[19], 'y')
+        lst = [10, 1, 2, 3, 4, 'x'] + list(range(6, 10)) + \
+            list(range(11, 20)) + ['y', 0]
+        self.assertIndexed(dll, lst)
+        self.assertIs(dll._get_node_at(0), nodes[10])
+
+    def test_splice(self):
+        dll = IndexableDoublyLinkedList([0, 3], seed=3)
+        other = IndexableDoublyLinkedList([1, 2], seed=4)
+        one = other.head
+        dll.splice(dll.head, other)
+        dll.splice(dll.tail, DoublyLinkedList([4, 5]))
+        self.assertIndexed(dll, [0, 1, 2, 3, 4, 5])
+        self.assertIndexed(other, [])
+        self.assertIs(dll._get_node_at(1), one)
+
+    def test_sort(self):
+        rnd = random.Random(5)
+        lst = [rnd.randrange(100) for _ in range(300)]
+        dll = IndexableDoublyLinkedList(lst, seed=5)
+        dll.sort(reverse=True)
+        self.assertIndexed(dll, sorted(lst, reverse=True))
+
+    def test_clone_and_add(self):
+        dll = IndexableDoublyLinkedList([0, 1, 2])
+        clone = dll.clone()
+        self.assertIsInstance(clone, IndexableDoublyLinkedList)
+        res = dll + clone
+        self.assertIndexed(res, [0, 1, 2, 0, 1, 2])
+        self.assertIndexed(dll, [0, 1, 2])
+        dll.clear()
+        self.assertIndexed(dll, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from src.LRUCache import LRUCache, LFUCache
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(capacity=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache['a'], 1)
+        cache['c'] = 3
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_update_counts_as_use(self):
+        cache = LRUCache(capacity=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a'] = 10
+        cache['c'] = 3
+        self.assertEqual(cache.get('a'), 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.size, 2)
+
+    def test_counters(self):
+        cache = LRUCache(capacity=10)
+        cache['a'] = 1
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        with self.assertRaises(KeyError):
+            cache['b']
+        self.assertEqual(cache.misses, 2)
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=10, sizeof=len)
+        cache['a'] = 'xxxx'
+        cache['b'] = 'yyyy'
+        cache['c'] = 'zzzz'
+        self.assertEqual(sorted(k for k in 'abc' if k in cache), ['b', 'c'])
+        self.assertEqual(cache.nbytes, 8)
+        cache['d'] = 'w' * 11
+        self.assertNotIn('d', cache)
+        self.assertEqual(cache.nbytes, 8)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=5, clock=clock)
+        cache['a'] = 1
+        cache.put('b', 2, ttl=20)
+        clock.now = 10
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(cache.size, 1)
+
+    def test_remove_and_clear(self):
+        cache = LRUCache()
+        for i in range(5):
+            cache[i] = i
+        del cache[2]
+        self.assertNotIn(2, cache)
+        with self.assertRaises(KeyError):
+            cache.remove(2)
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+    def test_memoize(self):
+        cache = LRUCache(capacity=10)
+        calls = []
+
+        @cache.memoize
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        self.assertEqual([square(3), square(3), square(4)], [9, 9, 16])
+        self.assertEqual(calls, [3, 4])
+        self.assertEqual(cache.hits, 1)
+
+
+class LFUCacheTest(unittest.TestCase):
+
+    def test_evicts_least_frequently_used(self):
+        cache = LFUCache(capacity=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache['c'] = 3
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.frequency('a'), 3)
+        self.assertEqual(cache.frequency('c'), 1)
+        # c is now the least frequently used, but was just inserted
+        cache['d'] = 4
+        self.assertNotIn('c', cache)
+        self.assertIn('d', cache)
+
+    def test_ties_evict_least_recently_used(self):
+        cache = LFUCache(capacity=3)
+        for k in 'abc':
+            cache[k] = k
+        cache.get('a')
+        cache.get('b')
+        cache['d'] = 'd'
+        self.assertNotIn('c', cache)
+        cache['e'] = 'e'
+        self.assertNotIn('d', cache)
+        self.assertEqual(sorted(k for k in 'abcde' if k in cache),
+                         ['a', 'b', 'e'])
+
+    def test_update_keeps_frequency(self):
+        cache = LFUCache(capacity=2)
+        cache['a'] = 1
+        cache['a'] = 2
+        self.assertEqual(cache.frequency('a'), 2)
+        cache['b'] = 1
+        cache['c'] = 1
+        self.assertEqual(cache['a'], 2)
+        self.assertNotIn('b', cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
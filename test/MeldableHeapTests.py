@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+
+class _MeldableHeapTests(object):
+    """Tests shared by the pointer-based heaps; heap_cls is the heap."""
+
+    heap_cls = None
+
+    def drain(self, heap):
+        res = []
+        while not heap.is_empty():
+            res.append(heap.delete_min())
+        return res
+
+    def test_insert_delete_min(self):
+        rnd = random.Random(0)
+        items = [rnd.randrange(1000) for _ in range(500)]
+        heap = self.heap_cls(items)
+        self.assertEqual(heap.size, 500)
+        self.assertEqual(heap.peek_min(), min(items))
+        self.assertEqual(self.drain(heap), sorted(items))
+        with self.assertRaises(IndexError):
+            heap.delete_min()
+
+    def test_key_and_reverse(self):
+        items = ['ccc', 'a', 'bb', 'dddd']
+        self.assertEqual(self.drain(self.heap_cls(items, key=len)),
+                         ['a', 'bb', 'ccc', 'dddd'])
+        self.assertEqual(self.drain(self.heap_cls(items, reverse=True)),
+                         ['dddd', 'ccc', 'bb', 'a'])
+
+    def test_update_and_remove_node(self):
+        rnd = random.Random(1)
+        heap = self.heap_cls()
+        nodes = [heap.insert(rnd.randrange(1000)) for _ in range(300)]
+        # settle the nodes into trees first
+        heap.insert(-1)
+        self.assertEqual(heap.delete_min(), -1)
+        expected = []
+        for i, node in enumerate(nodes):
+            if i % 3 == 0:
+                heap.remove_node(node)
+            else:
+                val = rnd.randrange(1000)
+                heap.update_node(node, val)
+                expected.append(val)
+        self.assertEqual(heap.size, len(expected))
+        self.assertEqual(heap.peek_max(), max(expected))
+        self.assertEqual(heap.remove_max(), max(expected))
+        self.assertEqual(self.drain(heap), sorted(expected)[:-1])
+
+    def test_meld(self):
+        a = self.heap_cls([5, 1, 9])
+        b = self.heap_cls([4, 0])
+        a.meld(b)
+        self.assertTrue(b.is_empty())
+        self.assertEqual(self.drain(a), [0, 1, 4, 5, 9])
+        with self.assertRaises(ValueError):
+            a.meld(a)
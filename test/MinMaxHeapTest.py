@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from src.MinMaxHeap import MinMaxHeap
+
+
+class MinMaxHeapTest(unittest.TestCase):
+
+    def assertMinMax(self, heap):
+        """Check every element against its children and grandchildren."""
+        keys = heap._keys
+        for i in range(heap.size):
+            for j in (2 * i + 1, 2 * i + 2, 4 * i + 3, 4 * i + 4,
+                      4 * i + 5, 4 * i + 6):
+                if j >= heap.size:
+                    continue
+                if heap._on_min_level(i):
+                    self.assertFalse(heap._lt(keys[j], keys[i]))
+                else:
+                    self.assertFalse(heap._lt(keys[i], keys[j]))
+
+    def test_both_ends(self):
+        rnd = random.Random(0)
+        heap = MinMaxHeap()
+        lst = []
+        for n in range(3000):
+            op = rnd.random()
+            if op < 0.5 or not lst:
+                item = rnd.randrange(500)
+                heap.insert(item)
+                lst.append(item)
+            elif op < 0.75:
+                lst.sort()
+                self.assertEqual(heap.peek_min(), lst[0])
+                self.assertEqual(heap.remove_min(), lst.pop(0))
+            else:
+                lst.sort()
+                self.assertEqual(heap.peek_max(), lst[-1])
+                self.assertEqual(heap.remove_max(), lst.pop())
+        self.assertMinMax(heap)
+        self.assertEqual(heap.size, len(lst))
+
+    def test_heapify_key_reverse(self):
+        rnd = random.Random(1)
+        items = [rnd.randrange(100) for _ in range(300)]
+        heap = MinMaxHeap(items, key=lambda x: -x, reverse=True)
+        self.assertMinMax(heap)
+        self.assertEqual(heap.peek_min(), min(items))
+        self.assertEqual(heap.peek_max(), max(items))
+        res = [heap.remove_max() for _ in range(150)]
+        res += [heap.remove_min() for _ in range(150)][::-1]
+        self.assertEqual(res, sorted(items, reverse=True))
+
+    def test_small(self):
+        heap = MinMaxHeap([2])
+        self.assertEqual(heap.peek_max(), 2)
+        heap.insert(1)
+        self.assertEqual(heap.peek_max(), 2)
+        self.assertEqual(heap.pushpop(0), 0)
+        self.assertEqual(heap.replace(3), 1)
+        self.assertEqual(heap.remove_max(), 3)
+        self.assertEqual(heap.remove_max(), 2)
+        with self.assertRaises(IndexError):
+            heap.peek_max()
+
+
+if __name__ == '__main__':
+    unittest.main()
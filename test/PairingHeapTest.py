@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from src.PairingHeap import PairingHeap
+from test.MeldableHeapTests import _MeldableHeapTests
+
+
+class PairingHeapTest(_MeldableHeapTests, unittest.TestCase):
+
+    heap_cls = PairingHeap
+
+    @staticmethod
+    def children(node):
+        res = []
+        child = node.child
+        while child is not None:
+            res.append(child.val)
+            child = child.next
+        return res
+
+    def test_links_under_root(self):
+        heap = PairingHeap(range(9))
+        # every insert links the new node as the root's first child
+        self.assertEqual(heap._root.val, 0)
+        self.assertEqual(self.children(heap._root), [8, 7, 6, 5, 4, 3, 2, 1])
+
+    def test_two_pass_merge(self):
+        heap = PairingHeap(range(9))
+        heap.delete_min()
+        # the first pass links (8, 7), (6, 5), (4, 3) and (2, 1); the
+        # second folds the winners into the last one, right to left
+        root = heap._root
+        self.assertEqual(root.val, 1)
+        self.assertEqual(self.children(root), [7, 5, 3, 2])
+        self.assertEqual(self.children(root.child), [8])
+        self.assertIs(root.child.prev, root)
+
+    def test_decrease_cuts_subtree(self):
+        heap = PairingHeap(range(9))
+        heap.delete_min()
+        node = heap._root.child  # 7, with child 8
+        heap.update_node(node, -1)
+        # the subtree is cut out whole, then linked with the old root
+        self.assertIs(heap._root, node)
+        self.assertEqual(self.children(node), [1, 8])
+        self.assertEqual(self.children(node.child), [5, 3, 2])
+        self.assertEqual(heap.size, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
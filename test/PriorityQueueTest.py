@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from src.PriorityQueue import (
+    PriorityQueue, BINARY_HEAP, PAIRING_HEAP, FIBONACCI_HEAP
+)
+
+
+class PriorityQueueTest(unittest.TestCase):
+
+    backend = BINARY_HEAP
+
+    def test_both_ends(self):
+        pq = PriorityQueue(self.backend)
+        for el, priority in (('b', 2), ('d', 4), ('a', 1), ('c', 3)):
+            pq.insert(el, priority)
+        self.assertEqual(len(pq), 4)
+        self.assertEqual(pq.peek_highest_priority(), 'd')
+        self.assertEqual(pq.peek_lowest_priority(), 'a')
+        self.assertEqual(pq.pop_highest_priority(), 'd')
+        self.assertEqual(pq.pop_lowest_priority(), 'a')
+        pq.remove_highest_priority()
+        self.assertEqual(pq.pop_lowest_priority(), 'b')
+        self.assertTrue(pq.is_empty())
+        with self.assertRaises(IndexError):
+            pq.pop_highest_priority()
+
+    def test_update_and_remove(self):
+        pq = PriorityQueue(self.backend)
+        for i in range(10):
+            pq.insert(i, i)
+        self.assertIn(3, pq)
+        pq.update_priority(3, 100)
+        pq.update_priority(9, -1)
+        pq.insert(5, 50)
+        self.assertEqual(pq.get_priority(5), 50)
+        pq.remove(0)
+        self.assertNotIn(0, pq)
+        self.assertEqual(len(pq), 9)
+        self.assertEqual([pq.pop_highest_priority() for _ in range(3)],
+                         [3, 5, 8])
+        self.assertEqual(pq.pop_lowest_priority(), 9)
+        with self.assertRaises(KeyError):
+            pq.remove(0)
+        with self.assertRaises(KeyError):
+            pq.update_priority(3, 1)
+
+    def test_random_updates(self):
+        rnd = random.Random(0)
+        pq = PriorityQueue(self.backend)
+        priorities = {}
+        for n in range(3000):
+            op = rnd.random()
+            el = rnd.randrange(200)
+            if op < 0.5:
+                priorities[el] = rnd.random()
+                pq.insert(el, priorities[el])
+            elif op < 0.7 and el in priorities:
+                priorities[el] = rnd.random()
+                pq.update_priority(el, priorities[el])
+            elif op < 0.8 and el in priorities:
+                pq.remove(el)
+                del priorities[el]
+            elif op < 0.9 and priorities:
+                best = max(priorities, key=priorities.get)
+                self.assertEqual(pq.pop_highest_priority(), best)
+                del priorities[best]
+            elif priorities:
+                worst = min(priorities, key=priorities.get)
+                self.assertEqual(pq.pop_lowest_priority(), worst)
+                del priorities[worst]
+            self.assertEqual(len(pq), len(priorities))
+        if self.backend == BINARY_HEAP:
+            for i, entry in enumerate(pq._data._heap):
+                self.assertEqual(entry._handle, i)
+
+    def test_clear(self):
+        pq = PriorityQueue(self.backend)
+        pq.insert('a', 1)
+        pq.clear()
+        self.assertTrue(pq.is_empty())
+        self.assertNotIn('a', pq)
+
+    def test_batch_insert(self):
+        rnd = random.Random(2)
+        pq = PriorityQueue(self.backend)
+        pq.insert('x', 0.5)
+        batch = [(i, rnd.random()) for i in range(1000)]
+        pq.batch_insert(batch + [('x', 2.0), (3, -1.0)])
+        pq.batch_insert([(i, rnd.random()) for i in range(1000, 1005)])
+        self.assertEqual(len(pq), 1006)
+        self.assertEqual(pq.pop_highest_priority(), 'x')
+        self.assertEqual(pq.pop_lowest_priority(), 3)
+        prev = None
+        while not pq.is_empty():
+            priority = pq.get_priority(pq.peek_highest_priority())
+            if prev is not None:
+                self.assertLessEqual(priority, prev)
+            prev = priority
+            pq.pop_highest_priority()
+
+    def test_meld(self):
+        for other_backend in (BINARY_HEAP, PAIRING_HEAP, FIBONACCI_HEAP):
+            pq = PriorityQueue(self.backend)
+            other = PriorityQueue(other_backend)
+            pq.batch_insert([('a', 1), ('b', 5), ('c', 3)])
+            other.batch_insert([('d', 4), ('b', 0), ('e', 6)])
+            pq.meld(other)
+            self.assertTrue(other.is_empty())
+            self.assertNotIn('d', other)
+            self.assertEqual(pq.get_priority('b'), 0)
+            self.assertEqual([pq.pop_highest_priority() for _ in range(5)],
+                             ['e', 'd', 'c', 'a', 'b'])
+            other.insert('f', 1)
+            pq.merge(other)
+            self.assertEqual(pq.pop_highest_priority(), 'f')
+            with self.assertRaises(ValueError):
+                pq.meld(pq)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            PriorityQueue(backend=-1)
+
+
+class PairingPriorityQueueTest(PriorityQueueTest):
+
+    backend = PAIRING_HEAP
+
+
+class FibonacciPriorityQueueTest(PriorityQueueTest):
+
+    backend = FIBONACCI_HEAP
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src import ShardedHashTable as sharded
+from src.ShardedHashTable import ShardedHashTable
+
+
+def _count_present(table, keys):
+    return sum(k in table for k in keys)
+
+
+def _worker_attached(token):
+    """Names of the blocks a worker process has attached for a table."""
+    return sorted(sharded._worker_shards.get(token, (0, {}))[1])
+
+
+def _worker_tokens():
+    """Tokens of the tables a worker process has attached, oldest first."""
+    return list(sharded._worker_shards)
+
+
+class ShardedHashTableTest(unittest.TestCase):
+
+    def test_build_and_lookup(self):
+        keys = ['key{}'.format(i) for i in range(1000)]
+        with ShardedHashTable.from_iterable(keys, range(1000),
+                                            shards=3) as sht:
+            self.assertEqual(len(sht.names), 3)
+            self.assertEqual(sht.size, 1000)
+            self.assertEqual(sht['key10'], 10)
+            self.assertIn('key999', sht)
+            self.assertNotIn('key1000', sht)
+            self.assertIsNone(sht.get('key1000'))
+            with self.assertRaises(KeyError):
+                sht['key1000']
+            self.assertEqual(sorted(sht), sorted(keys))
+            self.assertEqual(sht.get_many(['key1', 'nope', 'key2'], -1),
+                             [1, -1, 2])
+            self.assertEqual(sht.contains_many(['key1', 'nope']),
+                             [True, False])
+
+    def test_insert_many_replaces_touched_shards(self):
+        with ShardedHashTable.from_iterable(range(100), shards=4) as sht:
+            names = sht.names
+            sht.insert_many([0, 1001], ['zero', 'thousand'])
+            self.assertEqual(sht.size, 101)
+            self.assertEqual(sht[0], 'zero')
+            self.assertEqual(sht[1001], 'thousand')
+            self.assertIsNone(sht[1])
+            self.assertEqual(
+                sum(a != b for a, b in zip(names, sht.names)), 2
+            )
+
+    def test_process_pool(self):
+        keys = ['key{}'.format(i) for i in range(2000)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            sht = ShardedHashTable.from_iterable(
+                keys, range(2000), shards=4, executor=executor
+            )
+            with sht:
+                values = sht.get_many(keys + ['nope'], executor=executor)
+                self.assertEqual(values, list(range(2000)) + [None])
+                sht.insert_many(['new'], [-1], executor=executor)
+                self.assertEqual(sht['new'], -1)
+                # a handle sent to a worker attaches to the same blocks
+                future = executor.submit(_count_present, sht, keys[:10])
+                self.assertEqual(future.result(), 10)
+                self.assertEqual(
+                    sht.contains_many(['key5', 'nope', 'new', 'key1999'],
+                                      executor=executor),
+                    [True, False, True, True])
+                self.assertEqual(
+                    sht.get_many(['nope', 'key1'], default='?',
+                                 executor=executor), ['?', 1])
+
+    def test_workers_drop_replaced_blocks(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with ShardedHashTable.from_iterable(range(100),
+                                                shards=2) as sht:
+                sht.contains_many(range(10), executor=executor)
+                token = sht._token
+                self.assertEqual(
+                    executor.submit(_worker_attached, token).result(),
+                    sorted(sht.names))
+                sht.insert_many([0, 1])
+                sht.contains_many(range(10), executor=executor)
+                self.assertEqual(
+                    executor.submit(_worker_attached, token).result(),
+                    sorted(sht.names))
+
+    def test_workers_drop_closed_tables(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            closed = ShardedHashTable.from_iterable(range(100), shards=2)
+            closed.contains_many(range(10), executor=executor)
+            token = closed._token
+            self.assertEqual(executor.submit(_worker_tokens).result(),
+                             [token])
+            closed.close()
+            tables = [ShardedHashTable.from_iterable(range(10), shards=2)
+                      for _ in range(sharded._WORKER_TABLES + 1)]
+            try:
+                tables[0].contains_many(range(10), executor=executor)
+                # the next task on another table detaches the closed one
+                self.assertEqual(executor.submit(_worker_tokens).result(),
+                                 [tables[0]._token])
+                for sht in tables:
+                    sht.contains_many(range(10), executor=executor)
+                # the least recently used table is detached as well
+                self.assertEqual(executor.submit(_worker_tokens).result(),
+                                 [sht._token for sht in tables[1:]])
+            finally:
+                for sht in tables:
+                    sht.close()
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        keys = np.arange(100)
+        with ShardedHashTable.from_iterable(keys, keys * 2,
+                                            shards=3) as sht:
+            self.assertEqual(sht.size, 100)
+            self.assertEqual(sht[np.int64(7)], 14)
+            self.assertIs(type(sht[7]), int)
+            self.assertIn(np.int64(99), sht)
+            self.assertEqual(sht.get_many(np.array([1, 100]), -1), [2, -1])
+            found = sht.contains_many(np.array([5, 500]))
+            self.assertIsInstance(found, np.ndarray)
+            self.assertEqual(found.tolist(), [True, False])
+            sht.insert_many(np.array([100]), np.array([-1]))
+            self.assertEqual(sht.get(np.int64(100)), -1)
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(
+                    sht.contains_many(np.array([5, 500]),
+                                      executor=executor).tolist(),
+                    [True, False])
+
+    def test_handles_are_independent(self):
+        with ShardedHashTable.from_iterable(range(100), shards=2) as sht:
+            copy = pickle.loads(pickle.dumps(sht))
+            items = sht.items()
+            next(items)
+            # closing a non-owning handle leaves the owner's shards alone
+            copy.close()
+            self.assertEqual(len(list(items)), 99)
+            copy = pickle.loads(pickle.dumps(sht))
+            sht.insert_many([1000], ['new'])
+            # the old blocks are unlinked, but copy is still attached
+            self.assertNotIn(1000, copy)
+            self.assertEqual(len(copy), 100)
+            self.assertEqual(sht[1000], 'new')
+            copy.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
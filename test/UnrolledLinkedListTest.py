@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+
+from src.UnrolledLinkedList import UnrolledLinkedList
+
+
+class UnrolledLinkedListTest(unittest.TestCase):
+
+    def assertChunks(self, ull, lst):
+        """Check the items, the size and the chunk fill invariants."""
+        self.assertEqual(list(ull), lst)
+        self.assertEqual(list(reversed(ull)), lst[::-1])
+        self.assertEqual(ull.size, len(lst))
+        chunk = ull._head
+        while chunk is not None:
+            self.assertTrue(0 < len(chunk.vals) <= ull._chunk_size)
+            if chunk.prev is not None and chunk.next is not None:
+                self.assertGreaterEqual(len(chunk.vals),
+                                        ull._chunk_size // 2)
+            if chunk.next is not None:
+                self.assertIs(chunk.next.prev, chunk)
+            chunk = chunk.next
+
+    def test_push_shift_pop_unshift(self):
+        ull = UnrolledLinkedList(chunk_size=4)
+        for i in range(10):
+            ull.push(i)
+            if i:
+                ull.shift(-i)
+        self.assertChunks(ull, list(range(-9, 10)))
+        self.assertEqual(ull.pop(), 9)
+        self.assertEqual(ull.unshift(), -9)
+        self.assertEqual(ull.size, 17)
+
+    def test_random_edits(self):
+        rnd = random.Random(0)
+        ull = UnrolledLinkedList(chunk_size=8)
+        lst = []
+        for n in range(3000):
+            op = rnd.random()
+            if op < 0.5 or not lst:
+                pos = rnd.randint(0, len(lst))
+                ull.insert(pos, n)
+                lst.insert(pos, n)
+            elif op < 0.8:
+                pos = rnd.randrange(len(lst))
+                self.assertEqual(ull.remove(pos), lst.pop(pos))
+            else:
+                pos = rnd.randrange(len(lst))
+                ull[pos] = -n
+                lst[pos] = -n
+                self.assertEqual(ull[pos], lst[pos])
+        self.assertChunks(ull, lst)
+
+    def test_remove_refills_chunks(self):
+        ull = UnrolledLinkedList(range(192), chunk_size=64)
+        lst = list(range(192))
+        # 32 items in the middle chunk, between two full ones
+        for pos in range(95, 63, -1):
+            self.assertEqual(ull.remove(pos), lst.pop(pos))
+        self.assertChunks(ull, lst)
+        # one fewer is not enough to merge with a neighbour holding 64
+        self.assertEqual(ull.remove(64), lst.pop(64))
+        self.assertChunks(ull, lst)
+        self.assertEqual(len(ull._head.next.vals), 47)
+
+    def test_slices(self):
+        lst = list(range(50))
+        ull = UnrolledLinkedList(lst, chunk_size=6)
+        for key in (slice(3, 40), slice(None, None, 7), slice(45, 2, -3),
+                    slice(None, None, -1), slice(10, 5), slice(-5, None)):
+            self.assertEqual(list(ull[key]), lst[key])
+
+    def test_contains_and_equality(self):
+        ull = UnrolledLinkedList(range(100), chunk_size=16)
+        self.assertIn(99, ull)
+        self.assertNotIn(100, ull)
+        self.assertEqual(ull, UnrolledLinkedList(range(100), chunk_size=3))
+        self.assertNotEqual(ull, UnrolledLinkedList(range(99)))
+        self.assertEqual(list(ull.clone() + ull), list(range(100)) * 2)
+
+    def test_bounds(self):
+        ull = UnrolledLinkedList([1])
+        with self.assertRaises(IndexError):
+            ull.get(1)
+        with self.assertRaises(IndexError):
+            ull.insert(2, 0)
+        with self.assertRaises(ValueError):
+            UnrolledLinkedList(chunk_size=1)
+
+
+if __name__ == '__main__':
+    unittest.main()